@@ -0,0 +1,179 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from src.roadmapper.timelinemode import TimelineMode
+
+### Approximate length in days of one timeline item per mode
+MODE_DAYS = {
+    TimelineMode.WEEKLY: 7,
+    TimelineMode.MONTHLY: 30,
+    TimelineMode.QUARTERLY: 91,
+    TimelineMode.HALF_YEARLY: 182,
+    TimelineMode.YEARLY: 365,
+}
+
+
+@dataclass()
+class BenchmarkCase:
+    """Shape of a synthetic roadmap
+
+    Args:
+        name (str): Case name, unique in a suite
+        groups (int, optional): Number of groups. Defaults to 3.
+        tasks_per_group (int, optional): Tasks in each group. Defaults to 4.
+        parallel_tasks (int, optional): Parallel tasks of each task. Defaults to 0.
+        milestones (int, optional): Milestones of each task and parallel task. Defaults to 1.
+        mode (str, optional): Timeline mode name. Eg. "MONTHLY". Defaults to "MONTHLY".
+        number_of_items (int, optional): Number of timeline items. Defaults to 12.
+        width (int, optional): Roadmap width. Defaults to 1200.
+    """
+
+    name: str
+    groups: int = 3
+    tasks_per_group: int = 4
+    parallel_tasks: int = 0
+    milestones: int = 1
+    mode: str = "MONTHLY"
+    number_of_items: int = 12
+    width: int = 1200
+
+    @property
+    def params(self) -> dict:
+        return {
+            "groups": self.groups,
+            "tasks_per_group": self.tasks_per_group,
+            "parallel_tasks": self.parallel_tasks,
+            "milestones": self.milestones,
+            "mode": self.mode,
+            "number_of_items": self.number_of_items,
+            "width": self.width,
+        }
+
+
+def generate_spec(case: BenchmarkCase, start: date = date(2025, 1, 6)) -> dict:
+    """Generate the roadmap spec of a benchmark case
+
+    The roadmap is deterministic: tasks are spread evenly across the timeline,
+    so the same case always produces the same roadmap.
+
+    Args:
+        case (BenchmarkCase): Shape of the roadmap
+        start (date, optional): Timeline start. Defaults to 2025-01-06 (a Monday).
+
+    Returns:
+        dict: Roadmap spec, see spec.build_roadmap
+    """
+    mode = getattr(TimelineMode, case.mode)
+    span = MODE_DAYS[mode] * case.number_of_items
+    task_count = case.tasks_per_group * (case.parallel_tasks + 1)
+
+    groups = []
+    for group_index in range(case.groups):
+        tasks = []
+        for task_index in range(case.tasks_per_group):
+            ### Parallel tasks follow each other on the row of their task
+            segments = [
+                _get_segment(
+                    span, task_index * (case.parallel_tasks + 1) + i, task_count
+                )
+                for i in range(case.parallel_tasks + 1)
+            ]
+            task_spec = _get_task_spec(
+                f"Task {group_index + 1}.{task_index + 1}", start, *segments[0], case
+            )
+            task_spec["parallel_tasks"] = [
+                _get_task_spec(
+                    f"Parallel {group_index + 1}.{task_index + 1}.{i + 1}",
+                    start,
+                    *segment,
+                    case,
+                )
+                for i, segment in enumerate(segments[1:])
+            ]
+            tasks.append(task_spec)
+        groups.append({"text": f"Group {group_index + 1}", "tasks": tasks})
+
+    return {
+        "width": case.width,
+        "height": 600,
+        "auto_height": True,
+        "show_marker": False,
+        "title": {"text": f"Benchmark {case.name}"},
+        "subtitle": {"text": "Synthetic roadmap"},
+        "timeline": {
+            "mode": case.mode,
+            "start": start.isoformat(),
+            "number_of_items": case.number_of_items,
+        },
+        "groups": groups,
+        "footer": {"text": "Generated by the roadmapper benchmark suite"},
+    }
+
+
+def _get_segment(span: int, index: int, count: int) -> tuple[int, int]:
+    """Get the start and end day of the index-th of count equal slices of the timeline"""
+    first = span * index // count
+    last = max(first, span * (index + 1) // count - 1)
+    return first, last
+
+
+def _get_task_spec(
+    text: str, start: date, first: int, last: int, case: BenchmarkCase
+) -> dict:
+    task_start = start + timedelta(days=first)
+    task_end = start + timedelta(days=last)
+    milestones = [
+        {
+            "text": f"M{i + 1}",
+            "date": (
+                task_start
+                + timedelta(days=(last - first) * (i + 1) // (case.milestones + 1))
+            ).isoformat(),
+        }
+        for i in range(case.milestones)
+    ]
+    return {
+        "text": text,
+        "start": task_start.isoformat(),
+        "end": task_end.isoformat(),
+        "milestones": milestones,
+    }
+
+
+### Default suite. Scales one dimension at a time from the "small" baseline
+DEFAULT_CASES = [
+    BenchmarkCase("small"),
+    BenchmarkCase("groups_10", groups=10),
+    BenchmarkCase("groups_40", groups=40),
+    BenchmarkCase("tasks_20", tasks_per_group=20),
+    BenchmarkCase("parallel_3", parallel_tasks=3),
+    BenchmarkCase("milestones_5", milestones=5),
+    BenchmarkCase("weekly_52", mode="WEEKLY", number_of_items=52, width=2400),
+    BenchmarkCase("quarterly_8", mode="QUARTERLY", number_of_items=8),
+    BenchmarkCase("yearly_5", mode="YEARLY", number_of_items=5),
+    BenchmarkCase(
+        "large", groups=20, tasks_per_group=10, parallel_tasks=1, milestones=2
+    ),
+]
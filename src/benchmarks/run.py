@@ -0,0 +1,298 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Roadmapper benchmark suite
+
+Usage:
+    python -m src.benchmarks.run [--repeat N] [--case NAME ...] [--png-encoding PRESET] [--output results.json]
+    python -m src.benchmarks.run compare baseline.json results.json
+
+Results are written as JSON with sorted keys, so results of two commits can be
+diffed or compared with the compare command.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import drawsvg
+import PIL
+
+from src.benchmarks.generators import DEFAULT_CASES, BenchmarkCase, generate_spec
+from src.roadmapper.batch import warm_up
+from src.roadmapper.pngencoding import PNG_ENCODING_PRESETS
+from src.roadmapper.spec import build_roadmap
+from src.roadmapper.version import __version__
+
+RESULT_FORMAT_VERSION = 1
+
+FORMATS = ("png", "svg")
+
+### Timed metrics of a case, in milliseconds
+TIMED_METRICS = (
+    "build_ms",
+    "layout_ms",
+    "png_render_ms",
+    "svg_render_ms",
+    "png_encode_ms",
+    "svg_encode_ms",
+)
+
+
+def measure_once(spec: dict) -> dict:
+    """Build, lay out, render and encode a roadmap once
+
+    Args:
+        spec (dict): Roadmap spec
+
+    Returns:
+        dict: Timings in milliseconds, output sizes in bytes and the number of draw primitives
+    """
+    start = time.perf_counter()
+    roadmap = build_roadmap(spec)
+    built = time.perf_counter()
+    ### Layout records the display list; the first format is replayed in the same call
+    painters = roadmap.render([FORMATS[0]])
+    rendered = time.perf_counter()
+    painting_ms = roadmap.stats.timings.get("painting", 0)
+
+    sample = {
+        "build_ms": (built - start) * 1000,
+        "layout_ms": (rendered - built) * 1000 - painting_ms,
+        f"{FORMATS[0]}_render_ms": painting_ms,
+        "primitives": len(roadmap.display_list),
+    }
+    for painter_type in FORMATS[1:]:
+        start = time.perf_counter()
+        painters.update(roadmap.render([painter_type]))
+        sample[f"{painter_type}_render_ms"] = (time.perf_counter() - start) * 1000
+
+    for painter_type in FORMATS:
+        start = time.perf_counter()
+        data = roadmap.to_bytes(painter_type)
+        sample[f"{painter_type}_encode_ms"] = (time.perf_counter() - start) * 1000
+        sample[f"{painter_type}_bytes"] = len(data) if data is not None else 0
+    return sample
+
+
+def measure_peak_memory(spec: dict) -> int:
+    """Measure the peak Python memory allocated while building, rendering and encoding a roadmap.
+    Memory allocated by Pillow for image buffers is not traced by tracemalloc
+
+    Args:
+        spec (dict): Roadmap spec
+
+    Returns:
+        int: Peak traced memory in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        measure_once(spec)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_case(
+    case: BenchmarkCase,
+    repeat: int = 5,
+    png_encoding: str = "default",
+    tile_size: int = None,
+) -> dict:
+    """Run a benchmark case
+
+    Args:
+        case (BenchmarkCase): Case to run
+        repeat (int, optional): Number of timed runs. Defaults to 5.
+        png_encoding (str, optional): PNG encoding preset. Defaults to "default".
+        tile_size (int, optional): Paint PNG in tiles of this size across worker processes. Defaults to None.
+
+    Returns:
+        dict: Case result. Timings are the median and minimum of the timed runs
+    """
+    spec = generate_spec(case)
+    spec["png_encoding"] = png_encoding
+    spec["tile_size"] = tile_size
+    ### Untimed run, so that caches are warm for every timed run
+    first = measure_once(spec)
+    samples = [measure_once(spec) for _ in range(repeat)]
+
+    result = {
+        "name": case.name,
+        "params": case.params,
+        "primitives": first["primitives"],
+        "output_bytes": {
+            painter_type: first[f"{painter_type}_bytes"] for painter_type in FORMATS
+        },
+        "peak_memory_bytes": measure_peak_memory(spec),
+    }
+    for metric in TIMED_METRICS:
+        values = [sample[metric] for sample in samples]
+        result[metric] = {
+            "median": round(statistics.median(values), 3),
+            "min": round(min(values), 3),
+        }
+    return result
+
+
+def run_suite(
+    cases: list[BenchmarkCase] = None,
+    repeat: int = 5,
+    png_encoding: str = "default",
+    tile_size: int = None,
+) -> dict:
+    """Run benchmark cases
+
+    Args:
+        cases (list[BenchmarkCase], optional): Cases to run. Defaults to DEFAULT_CASES.
+        repeat (int, optional): Number of timed runs per case. Defaults to 5.
+        png_encoding (str, optional): PNG encoding preset. Defaults to "default".
+        tile_size (int, optional): Paint PNG in tiles of this size across worker processes. Defaults to None.
+
+    Returns:
+        dict: Results, see RESULT_FORMAT_VERSION
+    """
+    warm_up()
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "environment": get_environment(),
+        "repeat": repeat,
+        "png_encoding": png_encoding,
+        "tile_size": tile_size,
+        "cases": [
+            run_case(case, repeat, png_encoding, tile_size)
+            for case in cases or DEFAULT_CASES
+        ],
+    }
+
+
+def get_environment() -> dict:
+    return {
+        "roadmapper": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "pillow": PIL.__version__,
+        "drawsvg": getattr(drawsvg, "__version__", "unknown"),
+    }
+
+
+def compare(baseline: dict, results: dict) -> list[tuple]:
+    """Compare the median timings, memory and output sizes of two results
+
+    Args:
+        baseline (dict): Baseline results
+        results (dict): Results to compare with the baseline
+
+    Returns:
+        list[tuple]: (case name, metric, baseline value, value, ratio) for every case in both results
+    """
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    rows = []
+    for case in results["cases"]:
+        base = baseline_cases.get(case["name"])
+        if base is None:
+            continue
+        metrics = [
+            (metric, base[metric]["median"], case[metric]["median"])
+            for metric in TIMED_METRICS
+        ]
+        metrics.append(
+            (
+                "peak_memory_bytes",
+                base["peak_memory_bytes"],
+                case["peak_memory_bytes"],
+            )
+        )
+        for painter_type in FORMATS:
+            metrics.append(
+                (
+                    f"{painter_type}_bytes",
+                    base["output_bytes"][painter_type],
+                    case["output_bytes"][painter_type],
+                )
+            )
+        for metric, before, after in metrics:
+            ratio = after / before if before else float("nan")
+            rows.append((case["name"], metric, before, after, ratio))
+    return rows
+
+
+def main(argv: list[str] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "compare":
+        parser = argparse.ArgumentParser(prog="python -m src.benchmarks.run compare")
+        parser.add_argument("baseline")
+        parser.add_argument("results")
+        args = parser.parse_args(argv[1:])
+        with open(args.baseline, "r", encoding="utf8") as f:
+            baseline = json.load(f)
+        with open(args.results, "r", encoding="utf8") as f:
+            results = json.load(f)
+        for name, metric, before, after, ratio in compare(baseline, results):
+            print(
+                f"{name:<16} {metric:<18} {before:>14} {after:>14} {ratio:>7.2f}x"
+            )
+        return 0
+
+    names = [case.name for case in DEFAULT_CASES]
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks.run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument(
+        "--case", action="append", choices=names, help="case to run, repeatable"
+    )
+    parser.add_argument(
+        "--png-encoding",
+        default="default",
+        choices=list(PNG_ENCODING_PRESETS),
+        help="PNG encoding preset",
+    )
+    parser.add_argument(
+        "--tile-size", type=int, help="paint PNG in tiles across worker processes"
+    )
+    parser.add_argument("--output", help="result file. Defaults to stdout")
+    args = parser.parse_args(argv)
+
+    cases = [
+        case for case in DEFAULT_CASES if args.case is None or case.name in args.case
+    ]
+    results = run_suite(cases, args.repeat, args.png_encoding, args.tile_size)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import os
+import sys
+import time
+from typing import Iterable, Iterator, Union
+
+from .displaylist import DisplayListPainter
+from .fontindex import font_index
+from .spec import build_roadmap, load_roadmap
+
+
+@dataclass()
+class BatchJob:
+    """A roadmap to render and the files to render it to
+
+    Args:
+        spec (dict | str): Roadmap spec (see spec.build_roadmap), or path to a JSON spec file
+        filenames (list[str]): Output files. The file extension selects the format. Eg. ["a.png", "a.svg"]
+    """
+
+    spec: Union[dict, str]
+    filenames: list[str] = field(default_factory=list)
+
+
+@dataclass()
+class BatchResult:
+    """Outcome and timing of a batch job
+
+    Args:
+        index (int): Position of the job in the batch
+        filenames (list[str]): Output files
+        build_ms (float): Time spent building the roadmap from its spec
+        render_ms (float): Time spent laying out and rendering all formats
+        save_ms (float): Time spent writing the files
+        pid (int): Worker process id
+        error (str): Error message if the job failed, otherwise None
+        stats (dict): Per-phase timings and counters, see RenderStats.as_dict
+    """
+
+    index: int
+    filenames: list[str]
+    build_ms: float = 0
+    render_ms: float = 0
+    save_ms: float = 0
+    pid: int = 0
+    error: str = None
+    stats: dict = None
+
+    @property
+    def total_ms(self) -> float:
+        return self.build_ms + self.render_ms + self.save_ms
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def warm_up(colour_themes: Iterable[str] = ("DEFAULT",)) -> None:
+    """Load the font index and the fonts of colour themes into the process-wide caches
+
+    Args:
+        colour_themes (Iterable[str], optional): Colour themes whose fonts to load. Defaults to ("DEFAULT",).
+    """
+    font_index.load()
+    painter = DisplayListPainter(1, 1)
+    for colour_theme in colour_themes:
+        painter.set_colour_theme(colour_theme)
+        for component in (
+            "title",
+            "subtitle",
+            "timeline_year",
+            "timeline_item",
+            "marker",
+            "group",
+            "task",
+            "milestone",
+            "footer",
+        ):
+            font = getattr(painter, f"{component}_font")
+            font_size = getattr(painter, f"{component}_font_size")
+            ### Box text wrapping measures "a" for every font
+            painter.get_text_dimension("a", font, font_size)
+
+
+def render_job(index: int, job: BatchJob) -> BatchResult:
+    """Render a batch job in the current process
+
+    Args:
+        index (int): Position of the job in the batch
+        job (BatchJob): The job
+
+    Returns:
+        BatchResult: The outcome. Errors are reported in the result rather than raised.
+    """
+    result = BatchResult(index=index, filenames=job.filenames, pid=os.getpid())
+    try:
+        start = time.perf_counter()
+        if isinstance(job.spec, str):
+            roadmap = load_roadmap(job.spec)
+        else:
+            roadmap = build_roadmap(job.spec)
+        built = time.perf_counter()
+
+        formats = [
+            os.path.splitext(filename)[1][1:].lower() for filename in job.filenames
+        ]
+        painters = roadmap.render(list(dict.fromkeys(formats)))
+        rendered = time.perf_counter()
+
+        for filename, painter_type in zip(job.filenames, formats):
+            data = roadmap.to_bytes(painter_type)
+            with roadmap.stats.time("file_write"):
+                painters[painter_type].write_surface(data, filename)
+        saved = time.perf_counter()
+        roadmap.stats.count_primitives(roadmap.display_list.items)
+        roadmap.stats.update_process_counters()
+        result.stats = roadmap.stats.as_dict()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    result.build_ms = (built - start) * 1000
+    result.render_ms = (rendered - built) * 1000
+    result.save_ms = (saved - rendered) * 1000
+    return result
+
+
+def iter_batch(
+    jobs: Iterable[BatchJob],
+    max_workers: int = None,
+    max_tasks_per_child: int = 100,
+    colour_themes: Iterable[str] = ("DEFAULT",),
+) -> Iterator[BatchResult]:
+    """Render roadmaps across a pool of worker processes
+
+    Args:
+        jobs (Iterable[BatchJob]): Jobs to render
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+                                     0 renders in the current process.
+        max_tasks_per_child (int, optional): Jobs a worker renders before it is replaced, to bound its memory.
+                                             Defaults to 100. Requires Python 3.11, ignored before.
+        colour_themes (Iterable[str], optional): Colour themes to warm up in every worker. Defaults to ("DEFAULT",).
+
+    Yields:
+        BatchResult: One result per job, in job order
+    """
+    jobs = list(jobs)
+    colour_themes = tuple(colour_themes)
+    if max_workers == 0:
+        warm_up(colour_themes)
+        for index, job in enumerate(jobs):
+            yield render_job(index, job)
+        return
+
+    options = {}
+    if sys.version_info >= (3, 11):
+        options["max_tasks_per_child"] = max_tasks_per_child
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=warm_up,
+        initargs=(colour_themes,),
+        **options,
+    ) as executor:
+        yield from executor.map(render_job, range(len(jobs)), jobs)
+
+
+def render_batch(
+    jobs: Iterable[BatchJob],
+    max_workers: int = None,
+    max_tasks_per_child: int = 100,
+    colour_themes: Iterable[str] = ("DEFAULT",),
+) -> list[BatchResult]:
+    """Render roadmaps across a pool of worker processes
+
+    Args are the same as iter_batch.
+
+    Returns:
+        list[BatchResult]: One result per job, in job order
+    """
+    return list(iter_batch(jobs, max_workers, max_tasks_per_child, colour_themes))
@@ -0,0 +1,489 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import dataclass, field, replace
+from typing import Iterator, Union
+
+from PIL import Image
+
+from .painter import Painter
+
+### Anti-aliasing and polygon rounding can paint slightly outside the geometry
+BOUNDS_PADDING = 2
+
+EVERYWHERE = (float("-inf"), float("-inf"), float("inf"), float("inf"))
+NOWHERE = (0, 0, 0, 0)
+
+
+def intersects(bounds: tuple, other: tuple) -> bool:
+    """Check whether two (x1, y1, x2, y2) rectangles overlap"""
+    return (
+        bounds[0] < other[2]
+        and other[0] < bounds[2]
+        and bounds[1] < other[3]
+        and other[1] < bounds[3]
+    )
+
+
+def get_union(bounds_list: list[tuple]) -> tuple:
+    """Get the smallest (x1, y1, x2, y2) rectangle containing all the rectangles"""
+    return (
+        min(bounds[0] for bounds in bounds_list),
+        min(bounds[1] for bounds in bounds_list),
+        max(bounds[2] for bounds in bounds_list),
+        max(bounds[3] for bounds in bounds_list),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Background:
+    """Fill the whole surface with the background colour"""
+
+    colour: str
+
+    def draw(self, painter: Painter) -> None:
+        painter.background_colour = self.colour
+        painter.set_background_colour()
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        return EVERYWHERE
+
+    def translate(self, dx: float, dy: float) -> "Background":
+        return self
+
+
+@dataclass(frozen=True, slots=True)
+class Rect:
+    """A filled rectangle"""
+
+    x: float
+    y: float
+    width: float
+    height: float
+    fill_colour: str
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_box(self.x, self.y, self.width, self.height, self.fill_colour)
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        return (
+            self.x - BOUNDS_PADDING,
+            self.y - BOUNDS_PADDING,
+            self.x + self.width + BOUNDS_PADDING,
+            self.y + self.height + BOUNDS_PADDING,
+        )
+
+    def translate(self, dx: float, dy: float) -> "Rect":
+        return replace(self, x=self.x + dx, y=self.y + dy)
+
+
+@dataclass(frozen=True, slots=True)
+class RoundedRect(Rect):
+    """A filled rectangle with rounded corners"""
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_rounded_box(
+            self.x, self.y, self.width, self.height, self.fill_colour
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ArrowheadRect(Rect):
+    """A filled rectangle ending in an arrowhead"""
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_arrowhead_box(
+            self.x, self.y, self.width, self.height, self.fill_colour
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Diamond(Rect):
+    """A filled diamond inscribed in a rectangle"""
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_diamond(self.x, self.y, self.width, self.height, self.fill_colour)
+
+
+@dataclass(frozen=True, slots=True)
+class TextRun:
+    """A single line of text
+
+    Box text is top-left anchored and comes from text wrapped inside a box.
+    Free text is drawn with the painter's draw_text anchoring.
+    """
+
+    x: float
+    y: float
+    text: str
+    font: str
+    font_size: int
+    font_colour: str
+    in_box: bool = False
+
+    def draw(self, painter: Painter) -> None:
+        if self.in_box:
+            painter.draw_box_text(
+                self.x, self.y, self.text, self.font, self.font_size, self.font_colour
+            )
+        else:
+            painter.draw_text(
+                self.x, self.y, self.text, self.font, self.font_size, self.font_colour
+            )
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        ### Both kinds of text are top-left anchored on raster surfaces
+        left, top, right, bottom = painter.text_measurer.get_bbox(
+            self.text, self.font, self.font_size, painter.get_font
+        )
+        return (
+            self.x + left - BOUNDS_PADDING,
+            self.y + top - BOUNDS_PADDING,
+            self.x + right + BOUNDS_PADDING,
+            self.y + bottom + BOUNDS_PADDING,
+        )
+
+    def translate(self, dx: float, dy: float) -> "TextRun":
+        return replace(self, x=self.x + dx, y=self.y + dy)
+
+
+@dataclass(frozen=True, slots=True)
+class Line:
+    """A solid or dashed line"""
+
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    colour: str
+    transparency: float
+    width: int
+    style: Union[str, tuple] = "dashed"
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_line(
+            self.x1,
+            self.y1,
+            self.x2,
+            self.y2,
+            self.colour,
+            self.transparency,
+            self.width,
+            self.style,
+        )
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        padding = self.width + BOUNDS_PADDING
+        ### Each dash of a dashed line is 10 pixels long
+        dash_length = 10 if self.style == "dashed" else 0
+        return (
+            min(self.x1, self.x2) - padding,
+            min(self.y1, self.y2) - padding,
+            max(self.x1, self.x2) + padding,
+            max(self.y1, self.y2) + dash_length + padding,
+        )
+
+    def translate(self, dx: float, dy: float) -> "Line":
+        return replace(
+            self, x1=self.x1 + dx, y1=self.y1 + dy, x2=self.x2 + dx, y2=self.y2 + dy
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class VerticalLines:
+    """Vertical lines of the same colour, width, style and length, eg. the timeline grid"""
+
+    xs: tuple
+    y1: float
+    y2: float
+    colour: str
+    transparency: float
+    width: int
+    style: Union[str, tuple] = "solid"
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_vertical_lines(
+            self.xs,
+            self.y1,
+            self.y2,
+            self.colour,
+            self.transparency,
+            self.width,
+            self.style,
+        )
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        if len(self.xs) == 0:
+            return NOWHERE
+        padding = self.width + BOUNDS_PADDING
+        ### Each dash of a dashed line is 10 pixels long
+        dash_length = 10 if self.style == "dashed" else 0
+        return (
+            min(self.xs) - padding,
+            min(self.y1, self.y2) - padding,
+            max(self.xs) + padding,
+            max(self.y1, self.y2) + dash_length + padding,
+        )
+
+    def translate(self, dx: float, dy: float) -> "VerticalLines":
+        return replace(
+            self,
+            xs=tuple(x + dx for x in self.xs),
+            y1=self.y1 + dy,
+            y2=self.y2 + dy,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Cross:
+    """A cross on a box, used to debug layout"""
+
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    colour: str
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_cross_on_box(self.x1, self.y1, self.x2, self.y2, self.colour)
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        return (
+            self.x1 - BOUNDS_PADDING,
+            self.y1 - BOUNDS_PADDING,
+            self.x2 + BOUNDS_PADDING,
+            self.y2 + BOUNDS_PADDING,
+        )
+
+    def translate(self, dx: float, dy: float) -> "Cross":
+        return replace(
+            self, x1=self.x1 + dx, y1=self.y1 + dy, x2=self.x2 + dx, y2=self.y2 + dy
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ImageRef:
+    """An image file scaled into a rectangle"""
+
+    image: str
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def draw(self, painter: Painter) -> None:
+        painter.draw_logo(self.image, self.x, self.y, self.width, self.height)
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def translate(self, dx: float, dy: float) -> "ImageRef":
+        return replace(self, x=self.x + dx, y=self.y + dy)
+
+
+@dataclass(frozen=True, slots=True)
+class SurfaceSize:
+    """Resize the surface to its final size"""
+
+    width: int
+    height: int
+
+    def draw(self, painter: Painter) -> None:
+        painter.set_surface_size(self.width, self.height)
+
+    def get_bounds(self, painter: Painter) -> tuple:
+        ### Resizes the surface but paints nothing
+        return NOWHERE
+
+    def translate(self, dx: float, dy: float) -> "SurfaceSize":
+        return self
+
+
+DisplayItem = Union[
+    Background,
+    Rect,
+    RoundedRect,
+    ArrowheadRect,
+    Diamond,
+    TextRun,
+    Line,
+    VerticalLines,
+    Cross,
+    ImageRef,
+    SurfaceSize,
+]
+
+
+@dataclass()
+class DisplayList:
+    """The drawing primitives of a laid out roadmap, in painting order
+
+    Args:
+        width (int): Width of the surface the list was laid out on
+        height (int): Height of the surface the list was laid out on
+    """
+
+    width: int
+    height: int
+    items: list = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[DisplayItem]:
+        return iter(self.items)
+
+    def append(self, item: DisplayItem) -> None:
+        self.items.append(item)
+
+    def replay(self, painter: Painter) -> Painter:
+        """Draw every item of the list on a painter
+
+        Args:
+            painter (Painter): Output painter, created with the same width and height
+
+        Returns:
+            Painter: The painter
+        """
+        for item in self.items:
+            item.draw(painter)
+        return painter
+
+
+class DisplayListPainter(Painter):
+    """A painter that records drawing calls into a DisplayList instead of rendering them
+
+    Text is measured and wrapped while recording, so replaying the list
+    does not measure any text.
+    """
+
+    def __init__(self, width: int, height: int):
+        """__init__ method
+
+        Args:
+            width (int): Width of the surface
+            height (int): Height of the surface
+        """
+        super().__init__(width, height)
+        self.display_list = DisplayList(width, height)
+
+    def draw_box(
+        self, x: int, y: int, width: int, height: int, box_fill_colour: str
+    ) -> None:
+        self.display_list.append(Rect(x, y, width, height, box_fill_colour))
+
+    def draw_rounded_box(
+        self, x: int, y: int, width: int, height: int, box_fill_colour: str
+    ) -> None:
+        self.display_list.append(RoundedRect(x, y, width, height, box_fill_colour))
+
+    def draw_arrowhead_box(
+        self, x: int, y: int, width: int, height: int, box_fill_colour: str
+    ) -> None:
+        self.display_list.append(ArrowheadRect(x, y, width, height, box_fill_colour))
+
+    def draw_diamond(
+        self, x: int, y: int, width: int, height: int, fill_colour: str
+    ) -> None:
+        self.display_list.append(Diamond(x, y, width, height, fill_colour))
+
+    def draw_text(
+        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
+    ) -> None:
+        self.display_list.append(TextRun(x, y, text, font, font_size, font_colour))
+
+    def draw_box_text(
+        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
+    ) -> None:
+        self.display_list.append(
+            TextRun(x, y, text, font, font_size, font_colour, in_box=True)
+        )
+
+    def draw_line(
+        self,
+        x1: int,
+        y1: int,
+        x2: int,
+        y2: int,
+        line_colour: str,
+        line_transparency: int,
+        line_width: int,
+        line_style: str = "dashed",
+    ) -> None:
+        ### Keep a dash pattern set on this painter when the line is replayed
+        if line_style == "dashed" and self.dash is not None:
+            line_style = self.dash
+        self.display_list.append(
+            Line(
+                x1, y1, x2, y2, line_colour, line_transparency, line_width, line_style
+            )
+        )
+
+    def draw_vertical_lines(
+        self,
+        xs: list[float],
+        y1: int,
+        y2: int,
+        line_colour: str,
+        line_transparency: int,
+        line_width: int,
+        line_style: Union[str, tuple] = "solid",
+    ) -> None:
+        if line_style == "dashed" and self.dash is not None:
+            line_style = self.dash
+        self.display_list.append(
+            VerticalLines(
+                tuple(xs),
+                y1,
+                y2,
+                line_colour,
+                line_transparency,
+                line_width,
+                line_style,
+            )
+        )
+
+    def draw_cross_on_box(
+        self, x1: int, y1: int, x2: int, y2: int, colour: str
+    ) -> None:
+        self.display_list.append(Cross(x1, y1, x2, y2, colour))
+
+    def draw_logo(self, image: str, x: int, y: int, width: int, height: int) -> None:
+        self.display_list.append(ImageRef(image, x, y, width, height))
+
+    def set_background_colour(self) -> None:
+        self.display_list.append(Background(self.background_colour))
+
+    def set_surface_size(self, width: int, height: int) -> None:
+        self.display_list.append(SurfaceSize(width, height))
+
+    def get_image_size(self, image: str) -> tuple:
+        """Get image size
+
+        Args:
+            image (str): Image path
+
+        Returns:
+            (width (int), height (int)): Image width and height
+        """
+        with Image.open(image) as img:
+            return img.size
@@ -0,0 +1,121 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from PIL import ImageFont
+
+
+class FontCache:
+    """A bounded, least-recently-used cache of Pillow FreeType fonts"""
+
+    def __init__(self, max_size: int = 128):
+        """__init__ method
+
+        Args:
+            max_size (int, optional): Maximum number of fonts kept open. Defaults to 128.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._fonts = OrderedDict()
+        self._lock = Lock()
+
+    def get_font(
+        self, font_path: str, font_size: int, layout_engine: int = None
+    ) -> ImageFont.FreeTypeFont:
+        """Get a font, loading it from disk only if it is not cached yet
+
+        Args:
+            font_path (str): Path to the font file
+            font_size (int): Font size
+            layout_engine (int, optional): Pillow layout engine. Defaults to None (Pillow's choice).
+
+        Returns:
+            ImageFont.FreeTypeFont: Loaded font
+        """
+        key = (os.path.abspath(font_path), font_size, layout_engine)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+
+        ### Load outside the lock, so a slow font file does not block other threads
+        font = ImageFont.truetype(key[0], font_size, layout_engine=layout_engine)
+
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            self.__evict()
+        return font
+
+    def set_max_size(self, max_size: int) -> None:
+        """Change the cache capacity, evicting the oldest fonts if required
+
+        Args:
+            max_size (int): Maximum number of fonts kept open
+        """
+        with self._lock:
+            self.max_size = max_size
+            self.__evict()
+
+    def clear(self) -> None:
+        """Remove all cached fonts and reset the counters"""
+        with self._lock:
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+            dict: hits, misses, evictions, size and max_size of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._fonts),
+                "max_size": self.max_size,
+            }
+
+    def __evict(self) -> None:
+        """Drop least recently used fonts until the cache fits max_size"""
+        while len(self._fonts) > max(self.max_size, 0):
+            self._fonts.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+
+### Shared by all Painter instances in this process
+font_cache = FontCache()
@@ -0,0 +1,368 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import os
+import sys
+from threading import Lock, get_ident
+from typing import Iterable
+
+from PIL import ImageFont
+
+FONT_INDEX_VERSION = 2
+
+### Preferred extension first when several files share the same name
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+### Style names that all mean "regular"
+REGULAR_STYLES = ("regular", "book", "normal", "roman", "plain")
+
+STYLE_WORDS = (
+    "regular",
+    "book",
+    "normal",
+    "roman",
+    "plain",
+    "thin",
+    "light",
+    "medium",
+    "semibold",
+    "bold",
+    "black",
+    "italic",
+    "oblique",
+)
+
+
+def get_default_font_dirs() -> list[str]:
+    """Get the font directories of the current operating system, most preferred first
+
+    Returns:
+        list[str]: Font directories
+    """
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):  # Windows
+        local_app_data = os.environ.get(
+            "LOCALAPPDATA", os.path.join(home, "AppData", "Local")
+        )
+        return [
+            os.path.join("C:\\", "Windows", "Fonts"),
+            os.path.join(local_app_data, "Microsoft", "Windows", "Fonts"),
+        ]
+    if sys.platform.startswith("darwin"):  # macOS
+        return [
+            os.path.join("/", "System", "Library", "Fonts", "Supplemental"),
+            os.path.join("/", "System", "Library", "Fonts"),
+            os.path.join("/", "Library", "Fonts"),
+            os.path.join(home, "Library", "Fonts"),
+        ]
+    ### Linux and other Unix-like systems
+    return [
+        "/usr/share/fonts/truetype/msttcorefonts",
+        "/usr/share/fonts",
+        "/usr/local/share/fonts",
+        os.path.join(home, ".fonts"),
+        os.path.join(home, ".local", "share", "fonts"),
+    ]
+
+
+def get_default_index_file() -> str:
+    """Get the path of the persisted font index
+
+    Returns:
+        str: Index file path. ROADMAPPER_FONT_INDEX overrides the default location.
+    """
+    if os.environ.get("ROADMAPPER_FONT_INDEX"):
+        return os.environ["ROADMAPPER_FONT_INDEX"]
+    if sys.platform.startswith("win"):
+        cache_dir = os.environ.get(
+            "LOCALAPPDATA", os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        )
+    else:
+        cache_dir = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        )
+    return os.path.join(cache_dir, "roadmapper", "font-index.json")
+
+
+def normalise_name(name: str) -> str:
+    """Normalise a font, family or style name for matching. Eg. "DejaVu Sans-Bold" -> "dejavusansbold"
+
+    Args:
+        name (str): Name to normalise
+
+    Returns:
+        str: Lower case name without spaces, hyphens and underscores
+    """
+    return "".join(c for c in name.lower() if c not in " -_")
+
+
+class FontIndex:
+    """Index of installed font files by file name and by family/style
+
+    The index is built once per process by scanning the font directories, and
+    persisted to disk. The persisted index is reused as long as none of the
+    scanned directories has been modified since. Family and style names are
+    read from the font files only when a name is not found by file name.
+    """
+
+    def __init__(self, font_dirs: list[str] = None, index_file: str = None):
+        """__init__ method
+
+        Args:
+            font_dirs (list[str], optional): Directories to scan, most preferred first. Defaults to the OS font directories.
+            index_file (str, optional): Where to persist the index. Defaults to the user cache directory,
+                                        or ROADMAPPER_FONT_INDEX when the index is loaded.
+                                        Set to "" to keep the index in memory only.
+        """
+        self.font_dirs = font_dirs if font_dirs is not None else get_default_font_dirs()
+        self.index_file = index_file
+        self._index = None
+        self._names = None
+        self._families = None
+        self._found = {}
+        self._lock = Lock()
+
+    def find(self, font_name: str) -> str:
+        """Find the font file of a font
+
+        Args:
+            font_name (str): File name without extension (Eg. "Arial"), family name (Eg. "DejaVu Sans"),
+                             family and style (Eg. "DejaVu Sans Bold") or fontconfig pattern (Eg. "DejaVu Sans:style=Bold")
+
+        Returns:
+            str: Path to the font file, or None if no installed font matches
+        """
+        if font_name in self._found:
+            return self._found[font_name]
+        if self._names is None:
+            self.load()
+
+        path = self._names.get(normalise_name(font_name))
+        if path is None:
+            families = self.__get_families()
+            family, style = self.__split_family_style(font_name)
+            path = families.get(f"{family}:{style}")
+            if path is None and style == "regular":
+                path = families.get(f"{family}:")
+        self._found[font_name] = path
+        return path
+
+    def load(self) -> None:
+        """Load the persisted index, or scan the font directories if it is stale"""
+        with self._lock:
+            if self._names is not None:
+                return
+            index = self.__read_index_file()
+            if index is None:
+                index = self.__scan()
+                self.__write_index_file(index)
+            self._index = index
+            self._names = index["names"]
+            self._families = index["families"]
+
+    def refresh(self) -> None:
+        """Rescan the font directories and persist the new index"""
+        with self._lock:
+            index = self.__scan()
+            self.__write_index_file(index)
+            self._index = index
+            self._names = index["names"]
+            self._families = index["families"]
+            self._found = {}
+
+    def __get_families(self) -> dict:
+        """Get the family/style index, reading the names of the font files on first use
+
+        Returns:
+            dict: "family:style" and "family:" -> font file path
+        """
+        with self._lock:
+            if self._families is None:
+                self._families = self.__read_families(self._names.values())
+                self._index["families"] = self._families
+                self.__write_index_file(self._index)
+            return self._families
+
+    def __read_families(self, paths: Iterable[str]) -> dict:
+        """Read the family and style names of font files
+
+        Args:
+            paths (Iterable[str]): Font file paths, most preferred first
+
+        Returns:
+            dict: "family:style" and "family:" -> font file path
+        """
+        families = {}
+        for path in paths:
+            try:
+                family, style = ImageFont.truetype(path, 10).getname()
+            except OSError:
+                continue
+            family = normalise_name(family or "")
+            style = self.__normalise_style(style or "")
+            families.setdefault(f"{family}:{style}", path)
+            families.setdefault(f"{family}:", path)
+        return families
+
+    def __split_family_style(self, font_name: str) -> tuple[str, str]:
+        """Split a font name into normalised family and style names
+
+        Args:
+            font_name (str): Font name. Eg. "DejaVu Sans Bold" or "DejaVu Sans:style=Bold"
+
+        Returns:
+            tuple[str, str]: Family and style. Style is "regular" if not specified
+        """
+        if ":style=" in font_name:
+            family, style = font_name.split(":style=", 1)
+            return normalise_name(family), self.__normalise_style(style)
+
+        words = font_name.replace("-", " ").split()
+        style_words = []
+        while len(words) > 1 and words[-1].lower() in STYLE_WORDS:
+            style_words.insert(0, words.pop())
+        return normalise_name(" ".join(words)), self.__normalise_style(
+            " ".join(style_words)
+        )
+
+    def __normalise_style(self, style: str) -> str:
+        style = normalise_name(style)
+        return "regular" if style in REGULAR_STYLES or style == "" else style
+
+    def __is_up_to_date(self, mtimes: dict) -> bool:
+        """Check whether none of the scanned directories has been modified
+
+        Args:
+            mtimes (dict): Directory path -> modification time, recorded at scan time
+
+        Returns:
+            bool: True if the directories are unchanged
+        """
+        ### Adding or removing a font file or folder changes the mtime of its parent directory
+        for font_dir, mtime in mtimes.items():
+            try:
+                if os.stat(font_dir).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return all(
+            font_dir in mtimes or not os.path.isdir(font_dir)
+            for font_dir in self.font_dirs
+        )
+
+    def __scan(self) -> dict:
+        """Scan the font directories
+
+        Returns:
+            dict: The index
+        """
+        names = {}
+        mtimes = {}
+        for font_dir in self.font_dirs:
+            for root, dirs, files in os.walk(font_dir):
+                if root in mtimes:
+                    ### Already scanned as a sub-directory of a previous font directory
+                    dirs.clear()
+                    continue
+                dirs.sort()
+                mtimes[root] = os.stat(root).st_mtime_ns
+                font_files = [
+                    f for f in files if os.path.splitext(f)[1].lower() in FONT_EXTENSIONS
+                ]
+                font_files.sort(
+                    key=lambda f: (
+                        FONT_EXTENSIONS.index(os.path.splitext(f)[1].lower()),
+                        f,
+                    )
+                )
+                for file_name in font_files:
+                    names.setdefault(
+                        normalise_name(os.path.splitext(file_name)[0]),
+                        os.path.join(root, file_name),
+                    )
+
+        return {
+            "version": FONT_INDEX_VERSION,
+            "font_dirs": self.font_dirs,
+            "mtimes": mtimes,
+            "names": names,
+            ### Read on the first lookup by family name
+            "families": None,
+        }
+
+    def __get_index_file(self) -> str:
+        """Get the path of the persisted index
+
+        Returns:
+            str: Index file path, or "" to keep the index in memory only
+        """
+        if self.index_file is not None:
+            return self.index_file
+        return get_default_index_file()
+
+    def __read_index_file(self) -> dict:
+        """Read the persisted index
+
+        Returns:
+            dict: The index, or None if it is missing or stale
+        """
+        index_file = self.__get_index_file()
+        if not index_file or not os.path.isfile(index_file):
+            return None
+        try:
+            with open(index_file, "r", encoding="utf8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            index.get("version") != FONT_INDEX_VERSION
+            or index.get("font_dirs") != self.font_dirs
+        ):
+            return None
+        if not self.__is_up_to_date(index.get("mtimes", {})):
+            return None
+        return index
+
+    def __write_index_file(self, index: dict) -> None:
+        """Persist the index. Failures are ignored, eg. on read-only file systems
+
+        Args:
+            index (dict): The index
+        """
+        index_file = self.__get_index_file()
+        if not index_file:
+            return
+        temp_file = f"{index_file}.{os.getpid()}.{get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(index_file) or ".", exist_ok=True)
+            with open(temp_file, "w", encoding="utf8") as f:
+                json.dump(index, f)
+            os.replace(temp_file, index_file)
+        except OSError:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+### Shared by all Painter instances in this process
+font_index = FontIndex()
@@ -20,8 +20,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import date
+from typing import Union
 from .painter import Painter
 from .timeline import Timeline
 from .task import Task
@@ -45,6 +46,8 @@ class Group:
     tasks: list = field(init=False, default_factory=list)
     text_x: int = field(init=False, default=0)
     text_y: int = field(init=False, default=0)
+    ### Set when the group changes, cleared once it is laid out
+    is_dirty: bool = field(init=False, default=True, repr=False)
     painter: Painter = None
 
     # def __post_init__(self):
@@ -56,8 +59,8 @@ class Group:
     def add_task(
         self,
         text: str,
-        start: datetime,
-        end: datetime,
+        start: Union[str, date],
+        end: Union[str, date],
         font: str = "",
         font_size: int = 0,
         font_colour: str = "",
@@ -69,8 +72,8 @@ class Group:
 
         Args:
             text (str): Task text
-            start (datetime): Task start date
-            end (datetime): Task end date
+            start (str | date | datetime): Task start date. Strings are in YYYY-MM-DD format
+            end (str | date | datetime): Task end date. Strings are in YYYY-MM-DD format
             font (str, optional): Task font. Defaults to "Arial".
             font_size (int, optional): Task font size. Defaults to 12.
             font_colour (str, optional): Task font colour. Defaults to "Black". HTML colour name or hex code. Eg. #FFFFFF or LightGreen
@@ -101,9 +104,46 @@ class Group:
         )
 
         self.tasks.append(task)
+        self.is_dirty = True
 
         return task
 
+    def update(self, **changes) -> None:
+        """Change group settings. The group is laid out again by Roadmap.redraw
+
+        Args:
+            **changes: New values of the group settings. Eg. text="New text", fill_colour="Red"
+        """
+        settings = [f.name for f in fields(self) if f.init and f.name != "painter"]
+        for name, value in changes.items():
+            if name not in settings:
+                raise ValueError(f"Unknown group setting '{name}'")
+            setattr(self, name, value)
+        self.is_dirty = True
+
+    def mark_dirty(self) -> None:
+        """Mark the group as changed, so that Roadmap.redraw lays it out again"""
+        self.is_dirty = True
+
+    def is_changed(self) -> bool:
+        """Check whether the group or any of its tasks changed since it was laid out
+
+        Returns:
+            bool: True if the group needs to be laid out again
+        """
+        return self.is_dirty or any(task.is_changed() for task in self.tasks)
+
+    def mark_clean(self) -> None:
+        """Mark the group and its tasks as laid out"""
+        self.is_dirty = False
+        for task in self.tasks:
+            task.mark_clean()
+
+    def reset_draw_position(self) -> None:
+        """Clear the draw positions of the group's tasks before laying them out again"""
+        for task in self.tasks:
+            task.reset_draw_position()
+
     def set_draw_position(self, painter: Painter, timeline: Timeline) -> None:
         """Set group draw position
 
@@ -154,7 +194,7 @@ class Group:
         )
 
         Helper.printc(
-            f"Group: [{self.text}], x: {self.box_x}, y: {self.box_y}, width: {self.box_width}, height: {self.box_height}",
+            lambda: f"Group: [{self.text}], x: {self.box_x}, y: {self.box_y}, width: {self.box_width}, height: {self.box_height}",
             show_level="group",
         )
 
@@ -162,7 +202,7 @@ class Group:
         for task in self.tasks:
             task.set_draw_position(painter, self.box_x, painter.next_y_pos, timeline)
             Helper.printc(
-                f"\tTask: [{task.text}], x: {task.box_x}, y: {task.box_y}, width: {task.box_width}, height: {task.box_height}",
+                lambda: f"\tTask: [{task.text}], x: {task.box_x}, y: {task.box_y}, width: {task.box_width}, height: {task.box_height}",
                 show_level="task",)
 
         painter.next_y_pos = self.box_y + self.box_height
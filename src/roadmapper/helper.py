@@ -19,9 +19,13 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-import inspect
 import logging
+import os
+import stat
+import sys
 import uuid
+from datetime import date, datetime
+from typing import Callable, Union
 from rich.console import Console
 from rich.panel import Panel
 
@@ -38,24 +42,33 @@ class Helper:
     show_footer = False
     show_logo = False
 
+    ### Number of date strings parsed, reported by RenderStats
+    date_parse_count = 0
+
     @staticmethod
     def should_show_message(show_level: str) -> bool:
+        ### Categories without a show_ flag (eg. "general") are never shown
+        return getattr(Helper, f"show_{show_level}", False) is True
+
+    @staticmethod
+    def is_enabled(show_level: str = "general") -> bool:
+        """Check whether debug messages of a category will be printed.
+        Use this to skip loops that only exist to print debug messages.
+
+        Args:
+            show_level (str, optional): Message category. Defaults to "general".
+
+        Returns:
+            bool: True if the category is enabled and the root logger is at DEBUG level
+        """
         return (
-            (show_level == "group" and Helper.show_group)
-            or (show_level == "task" and Helper.show_task)
-            or (show_level == "parallel_task" and Helper.show_parallel_task)
-            or (show_level == "milestone" and Helper.show_milestone)
-            or (show_level == "marker" and Helper.show_marker)
-            or (show_level == "title" and Helper.show_title)
-            or (show_level == "header" and Helper.show_header)
-            or (show_level == "footer" and Helper.show_footer)
-            or (show_level == "logo" and Helper.show_logo)
-            or (show_level == "timeline" and Helper.show_timeline)
+            Helper.should_show_message(show_level)
+            and logging.getLogger().getEffectiveLevel() == logging.DEBUG
         )
 
     @staticmethod
     def printc(
-        message: str,
+        message: Union[str, Callable[[], str]],
         color: str = "30",
         reverse: bool = False,
         end: str = "\n",
@@ -63,41 +76,53 @@ class Helper:
         show_level: str = "general",
         true_condition: bool = True,
     ):
-        """Print text in color"""
+        """Print text in color
 
-        root_logger = logging.getLogger()
+        Args:
+            message (str | Callable[[], str]): Message, or a function returning the message.
+                                               The function is only called if the message is printed.
+        """
+
+        ### Check first, so disabled messages cost no stack introspection or formatting
+        if not (true_condition and Helper.is_enabled(show_level)):
+            return
+
+        if callable(message):
+            message = message()
+
+        caller_frame = sys._getframe(1)
+        caller = caller_frame.f_code.co_name
 
-        call_depth = len(inspect.stack())
+        # determine the caller class name
+        caller_class = ""
+        if "self" in caller_frame.f_locals:
+            caller_class = caller_frame.f_locals["self"].__class__.__name__
+
+        ### Same depth as len(inspect.stack()), without building the frame records
+        call_depth = 0
+        frame = sys._getframe(0)
+        while frame is not None:
+            call_depth += 1
+            frame = frame.f_back
 
         if call_depth < 5:
             call_depth = 0
         else:
             call_depth -= 5
 
-        caller = inspect.stack()[1].function
-
-        # determine the caller class name
-        if "self" in inspect.stack()[1].frame.f_locals:
-            caller_class = inspect.stack()[1].frame.f_locals["self"].__class__.__name__
-
         # add \t tab to the print message if for each level of call depth
         message = "\t" * call_depth + message
 
-        if (
-            root_logger.getEffectiveLevel() == logging.DEBUG
-            and Helper.should_show_message(show_level)
-            and true_condition
-        ):
-            console = Console()
-            if rich_type == "text":
-                style_attribute = "reverse" if reverse else ""
-                console.print(
-                    f"{caller_class}.{caller}(): {message}",
-                    end=end,
-                    style=style_attribute,
-                )
-            elif rich_type == "panel":
-                console.print(Panel(message), style="blue")
+        console = Console()
+        if rich_type == "text":
+            style_attribute = "reverse" if reverse else ""
+            console.print(
+                f"{caller_class}.{caller}(): {message}",
+                end=end,
+                style=style_attribute,
+            )
+        elif rich_type == "panel":
+            console.print(Panel(message), style="blue")
 
     @staticmethod
     def print_info(message: str, color: str = "30", end: str = "\n"):
@@ -119,6 +144,43 @@ class Helper:
         """Log info message"""
         logging.info(message)
 
+    @staticmethod
+    def to_date(value) -> date:
+        """Convert a task or milestone date to a date
+
+        Args:
+            value (str | date | datetime): Date, or string in YYYY-MM-DD format
+
+        Returns:
+            date: The date
+        """
+        if isinstance(value, str):
+            Helper.date_parse_count += 1
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                ### Non ISO strings such as "2023-1-5"
+                return datetime.strptime(value, "%Y-%m-%d").date()
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+
+    @staticmethod
+    def break_hard_link(filename: str) -> None:
+        """Remove a file that has other hard links, eg. one linked to a render cache entry
+        by RenderCache.fetch, so that writing the file does not change the linked content.
+        Other files and symbolic links are left to be written in place.
+
+        Args:
+            filename (str): File about to be written
+        """
+        try:
+            status = os.lstat(filename)
+        except OSError:
+            return
+        if stat.S_ISREG(status.st_mode) and status.st_nlink > 1:
+            os.remove(filename)
+
     @staticmethod
     def get_uuid(prefix: str = "PIPER"):
         # replace uuid '-' with '_'
@@ -72,7 +72,7 @@ class Marker:
                     _,
                     label_pos_percentage,
                 ) = timeline_item.get_timeline_pos_percentage(
-                    timeline.mode, current_date
+                    timeline.mode, current_date.date()
                 )
 
                 # If the current date is the same as the start date of the timeline item,
@@ -111,15 +111,15 @@ class Marker:
             painter (Painter): Pillow wrapper class instance
         """
         Helper.printc(
-            f"Marker current date: {self.current_date}",
+            lambda: f"Marker current date: {self.current_date}",
             show_level="marker",
         )
         Helper.printc(
-            f"Marker label: x: {self.label_x}, y: {self.label_y}, width: {self.label_width}, height: {self.label_height}",
+            lambda: f"Marker label: x: {self.label_x}, y: {self.label_y}, width: {self.label_width}, height: {self.label_height}",
             show_level="marker",
         )
         Helper.printc(
-            f"Marker line: x: {self.line_from_x}, y: {self.line_from_y}, line_to_x: {self.line_to_x}, line_to_y: {self.line_to_y}",
+            lambda: f"Marker line: x: {self.line_from_x}, y: {self.line_from_y}, line_to_x: {self.line_to_x}, line_to_y: {self.line_to_y}",
             show_level="marker",
         )
 
@@ -21,10 +21,11 @@
 # SOFTWARE.
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date
 from typing import Union
 
 from .alignment import Alignment, AlignmentDirection, OffsetType
+from .helper import Helper
 from .painter import Painter
 
 
@@ -33,7 +34,8 @@ class Milestone:
     """Roadmap Milestone class"""
 
     text: str = field(init=True, default=None)
-    date: datetime = field(init=True, default=None)
+    ### Quoted, as the field name shadows the type in the class body
+    date: "date" = field(init=True, default=None)
     font: str = field(init=True, default=None)
     font_size: int = field(init=True, default=None)
     font_colour: str = field(init=True, default=None)
@@ -47,6 +49,11 @@ class Milestone:
     text_x: int = field(init=False, default=0)
     text_y: int = field(init=False, default=0)
 
+    def __post_init__(self):
+        ### Parse the date once, so layout never has to
+        if self.date is not None:
+            self.date = Helper.to_date(self.date)
+
     def draw(self, painter: Painter) -> None:
         """Draw milestone
 
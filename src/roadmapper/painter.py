@@ -21,10 +21,23 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import logging
+import math
 import os
 import sys
+from typing import IO, Union
 from .colourtheme import ColourTheme
+from .fontcache import FontCache, font_cache
+from .fontindex import FontIndex, font_index
+from .helper import Helper
+from .pngencoding import PNG_ENCODING_PRESETS, PNGEncoding
+from .textmeasurer import TextMeasurer, text_measurer
 from PIL import Image, ImageDraw, ImageFont, ImageColor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional. The pure Python path gives the same result
+    np = None
 import drawsvg as dw
 
 import textwrap
@@ -106,6 +119,12 @@ class Painter:
     font: str
     font_size: int
 
+    ### Fonts and text measurements are shared by all painters in the process
+    font_index: FontIndex = font_index
+    font_cache: FontCache = font_cache
+    text_measurer: TextMeasurer = text_measurer
+    _reported_missing_fonts = set()
+
     def __init__(self, width: int, height: int):
         """__init__ method
 
@@ -177,9 +196,21 @@ class Painter:
         ) = self.colour_theme.get_colour_theme_settings("footer")
 
     def get_font_path(self, font_name: str) -> str:
-        """Get the path to the font file"""
+        """Get the path to the font file
+
+        Args:
+            font_name (str): Font name, family name or path to the font file
+
+        Returns:
+            str: Path to the font file
+        """
         if font_name.endswith(".ttf") or font_name.endswith(".otf"):
             return font_name
+
+        font_path = self.font_index.find(font_name)
+        if font_path is not None:
+            return font_path
+
         if sys.platform.startswith("win"):  # Windows
             return os.path.join("C:\\", "Windows", "Fonts", f"{font_name}.ttf")
         elif sys.platform.startswith("darwin"):  # macOS
@@ -187,12 +218,13 @@ class Painter:
                 "/", "System", "Library", "Fonts", "Supplemental", f"{font_name}.ttf"
             )
         elif sys.platform.startswith("linux"):  # Linux
-            font_dir = "/usr/share/fonts/truetype/msttcorefonts"
-
-            if os.path.exists(os.path.join(font_dir, f"{font_name}.ttf")):
-                return os.path.join(font_dir, f"{font_name}.ttf")
             ### This is cater for cases where msttcorefonts is not installed
             linux_font_name = "DejaVuSans"  # Default font for Linux
+            if font_name not in Painter._reported_missing_fonts:
+                Painter._reported_missing_fonts.add(font_name)
+                logging.warning(
+                    f"Font '{font_name}' is not installed, using '{linux_font_name}' instead"
+                )
             return os.path.join(
                 "/",
                 "usr",
@@ -205,6 +237,18 @@ class Painter:
         else:
             raise UnsupportedOSException("Unsupported operating system")
 
+    def get_font(self, font_name: str, font_size: int) -> ImageFont.FreeTypeFont:
+        """Get a loaded font from the shared font cache
+
+        Args:
+            font_name (str): Font name or path to the font file
+            font_size (int): Font size
+
+        Returns:
+            ImageFont.FreeTypeFont: Loaded font
+        """
+        return self.font_cache.get_font(self.get_font_path(font_name), font_size)
+
     def get_display_text_position(
         self,
         x: int,
@@ -245,15 +289,97 @@ class Painter:
         return x + text_x_pos, y + text_y_pos
 
     def get_text_dimension(self, text: str, font: str, font_size: int) -> tuple:
-        raise NotImplementedError
+        """Get text dimension
+
+        Args:
+            text (str): Text that is used to calculate dimension
+            font (str): Font name
+            font_size (int): Font size
+
+        Returns:
+            (text_width (int), text_height (int)): Text dimension (width, height)
+        """
+        return self.text_measurer.measure(text, font, font_size, self.get_font)
+
+    def measure_many(self, items) -> list[tuple]:
+        """Get the dimensions of many texts in one pass
+
+        Args:
+            items (Iterable[tuple]): (text, font, font_size) tuples
 
-    def set_line_style(self, style: str = "solid") -> None:
-        """Set line style
+        Returns:
+            list[tuple]: (text_width, text_height) for each item, in the same order
+        """
+        return self.text_measurer.measure_many(items, self.get_font)
+
+    def set_line_style(self, style: Union[str, tuple] = "solid") -> None:
+        """Set the dash pattern of lines drawn with the "dashed" line style
+
+        Args:
+            style (str | tuple, optional): Line style. Defaults to "solid". Options: "solid", "dashed",
+                                           or a (dash length, gap length, ...) pattern. Eg. (6, 3)
+        """
+        if isinstance(style, tuple):
+            self.dash = style
+        else:
+            self.dash = (10.0, 5.0) if style == "dashed" else None
+
+    def get_dash_segments(
+        self, x1: float, y1: float, x2: float, y2: float, dash: tuple = None
+    ) -> list[tuple]:
+        """Get all the segments of a dashed line in one pass
 
         Args:
-            style (str, optional): Line style. Defaults to "solid". Options: "solid", "dashed"
+            x1 (float): Line begin X coordinate
+            y1 (float): Line begin Y coordinate
+            x2 (float): Line end X coordinate
+            y2 (float): Line end Y coordinate
+            dash (tuple, optional): (dash length, gap length, ...) pattern along the line, repeated like an SVG
+                                    dasharray. Defaults to None: 10 pixel vertical dashes spread evenly
+                                    between y1 and y2, about 14 pixels apart.
+
+        Returns:
+            list[tuple]: (x1, y1, x2, y2) segments, in drawing order
         """
-        self.dash = (10.0, 5.0) if style == "dashed" else None
+        if dash is None:
+            count = int((y2 - y1) / 7)
+            if count <= 0:
+                return []
+            if count == 1:
+                return [(x2, y2, x2, y2 + 10)]
+            step_x = (x2 - x1) / (count - 1)
+            step_y = (y2 - y1) / (count - 1)
+            return [
+                (x1 + step_x * i, y1 + step_y * i, x1 + step_x * i, y1 + step_y * i + 10)
+                for i in range(0, count, 2)
+            ]
+
+        length = math.hypot(x2 - x1, y2 - y1)
+        if len(dash) % 2 == 1:
+            dash = dash * 2
+        if length == 0 or sum(dash) <= 0:
+            return [(x1, y1, x2, y2)]
+        unit_x = (x2 - x1) / length
+        unit_y = (y2 - y1) / length
+
+        segments = []
+        position = 0.0
+        i = 0
+        while position < length:
+            step = dash[i % len(dash)]
+            if i % 2 == 0 and step > 0:
+                end = min(position + step, length)
+                segments.append(
+                    (
+                        x1 + unit_x * position,
+                        y1 + unit_y * position,
+                        x1 + unit_x * end,
+                        y1 + unit_y * end,
+                    )
+                )
+            position += step
+            i += 1
+        return segments
 
     def draw_box(
         self, x: int, y: int, width: int, height: int, box_fill_colour: str
@@ -323,12 +449,54 @@ class Painter:
         text_font_size: int,
         text_font_colour: str,
         style: str = "rectangle",
-    ) -> tuple:
-        return (
+    ) -> None:
+        """Draw a box with text wrapped to fit the box
+
+        Args:
+            box_x (int): Box X coordinate
+            box_y (int): Box Y coordinate
+            box_width (int): Box width
+            box_height (int): Box height
+            box_fill_colour (str): Box fill colour in HTML colour name or hex code. Eg. #FFFFFF or LightGreen
+            text (str): Text to draw/display
+            text_alignment (str): Text alignment. Options: "centre", "left", "right"
+            text_font (str): Text font
+            text_font_size (int): Text font size
+            text_font_colour (str): Text font colour
+            style (str, optional): Box style. Defaults to "rectangle". Options: "rectangle", "rounded", "arrowhead"
+        """
+        match style:
+            case "rectangle":
+                self.draw_box(
+                    box_x,
+                    box_y,
+                    box_width,
+                    box_height,
+                    box_fill_colour=box_fill_colour,
+                )
+            case "rounded":
+                self.draw_rounded_box(
+                    box_x, box_y, box_width, box_height, box_fill_colour
+                )
+            case "arrowhead":
+                self.draw_arrowhead_box(
+                    box_x, box_y, box_width, box_height, box_fill_colour
+                )
+            case _:
+                raise ValueError("Invalid style")
+
+        self.draw_text_on_box(
             box_x,
             box_y,
-            box_x + box_width,
-            box_y + box_height,
+            box_width,
+            box_height,
+            box_fill_colour,
+            text,
+            text_alignment,
+            text_font,
+            text_font_size,
+            text_font_colour,
+            style,
         )
 
     def draw_text_on_box(
@@ -345,6 +513,109 @@ class Painter:
         text_font_colour: str,
         style: str = "rectangle",
     ) -> None:
+        """Draw text wrapped to fit a box, without drawing the box
+
+        Args are the same as draw_box_with_text.
+        """
+        for x, y, line in self.get_box_text_lines(
+            box_x,
+            box_y,
+            box_width,
+            box_height,
+            text,
+            text_alignment,
+            text_font,
+            text_font_size,
+        ):
+            self.draw_box_text(x, y, line, text_font, text_font_size, text_font_colour)
+
+    def get_box_text_lines(
+        self,
+        box_x: int,
+        box_y: int,
+        box_width: int,
+        box_height: int,
+        text: str,
+        text_alignment: str,
+        text_font: str,
+        text_font_size: int,
+    ) -> list[tuple]:
+        """Wrap a text to fit a box and position each line
+
+        Args:
+            box_x (int): Box X coordinate
+            box_y (int): Box Y coordinate
+            box_width (int): Box width
+            box_height (int): Box height
+            text (str): Text to wrap
+            text_alignment (str): Text alignment. Options: "centre", "left", "right"
+            text_font (str): Text font
+            text_font_size (int): Text font size
+
+        Returns:
+            list[tuple]: (x, y, line) for each wrapped line
+        """
+        box_x2 = box_x + box_width
+        wrap_lines = []
+
+        ### Make '\n' work
+        multi_lines = text.splitlines()
+
+        left, _, right, _ = self.text_measurer.get_bbox(
+            "a", text_font, text_font_size, self.get_font
+        )
+        single_char_width = right - left
+
+        ### wrap text
+        for line in multi_lines:
+            wrap_lines.extend(textwrap.wrap(line, int(box_width / single_char_width)))
+
+        pad = 4
+        line_count = len(wrap_lines)
+
+        line_dimensions = self.measure_many(
+            (line, text_font, text_font_size) for line in wrap_lines
+        )
+
+        positioned_lines = []
+        for i, line in enumerate(wrap_lines):
+            font_width, font_height = line_dimensions[i]
+
+            match text_alignment:
+                case "centre":
+                    x = box_x + (box_width - font_width) / 2
+                case "left":
+                    x = box_x + 15
+                case "right":
+                    x = box_x2 - font_width - 15
+                case _:
+                    x = box_x + (box_width - font_width) / 2
+
+            total_line_height = (font_height * line_count) + (pad * (line_count - 1))
+
+            single_line_height = font_height
+
+            y = (
+                box_y
+                + ((box_height - total_line_height) / 2)
+                + ((single_line_height * i) + (pad * i))
+            )
+            positioned_lines.append((x, y, line))
+        return positioned_lines
+
+    def draw_box_text(
+        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
+    ) -> None:
+        """Draw a line of text positioned by get_box_text_lines, top-left anchored
+
+        Args:
+            x (int): X coordinate
+            y (int): Y coordinate
+            text (str): Text to draw/display
+            font (str): Font name
+            font_size (int): Font size
+            font_colour (str): Font colour
+        """
         raise NotImplementedError
 
     def draw_diamond(
@@ -386,6 +657,33 @@ class Painter:
     ) -> None:
         raise NotImplementedError
 
+    def draw_vertical_lines(
+        self,
+        xs: list[float],
+        y1: int,
+        y2: int,
+        line_colour: str,
+        line_transparency: int,
+        line_width: int,
+        line_style: Union[str, tuple] = "solid",
+    ) -> None:
+        """Draw vertical lines of the same colour, width, style and length, eg. the timeline grid
+
+        Args:
+            xs (list[float]): X coordinate of each line
+            y1 (int): Lines begin Y coordinate
+            y2 (int): Lines end Y coordinate
+            line_colour (str): Line colour in HTML colour name or hex code. Eg. #FFFFFF or LightGreen
+            line_transparency (int): Line transparency. 0 is opaque and 255 is transparent
+            line_width (int): Line width
+            line_style (str | tuple, optional): Line style. Defaults to "solid". Options: "solid", "dashed",
+                                                or a (dash length, gap length, ...) pattern
+        """
+        for x in xs:
+            self.draw_line(
+                x, y1, x, y2, line_colour, line_transparency, line_width, line_style
+            )
+
     def draw_cross_on_box(
         self, x1: int, y1: int, x2: int, y2: int, colour: str
     ) -> None:
@@ -410,9 +708,47 @@ class Painter:
     def get_image_size(self, image: str) -> tuple:
         raise NotImplementedError
 
-    def save_surface(self, filename: str) -> None:
+    def repaint(self, items: list, rects: list[tuple]) -> None:
+        """Repaint parts of the surface from display list items
+
+        Args:
+            items (list): Display list items of the whole surface, in painting order
+            rects (list[tuple]): (x1, y1, x2, y2) rectangles to repaint
+        """
+        raise NotImplementedError
+
+    def encode_surface(self) -> bytes:
+        """Encode the surface in the painter's file format
+
+        Returns:
+            bytes: Encoded surface, or None if there is no surface to save
+        """
         raise NotImplementedError
 
+    def write_surface(self, data: bytes, filename: Union[str, IO[bytes]]) -> None:
+        """Write an encoded surface to a file
+
+        Args:
+            data (bytes): Encoded surface
+            filename (str | IO[bytes]): File name, or writable binary stream
+        """
+        if not isinstance(filename, str):
+            filename.write(data)
+            return
+        Helper.break_hard_link(filename)
+        with open(filename, "wb") as f:
+            f.write(data)
+
+    def save_surface(self, filename: Union[str, IO[bytes]]) -> None:
+        """Save surface to file
+
+        Args:
+            filename (str | IO[bytes]): File name, or writable binary stream
+        """
+        data = self.encode_surface()
+        if data is not None:
+            self.write_surface(data, filename)
+
 
 class PNGPainter(Painter):
     """A wrapper class for Pillow library"""
@@ -430,6 +766,12 @@ class PNGPainter(Painter):
         self.__surface = Image.new("RGBA", (width, height), (0, 0, 0, 0))
 
         self.__cr = ImageDraw.Draw(self.__surface)
+        self.encoding: PNGEncoding = PNG_ENCODING_PRESETS["default"]
+
+    @property
+    def image(self) -> Image.Image:
+        """The Pillow image the roadmap is drawn on"""
+        return self.__surface
 
     def draw_box(
         self, x: int, y: int, width: int, height: int, box_fill_colour: str
@@ -491,195 +833,42 @@ class PNGPainter(Painter):
         # Draw the arrowhead
         self.__cr.polygon(arrowhead_shape, fill=box_fill_colour)
 
-    def draw_box_with_text(
-        self,
-        box_x: int,
-        box_y: int,
-        box_width: int,
-        box_height: int,
-        box_fill_colour: int,
-        text: str,
-        text_alignment: str,
-        text_font: str,
-        text_font_size: int,
-        text_font_colour: str,
-        style: str = "rectangle",
+    def draw_box_text(
+        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
     ) -> None:
-        box_x1, box_y1, box_x2, box_y2 = super().draw_box_with_text(
-            box_x,
-            box_y,
-            box_width,
-            box_height,
-            box_fill_colour,
+        """Draw a line of box text"""
+        self.__cr.text(
+            (x, y),
             text,
-            text_alignment,
-            text_font,
-            text_font_size,
-            text_font_colour,
-            style,
+            fill=font_colour,
+            anchor="la",
+            font=self.get_font(font, font_size),
         )
-        match style:
-            case "rectangle":
-                self.draw_box(
-                    box_x1,
-                    box_y1,
-                    box_width,
-                    box_height,
-                    box_fill_colour=box_fill_colour,
-                )
-            case "rounded":
-                self.draw_rounded_box(
-                    box_x1, box_y1, box_width, box_height, box_fill_colour
-                )
-            case "arrowhead":
-                self.draw_arrowhead_box(
-                    box_x1, box_y1, box_width, box_height, box_fill_colour
-                )
-            case _:
-                raise ValueError("Invalid style")
-
-        font = ImageFont.truetype(self.get_font_path(text_font), size=text_font_size)
 
-        multi_lines = []
-        wrap_lines = []
-
-        # ** Make '\n' work
-        multi_lines = text.splitlines()
+    def draw_diamond(
+        self, x: int, y: int, width: int, height: int, fill_colour: str
+    ) -> None:
+        """Draw a diamond
 
-        left, _, right, _ = font.getbbox("a")
-        single_char_width = right - left
+        Args:
+            x (int): X coordinate
+            y (int): Y coordinate
+            width (int): Diamond width
+            height (int): Diamond height
+            fill_colour (str): Diamond fill colour in HTML colour name or hex code. Eg. #FFFFFF or LightGreen
+        """
 
-        # ** wrap text
-        for line in multi_lines:
-            wrap_lines.extend(textwrap.wrap(line, int(box_width / single_char_width)))
+        # Calculate the coordinates of the four points of the diamond.
+        points = super().draw_diamond(x, y, width, height, fill_colour)
 
-        pad = 4
-        line_count = len(wrap_lines)
+        # Use Pillow's ImageDraw module to draw a polygon with the given points and fill color.
+        self.__cr.polygon(points, fill=fill_colour)
+        # self.__cr.polygon(points, outline=fill_colour, width=2)
 
-        for i, line in enumerate(wrap_lines):
-            font_width, font_height = self.get_text_dimension(
-                line, text_font, text_font_size
-            )
-
-            match text_alignment:
-                case "centre":
-                    x = box_x1 + (box_width - font_width) / 2
-                case "left":
-                    x = box_x1 + 15
-                case "right":
-                    x = box_x2 - font_width - 15
-                case _:
-                    x = box_x1 + (box_width - font_width) / 2
-
-            total_line_height = (font_height * line_count) + (pad * (line_count - 1))
-
-            single_line_height = font_height
-
-            y = (
-                box_y1
-                + ((box_height - total_line_height) / 2)
-                + ((single_line_height * i) + (pad * i))
-            )
-
-            self.__cr.text((x, y), line, fill=text_font_colour, anchor="la", font=font)
-
-    def draw_text_on_box(
-        self,
-        box_x: int,
-        box_y: int,
-        box_width: int,
-        box_height: int,
-        box_fill_colour: int,
-        text: str,
-        text_alignment: str,
-        text_font: str,
-        text_font_size: int,
-        text_font_colour: str,
-        style: str = "rectangle",
-    ) -> None:
-        box_x1, box_y1, box_x2, box_y2 = super().draw_box_with_text(
-            box_x,
-            box_y,
-            box_width,
-            box_height,
-            box_fill_colour,
-            text,
-            text_alignment,
-            text_font,
-            text_font_size,
-            text_font_colour,
-            style,
-        )
-
-        font = ImageFont.truetype(self.get_font_path(text_font), size=text_font_size)
-
-        multi_lines = []
-        wrap_lines = []
-
-        # ** Make '\n' work
-        multi_lines = text.splitlines()
-
-        left, _, right, _ = font.getbbox("a")
-        single_char_width = right - left
-
-        # ** wrap text
-        for line in multi_lines:
-            wrap_lines.extend(textwrap.wrap(line, int(box_width / single_char_width)))
-
-        pad = 4
-        line_count = len(wrap_lines)
-
-        for i, line in enumerate(wrap_lines):
-            font_width, font_height = self.get_text_dimension(
-                line, text_font, text_font_size
-            )
-
-            match text_alignment:
-                case "centre":
-                    x = box_x1 + (box_width - font_width) / 2
-                case "left":
-                    x = box_x1 + 15
-                case "right":
-                    x = box_x2 - font_width - 15
-                case _:
-                    x = box_x1 + (box_width - font_width) / 2
-
-            total_line_height = (font_height * line_count) + (pad * (line_count - 1))
-
-            single_line_height = font_height
-
-            y = (
-                box_y1
-                + ((box_height - total_line_height) / 2)
-                + ((single_line_height * i) + (pad * i))
-            )
-
-            self.__cr.text((x, y), line, fill=text_font_colour, anchor="la", font=font)
-
-    def draw_diamond(
-        self, x: int, y: int, width: int, height: int, fill_colour: str
-    ) -> None:
-        """Draw a diamond
-
-        Args:
-            x (int): X coordinate
-            y (int): Y coordinate
-            width (int): Diamond width
-            height (int): Diamond height
-            fill_colour (str): Diamond fill colour in HTML colour name or hex code. Eg. #FFFFFF or LightGreen
-        """
-
-        # Calculate the coordinates of the four points of the diamond.
-        points = super().draw_diamond(x, y, width, height, fill_colour)
-
-        # Use Pillow's ImageDraw module to draw a polygon with the given points and fill color.
-        self.__cr.polygon(points, fill=fill_colour)
-        # self.__cr.polygon(points, outline=fill_colour, width=2)
-
-    def draw_text(
-        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
-    ) -> None:
-        """Draw text
+    def draw_text(
+        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
+    ) -> None:
+        """Draw text
 
         Args:
             x (int): X coordinate
@@ -689,7 +878,7 @@ class PNGPainter(Painter):
         self.__cr.text(
             (x, y),
             text,
-            font=ImageFont.truetype(self.get_font_path(font), font_size),
+            font=self.get_font(font, font_size),
             anchor="la",
             fill=(font_colour),
         )
@@ -715,43 +904,127 @@ class PNGPainter(Painter):
             line_colour (str): Line colour in HTML colour name or hex code. Eg. #FFFFFF or LightGreen
             line_transparency (int): Line transparency. 0 is opaque and 255 is transparent
             line_width (int): Line width
-            line_style (str, optional): Line style. Defaults to "solid". Options: "solid", "dashed"
+            line_style (str | tuple, optional): Line style. Defaults to "solid". Options: "solid", "dashed",
+                                                or a (dash length, gap length, ...) pattern
         """
         r, g, b = ImageColor.getrgb(line_colour)
+        fill = (r, g, b, int(255 * line_transparency))
 
-        def linspace(start, stop, n):
-            if n == 1:
-                yield stop
-                return
-            h = (stop - start) / (n - 1)
-            for i in range(n):
-                yield start + h * i
+        if line_style == "solid":
+            self.__cr.line((x1, y1, x2, y2), width=line_width, fill=fill)
+        elif line_style == "dashed" or isinstance(line_style, tuple):
+            dash = line_style if isinstance(line_style, tuple) else self.dash
+            segments = self.get_dash_segments(x1, y1, x2, y2, dash)
+            if all(segment[0] == segment[2] == x1 for segment in segments):
+                self.__paste_columns([x1], segments, line_width, fill)
+            else:
+                for segment in segments:
+                    self.__cr.line(segment, width=line_width, fill=fill)
+
+    def draw_vertical_lines(
+        self,
+        xs: list[float],
+        y1: int,
+        y2: int,
+        line_colour: str,
+        line_transparency: int,
+        line_width: int,
+        line_style: Union[str, tuple] = "solid",
+    ) -> None:
+        """Draw vertical lines of the same colour, width, style and length. The dashes are
+        laid out once and stamped at each X coordinate, with the same pixels as draw_line.
+
+        Args:
+            xs (list[float]): X coordinate of each line
+            y1 (int): Lines begin Y coordinate
+            y2 (int): Lines end Y coordinate
+            line_colour (str): Line colour in HTML colour name or hex code. Eg. #FFFFFF or LightGreen
+            line_transparency (int): Line transparency. 0 is opaque and 255 is transparent
+            line_width (int): Line width
+            line_style (str | tuple, optional): Line style. Defaults to "solid". Options: "solid", "dashed",
+                                                or a (dash length, gap length, ...) pattern
+        """
+        r, g, b = ImageColor.getrgb(line_colour)
+        fill = (r, g, b, int(255 * line_transparency))
 
         if line_style == "solid":
-            self.__cr.line(
-                (x1, y1, x2, y2),
-                width=line_width,
-                fill=(r, g, b, int(255 * line_transparency)),
-            )
-        elif line_style == "dashed":
-            # given a line between x1, y1 and x2, y2, divide it into multiple shorter lines
-            # and draw them with a gap in between.
+            ### ImageDraw is as fast as it gets for solid lines; only parse the colour once
+            for x in xs:
+                self.__cr.line((x, y1, x, y2), width=line_width, fill=fill)
+            return
+        if line_style == "dashed" or isinstance(line_style, tuple):
+            dash = line_style if isinstance(line_style, tuple) else self.dash
+            segments = self.get_dash_segments(0, y1, 0, y2, dash)
+        else:
+            return
+        self.__paste_columns(xs, segments, line_width, fill)
 
-            ### Calculate the number of dashes
-            gap_counts = int((y2 - y1) / 7)
+    def __paste_columns(
+        self, xs: list[float], segments: list[tuple], line_width: int, fill: tuple
+    ) -> None:
+        """Draw the same vertical segments at several X coordinates by stamping one mask.
+        The pixels are the same as drawing each segment with ImageDraw.line.
 
-            for i, (x, y) in enumerate(
-                zip(
-                    linspace(x1, x2, gap_counts),
-                    linspace(y1, y2, gap_counts),
-                )
-            ):
-                if i % 2 == 0:
-                    self.__cr.line(
-                        (x, y, x, y + 10),
-                        width=line_width,
-                        fill=(r, g, b, int(255 * line_transparency)),
-                    )
+        Args:
+            xs (list[float]): X coordinate of each column
+            segments (list[tuple]): (x1, y1, x2, y2) vertical segments. Their X coordinates are ignored
+            line_width (int): Line width
+            fill (tuple): RGBA colour
+        """
+        if len(xs) == 0 or len(segments) == 0:
+            return
+        dots = []
+        if line_width > 1:
+            ### ImageDraw draws wide sub-pixel segments as a partial dot, not a full row
+            dots = [segment for segment in segments if abs(segment[3] - segment[1]) < 1]
+            segments = [
+                segment for segment in segments if abs(segment[3] - segment[1]) >= 1
+            ]
+
+        if len(segments) > 0:
+            top, stripe = self.__get_stripe(segments)
+            mask = Image.frombytes("L", (1, len(stripe)), stripe)
+            if line_width > 1:
+                mask = mask.resize((line_width, len(stripe)), Image.Resampling.NEAREST)
+
+            ### ImageDraw truncates coordinates and centres wide lines
+            offset = (line_width - 1) // 2
+            for x in xs:
+                self.__surface.paste(fill, (int(x) - offset, top), mask)
+
+        for x in xs:
+            for _, y1, _, y2 in dots:
+                self.__cr.line((x, y1, x, y2), width=line_width, fill=fill)
+
+    def __get_stripe(self, segments: list[tuple]) -> tuple:
+        """Get the rows covered by vertical segments, as drawn by ImageDraw.line
+
+        Args:
+            segments (list[tuple]): (x1, y1, x2, y2) vertical segments
+
+        Returns:
+            (top (int), stripe (bytes)): First row, and 255 for each covered row from there, 0 otherwise
+        """
+        ### ImageDraw truncates coordinates and includes both end rows
+        if np is not None:
+            rows = np.array(segments, dtype=np.float64)[:, 1::2]
+            starts = np.trunc(rows.min(axis=1)).astype(np.int64)
+            ends = np.trunc(rows.max(axis=1)).astype(np.int64) + 1
+            top = int(starts.min())
+            ### Each span adds 1 from its start row and removes it after its end row
+            edges = np.bincount(starts - top, minlength=int(ends.max()) - top + 1)
+            edges -= np.bincount(ends - top, minlength=len(edges))
+            stripe = np.where(np.cumsum(edges[:-1]) > 0, 255, 0).astype(np.uint8)
+            return top, stripe.tobytes()
+
+        spans = [
+            (int(min(y1, y2)), int(max(y1, y2)) + 1) for _, y1, _, y2 in segments
+        ]
+        top = min(start for start, _ in spans)
+        stripe = bytearray(max(end for _, end in spans) - top)
+        for start, end in spans:
+            stripe[start - top : end - top] = b"\xff" * (end - start)
+        return top, bytes(stripe)
 
     def draw_cross_on_box(
         self, x1: int, y1: int, x2: int, y2: int, colour: str
@@ -793,26 +1066,6 @@ class PNGPainter(Painter):
 
         self.__surface.paste(logo, (x, y))
 
-    def get_text_dimension(self, text: str, font: str, font_size: int) -> tuple:
-        """Get text dimension
-
-        Args:
-            text (str): Text that is used to calculate dimension
-            font (str): Font name
-            font_size (int): Font size
-
-        Returns:
-            (text_width (int), text_height (int)): Text dimension (width, height)
-        """
-        # Use Pillow's ImageFont module to get the dimensions of the text.
-        image_font = ImageFont.truetype(self.get_font_path(font), font_size)
-
-        left, _, right, bottom = image_font.getbbox(text)
-        font_width = right
-        font_height = bottom
-
-        return font_width, font_height
-
     def set_background_colour(self) -> None:
         """Set surface background colour"""
         if self.background_colour == "transparent":
@@ -831,7 +1084,9 @@ class PNGPainter(Painter):
             height (int): Surface height
         """
         left, top, right, bottom = super().set_surface_size(width, height)
-        self.__surface = self.__surface.crop((left, top, right, bottom))
+        ### Surfaces allocated at their final size are not copied
+        if (left, top, right, bottom) != (0, 0, *self.__surface.size):
+            self.__surface = self.__surface.crop((left, top, right, bottom))
 
     def get_image_size(self, image: str) -> tuple:
         """Get image size
@@ -845,15 +1100,49 @@ class PNGPainter(Painter):
         with Image.open(image) as img:
             return img.size
 
-    def save_surface(self, filename: str) -> None:
-        """Save surface to PNG file
+    def repaint(self, items: list, rects: list[tuple]) -> None:
+        """Repaint parts of the surface from display list items
+
+        Each rectangle is painted on its own surface from the items overlapping it,
+        then pasted over the surface.
 
         Args:
-            filename (str): PNG file name
+            items (list): Display list items of the whole surface, in painting order
+            rects (list[tuple]): (x1, y1, x2, y2) rectangles to repaint
         """
+        ### Nothing is painted outside the surface allocated at construction
+        surface_width = min(self.__surface.size[0], self.width)
+        surface_height = min(self.__surface.size[1], self.height)
+        for rect in rects:
+            x1 = max(0, math.floor(rect[0]))
+            y1 = max(0, math.floor(rect[1]))
+            x2 = min(surface_width, math.ceil(rect[2]))
+            y2 = min(surface_height, math.ceil(rect[3]))
+            if x1 >= x2 or y1 >= y2:
+                continue
+
+            tile = PNGPainter(x2 - x1, y2 - y1)
+            tile_rect = (x1, y1, x2, y2)
+            for item in items:
+                bounds = item.get_bounds(self)
+                if (
+                    bounds[0] < tile_rect[2]
+                    and tile_rect[0] < bounds[2]
+                    and bounds[1] < tile_rect[3]
+                    and tile_rect[1] < bounds[3]
+                ):
+                    item.translate(-x1, -y1).draw(tile)
+            self.__surface.paste(tile.__surface, (x1, y1))
+
+    def encode_surface(self) -> bytes:
+        """Encode surface to PNG
 
-        if self.__surface is not None:
-            self.__surface.save(filename)
+        Returns:
+            bytes: PNG file content
+        """
+        if self.__surface is None:
+            return None
+        return self.encoding.encode(self.__surface)
 
 
 class SVGPainter(Painter):
@@ -906,190 +1195,21 @@ class SVGPainter(Painter):
         self.elements.append(rectangle)
         self.elements.append(poly)
 
-    def draw_box_with_text(
-        self,
-        box_x: int,
-        box_y: int,
-        box_width: int,
-        box_height: int,
-        box_fill_colour: int,
-        text: str,
-        text_alignment: str,
-        text_font: str,
-        text_font_size: int,
-        text_font_colour: str,
-        style: str = "rectangle",
-    ) -> None:
-        box_x1, box_y1, box_x2, box_y2 = super().draw_box_with_text(
-            box_x,
-            box_y,
-            box_width,
-            box_height,
-            box_fill_colour,
-            text,
-            text_alignment,
-            text_font,
-            text_font_size,
-            text_font_colour,
-            style,
-        )
-        match style:
-            case "rectangle":
-                self.draw_box(
-                    box_x1,
-                    box_y1,
-                    box_width,
-                    box_height,
-                    box_fill_colour=box_fill_colour,
-                )
-            case "rounded":
-                self.draw_rounded_box(
-                    box_x1, box_y1, box_width, box_height, box_fill_colour
-                )
-            case "arrowhead":
-                self.draw_arrowhead_box(
-                    box_x1, box_y1, box_width, box_height, box_fill_colour
-                )
-            case _:
-                raise ValueError("Invalid style")
-
-        font = ImageFont.truetype(self.get_font_path(text_font), size=text_font_size)
-
-        multi_lines = []
-        wrap_lines = []
-
-        ### Make '\n' work
-        multi_lines = text.splitlines()
-
-        left, _, right, _ = font.getbbox("a")
-        single_char_width = right - left
-
-        ### wrap text
-        for line in multi_lines:
-            wrap_lines.extend(textwrap.wrap(line, int(box_width / single_char_width)))
-
-        pad = 4
-        line_count = len(wrap_lines)
-
-        for i, line in enumerate(wrap_lines):
-            font_width, font_height = self.get_text_dimension(
-                line, text_font, text_font_size
-            )
-
-            match text_alignment:
-                case "centre":
-                    x = box_x1 + (box_width - font_width) / 2
-                case "left":
-                    x = box_x1 + 15
-                case "right":
-                    x = box_x2 - font_width - 15
-                case _:
-                    x = box_x1 + (box_width - font_width) / 2
-
-            total_line_height = (font_height * line_count) + (pad * (line_count - 1))
-
-            single_line_height = font_height
-
-            y = (
-                box_y1
-                + ((box_height - total_line_height) / 2)
-                + ((single_line_height * i) + (pad * i))
-            )
-
-            txt = dw.Text(
-                line,
-                x=x,
-                y=y,
-                font_size=text_font_size,
-                stroke=text_font_colour,
-                text_anchor="start",
-                dominant_baseline="hanging",
-                font_family=text_font,
-            )
-            self.elements.append(txt)
-
-    def draw_text_on_box(
-        self,
-        box_x: int,
-        box_y: int,
-        box_width: int,
-        box_height: int,
-        box_fill_colour: int,
-        text: str,
-        text_alignment: str,
-        text_font: str,
-        text_font_size: int,
-        text_font_colour: str,
-        style: str = "rectangle",
+    def draw_box_text(
+        self, x: int, y: int, text: str, font: str, font_size: int, font_colour: str
     ) -> None:
-        box_x1, box_y1, box_x2, box_y2 = super().draw_box_with_text(
-            box_x,
-            box_y,
-            box_width,
-            box_height,
-            box_fill_colour,
+        """Draw a line of box text"""
+        txt = dw.Text(
             text,
-            text_alignment,
-            text_font,
-            text_font_size,
-            text_font_colour,
-            style,
+            x=x,
+            y=y,
+            font_size=font_size,
+            stroke=font_colour,
+            text_anchor="start",
+            dominant_baseline="hanging",
+            font_family=font,
         )
-
-        font = ImageFont.truetype(self.get_font_path(text_font), size=text_font_size)
-
-        multi_lines = []
-        wrap_lines = []
-
-        # ** Make '\n' work
-        multi_lines = text.splitlines()
-
-        left, _, right, _ = font.getbbox("a")
-        single_char_width = right - left
-
-        # ** wrap text
-        for line in multi_lines:
-            wrap_lines.extend(textwrap.wrap(line, int(box_width / single_char_width)))
-
-        pad = 4
-        line_count = len(wrap_lines)
-
-        for i, line in enumerate(wrap_lines):
-            font_width, font_height = self.get_text_dimension(
-                line, text_font, text_font_size
-            )
-
-            match text_alignment:
-                case "centre":
-                    x = box_x1 + (box_width - font_width) / 2
-                case "left":
-                    x = box_x1 + 15
-                case "right":
-                    x = box_x2 - font_width - 15
-                case _:
-                    x = box_x1 + (box_width - font_width) / 2
-
-            total_line_height = (font_height * line_count) + (pad * (line_count - 1))
-
-            single_line_height = font_height
-
-            y = (
-                box_y1
-                + ((box_height - total_line_height) / 2)
-                + ((single_line_height * i) + (pad * i))
-            )
-
-            txt = dw.Text(
-                line,
-                x=x,
-                y=y,
-                font_size=text_font_size,
-                stroke=text_font_colour,
-                text_anchor="start",
-                dominant_baseline="hanging",
-                font_family=text_font,
-            )
-            self.elements.append(txt)
+        self.elements.append(txt)
 
     def draw_diamond(
         self, x: int, y: int, width: int, height: int, fill_colour: str
@@ -1141,16 +1261,6 @@ class SVGPainter(Painter):
         line_style: str = "dashed",
     ) -> None:
         """Draw a line"""
-        r, g, b = ImageColor.getrgb(line_colour)
-
-        def linspace(start, stop, n):
-            if n == 1:
-                yield stop
-                return
-            h = (stop - start) / (n - 1)
-            for i in range(n):
-                yield start + h * i
-
         if line_style == "solid":
             line = dw.Line(
                 x1,
@@ -1163,31 +1273,48 @@ class SVGPainter(Painter):
                 stroke_width=line_width,
             )
             self.elements.append(line)
-        elif line_style == "dashed":
-            # given a line between x1, y1 and x2, y2, divide it into multiple shorter lines
-            # and draw them with a gap in between.
-
-            ### Calculate the number of dashes
-            gap_counts = int((y2 - y1) / 7)
-
-            for i, (x, y) in enumerate(
-                zip(
-                    linspace(x1, x2, gap_counts),
-                    linspace(y1, y2, gap_counts),
+        elif line_style == "dashed" or isinstance(line_style, tuple):
+            dash = line_style if isinstance(line_style, tuple) else self.dash
+            for segment in self.get_dash_segments(x1, y1, x2, y2, dash):
+                line = dw.Line(
+                    *segment,
+                    ### Fix for v1.3.3
+                    stroke=line_colour,
+                    stroke_opacity=line_transparency,
+                    stroke_width=line_width,
                 )
-            ):
-                if i % 2 == 0:
-                    line = dw.Line(
-                        x,
-                        y,
-                        x,
-                        y + 10,
-                        ### Fix for v1.3.3
-                        stroke=line_colour,
-                        stroke_opacity=line_transparency,
-                        stroke_width=line_width,
-                    )
-                    self.elements.append(line)
+                self.elements.append(line)
+
+    def draw_vertical_lines(
+        self,
+        xs: list[float],
+        y1: int,
+        y2: int,
+        line_colour: str,
+        line_transparency: int,
+        line_width: int,
+        line_style: Union[str, tuple] = "solid",
+    ) -> None:
+        """Draw vertical lines of the same colour, width, style and length as one path"""
+        if line_style == "solid":
+            segments = [(0, y1, 0, y2)]
+        elif line_style == "dashed" or isinstance(line_style, tuple):
+            dash = line_style if isinstance(line_style, tuple) else self.dash
+            segments = self.get_dash_segments(0, y1, 0, y2, dash)
+        else:
+            return
+        if len(xs) == 0 or len(segments) == 0:
+            return
+
+        path = dw.Path(
+            stroke=line_colour,
+            stroke_opacity=line_transparency,
+            stroke_width=line_width,
+        )
+        for x in xs:
+            for _, segment_y1, _, segment_y2 in segments:
+                path.M(x, segment_y1).V(segment_y2)
+        self.elements.append(path)
 
     def draw_cross_on_box(
         self, x1: int, y1: int, x2: int, y2: int, colour: str
@@ -1209,17 +1336,6 @@ class SVGPainter(Painter):
         # self.__cr.apped(logo_image)
         self.elements.append(logo_image)
 
-    def get_text_dimension(self, text: str, font: str, font_size: int) -> tuple:
-        """Get text dimension"""
-        # Use Pillow's ImageFont module to get the dimensions of the text.
-        image_font = ImageFont.truetype(self.get_font_path(font), font_size)
-
-        left, _, right, bottom = image_font.getbbox(text)
-        font_width = right
-        font_height = bottom
-
-        return font_width, font_height
-
     def set_background_colour(self) -> None:
         """Set surface background colour"""
         if self.background_colour == "transparent":
@@ -1246,11 +1362,20 @@ class SVGPainter(Painter):
         with Image.open(image) as img:
             return img.size
 
-    def save_surface(self, filename: str) -> None:
-        """Save surface to SVG file"""
-
-        if self.__cr is not None:
-            self.__cr.save_svg(filename)
+    def encode_surface(self) -> bytes:
+        """Encode surface to SVG"""
+        if self.__cr is None:
+            return None
+        return self.__cr.as_svg().encode("utf-8")
+
+    def write_surface(self, data: bytes, filename: Union[str, IO[bytes]]) -> None:
+        """Write an encoded surface to a file, in text mode like drawsvg does"""
+        if not isinstance(filename, str):
+            filename.write(data)
+            return
+        Helper.break_hard_link(filename)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(data.decode("utf-8"))
 
 
 class PainterFactory:
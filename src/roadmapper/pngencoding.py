@@ -0,0 +1,107 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import dataclass
+import io
+from typing import Union
+import zlib
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class PNGEncoding:
+    """PNG encoding options
+
+    Args:
+        compress_level (int, optional): zlib compression level, 0 (none) to 9 (smallest). Defaults to 6 like Pillow.
+        compress_type (int, optional): zlib strategy. Eg. zlib.Z_RLE, which is fast and suits flat colours. Defaults to None (zlib default).
+        optimize (bool, optional): Let Pillow search for a smaller encoding, at extra CPU cost. Defaults to False.
+        colours (int, optional): Quantise to an adaptive palette of at most this many colours. Roadmaps use few
+                                 colours, so a palette PNG is much smaller; anti-aliased edges may change slightly.
+                                 Defaults to None (keep RGBA).
+    """
+
+    compress_level: int = 6
+    compress_type: int = None
+    optimize: bool = False
+    colours: int = None
+
+    def get_save_args(self) -> dict:
+        """Get the Image.save arguments of the options
+
+        Returns:
+            dict: Keyword arguments of Image.save
+        """
+        args = {"format": "PNG", "compress_level": self.compress_level}
+        if self.compress_type is not None:
+            args["compress_type"] = self.compress_type
+        if self.optimize:
+            args["optimize"] = True
+        return args
+
+    def encode(self, image: Image.Image) -> bytes:
+        """Encode an image as PNG
+
+        Args:
+            image (Image.Image): Image to encode
+
+        Returns:
+            bytes: PNG file content
+        """
+        if self.colours is not None:
+            ### Fast octree is the only built-in method that supports RGBA images
+            image = image.quantize(
+                colors=self.colours, method=Image.Quantize.FASTOCTREE
+            )
+        buffer = io.BytesIO()
+        image.save(buffer, **self.get_save_args())
+        return buffer.getvalue()
+
+
+PNG_ENCODING_PRESETS = {
+    ### Pillow's defaults
+    "default": PNGEncoding(),
+    ### About twice as fast as the default and slightly larger, for previews
+    "fast": PNGEncoding(compress_level=1, compress_type=zlib.Z_RLE),
+    ### About a third of the default size, for images served many times
+    "small": PNGEncoding(compress_level=9, optimize=True, colours=256),
+}
+
+
+def get_png_encoding(encoding: Union[str, PNGEncoding]) -> PNGEncoding:
+    """Get PNG encoding options from a preset name or options
+
+    Args:
+        encoding (str | PNGEncoding): Preset name ("default", "fast" or "small") or options
+
+    Returns:
+        PNGEncoding: The options
+    """
+    if isinstance(encoding, PNGEncoding):
+        return encoding
+    if encoding not in PNG_ENCODING_PRESETS:
+        raise ValueError(
+            f'Invalid PNG encoding preset "{encoding}".'
+            f" Valid presets are {list(PNG_ENCODING_PRESETS)}"
+        )
+    return PNG_ENCODING_PRESETS[encoding]
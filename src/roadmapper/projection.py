@@ -0,0 +1,402 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional. The pure Python path gives the same result
+    np = None
+
+from .helper import Helper
+from .timeline import Timeline
+from .timelinemode import TimelineMode
+
+### round(day / last_day_of_month, 1) indexed by [last_day_of_month][day].
+### numpy.round differs from Python's round() on some values, so monthly positions are looked up
+MONTHLY_PERCENTAGES = [
+    [round(day / last_day, 1) if last_day > 0 else 0 for day in range(32)]
+    for last_day in range(32)
+]
+
+
+@dataclass(slots=True)
+class TaskProjection:
+    """Horizontal layout of a task bar, as computed by Task.set_task_position
+
+    Args:
+        box_x (float): x position of the last box
+        box_width (float): Width of the last box
+        bar_start_x (float): x position of the first box
+        bar_width (float): Width from the first box to the end of the last box
+        boxes (list[tuple[int, int]]): (x, width) of the task box in each timeline item. Empty if the task is not on the timeline
+    """
+
+    box_x: float
+    box_width: float
+    bar_start_x: float
+    bar_width: float
+    boxes: list
+
+
+class TimelineProjector:
+    """Project task and milestone dates to x positions on a timeline in bulk
+
+    Dates are handled as day ordinals. With NumPy installed, timeline items are
+    located and positions are computed for all dates in one vectorised pass.
+    Otherwise the same computation runs in pure Python.
+    """
+
+    def __init__(self, timeline: Timeline, use_numpy: bool = True):
+        """__init__ method
+
+        Args:
+            timeline (Timeline): Timeline, with draw positions set
+            use_numpy (bool, optional): Use NumPy if it is installed. Defaults to True.
+        """
+        items = timeline.timeline_items
+        self.mode = timeline.mode
+        self.use_numpy = use_numpy and np is not None
+
+        self.starts = [item.period.start.toordinal() for item in items]
+        self.ends = [item.period.end.toordinal() for item in items]
+        self.item_x = [item.box_x for item in items]
+        self.item_width = [item.box_width for item in items]
+        self.item_boxes = [
+            (int(x), int(width)) for x, width in zip(self.item_x, self.item_width)
+        ]
+        self.calendar_ends = [item.calendar_period.end.toordinal() for item in items]
+        self.calendar_days = [item.calendar_period.days for item in items]
+        self.calendar_end_days = [item.calendar_period.end.day for item in items]
+
+        ### A date can only fall into one timeline item, so the first and last items
+        ### of a task are the only ones that are not fully covered
+        self.is_supported = len(items) > 0 and all(
+            self.ends[i] < self.starts[i + 1] for i in range(len(items) - 1)
+        )
+
+    def __get_percentage(self, ordinal: int, day: int, index: int) -> float:
+        """Position of a date within a timeline item, as in TimelineItem.get_timeline_pos_percentage
+
+        Args:
+            ordinal (int): Date ordinal
+            day (int): Day of month of the date
+            index (int): Index of the timeline item
+
+        Returns:
+            float: Position percentage
+        """
+        if self.mode == TimelineMode.WEEKLY:
+            return ((ordinal + 6) % 7) / 7
+        if self.mode == TimelineMode.MONTHLY:
+            return MONTHLY_PERCENTAGES[self.calendar_end_days[index]][day]
+        days = self.calendar_days[index]
+        return (days - (self.calendar_ends[index] - ordinal)) / days
+
+    def __get_percentages_numpy(self, ordinals, days, indexes):
+        """Vectorised __get_percentage
+
+        Args:
+            ordinals (np.ndarray): Date ordinals
+            days (np.ndarray): Day of month of the dates
+            indexes (np.ndarray): Index of the timeline item of each date
+
+        Returns:
+            list[float]: Position percentages
+        """
+        if self.mode == TimelineMode.WEEKLY:
+            return (((ordinals + 6) % 7) / 7).tolist()
+        if self.mode == TimelineMode.MONTHLY:
+            table = np.array(MONTHLY_PERCENTAGES)
+            end_days = np.array(self.calendar_end_days, dtype=np.int64)[indexes]
+            return table[end_days, days].tolist()
+        calendar_days = np.array(self.calendar_days, dtype=np.int64)[indexes]
+        calendar_ends = np.array(self.calendar_ends, dtype=np.int64)[indexes]
+        return ((calendar_days - (calendar_ends - ordinals)) / calendar_days).tolist()
+
+    def __project_spans(self, start_dates: list, end_dates: list) -> tuple:
+        """Locate many date ranges on the timeline and compute their first and last boxes
+
+        Args:
+            start_dates (list[date]): Task start dates
+            end_dates (list[date]): Task end dates
+
+        Returns:
+            tuple: Lists of first item index, last item index + 1, first box, last box,
+                   box x, box width, bar start x and bar width of each task
+        """
+        columns = ([], [], [], [], [], [], [], [])
+        starts = self.starts
+        ends = self.ends
+        last_index = len(starts) - 1
+        for start_date, end_date in zip(start_dates, end_dates):
+            task_start = start_date.toordinal()
+            task_end = end_date.toordinal()
+            first = bisect_left(ends, task_start)
+            last = bisect_right(starts, task_end)
+            start_percentage = self.__get_percentage(
+                task_start, start_date.day, min(first, last_index)
+            )
+            end_percentage = self.__get_percentage(
+                task_end, end_date.day, max(last - 1, 0)
+            )
+            box = (0, 0, 0, 0)
+            first_box = last_box = None
+            if first < last:
+                ### First timeline item
+                x = self.item_x[first]
+                width = self.item_width[first]
+                if starts[first] <= task_start:
+                    box_x = x + (width * start_percentage)
+                    if task_end < ends[first]:
+                        ### Task begins here and ends here
+                        box_width = (width * end_percentage) - (
+                            width * start_percentage
+                        )
+                    else:
+                        ### Task begins here and ends in the future
+                        box_width = width - (width * start_percentage)
+                elif task_end <= ends[first]:
+                    ### Task begins in the past and ends here
+                    box_x = x
+                    box_width = width * end_percentage
+                else:
+                    ### Task begins in the past and ends in the future
+                    box_x = x
+                    box_width = width
+                bar_start_x = box_x
+                first_box = (int(box_x), int(box_width))
+
+                ### Last timeline item, if the task spans more than one
+                if last - 1 > first:
+                    box_x = self.item_x[last - 1]
+                    width = self.item_width[last - 1]
+                    if task_end <= ends[last - 1]:
+                        box_width = width * end_percentage
+                    else:
+                        box_width = width
+                    last_box = (int(box_x), int(box_width))
+                box = (box_x, box_width, bar_start_x, box_x + box_width - bar_start_x)
+
+            for column, value in zip(
+                columns, (first, last, first_box, last_box) + box
+            ):
+                column.append(value)
+        return columns
+
+    def __project_spans_numpy(self, start_dates: list, end_dates: list) -> tuple:
+        """Vectorised __project_spans"""
+        last_index = len(self.starts) - 1
+        starts = np.array(self.starts, dtype=np.int64)
+        ends = np.array(self.ends, dtype=np.int64)
+        item_x = np.array(self.item_x, dtype=np.float64)
+        item_width = np.array(self.item_width, dtype=np.float64)
+        task_starts = np.array([d.toordinal() for d in start_dates], dtype=np.int64)
+        task_ends = np.array([d.toordinal() for d in end_dates], dtype=np.int64)
+
+        firsts = np.searchsorted(ends, task_starts, side="left")
+        lasts = np.searchsorted(starts, task_ends, side="right")
+        first_items = np.minimum(firsts, last_index)
+        last_items = np.maximum(lasts - 1, 0)
+        start_percentages = np.array(
+            self.__get_percentages_numpy(
+                task_starts,
+                np.array([d.day for d in start_dates], dtype=np.int64),
+                first_items,
+            )
+        )
+        end_percentages = np.array(
+            self.__get_percentages_numpy(
+                task_ends,
+                np.array([d.day for d in end_dates], dtype=np.int64),
+                last_items,
+            )
+        )
+
+        ### First timeline item. Same conditions as in __project_spans
+        x = item_x[first_items]
+        width = item_width[first_items]
+        first_ends = ends[first_items]
+        begins_here = starts[first_items] <= task_starts
+        first_box_x = np.where(begins_here, x + (width * start_percentages), x)
+        first_box_width = np.where(
+            begins_here,
+            np.where(
+                task_ends < first_ends,
+                (width * end_percentages) - (width * start_percentages),
+                width - (width * start_percentages),
+            ),
+            np.where(task_ends <= first_ends, width * end_percentages, width),
+        )
+
+        ### Last timeline item
+        last_box_x = item_x[last_items]
+        last_width = item_width[last_items]
+        last_box_width = np.where(
+            task_ends <= ends[last_items], last_width * end_percentages, last_width
+        )
+
+        spans_many = (lasts - 1) > firsts
+        box_x = np.where(spans_many, last_box_x, first_box_x)
+        box_width = np.where(spans_many, last_box_width, first_box_width)
+        bar_width = box_x + box_width - first_box_x
+
+        first_boxes = zip(
+            np.trunc(first_box_x).astype(np.int64).tolist(),
+            np.trunc(first_box_width).astype(np.int64).tolist(),
+        )
+        last_boxes = zip(
+            np.trunc(last_box_x).astype(np.int64).tolist(),
+            np.trunc(last_box_width).astype(np.int64).tolist(),
+        )
+        return (
+            firsts.tolist(),
+            lasts.tolist(),
+            list(first_boxes),
+            list(last_boxes),
+            box_x.tolist(),
+            box_width.tolist(),
+            first_box_x.tolist(),
+            bar_width.tolist(),
+        )
+
+    def project_tasks(self, spans: list) -> list[TaskProjection]:
+        """Project many tasks onto the timeline
+
+        Args:
+            spans (list[tuple]): (start, end) date of each task
+
+        Returns:
+            list[TaskProjection]: Projection of each task, in the same order
+        """
+        start_dates = [Helper.to_date(start) for start, _ in spans]
+        end_dates = [Helper.to_date(end) for _, end in spans]
+        if self.use_numpy:
+            columns = self.__project_spans_numpy(start_dates, end_dates)
+        else:
+            columns = self.__project_spans(start_dates, end_dates)
+
+        ### Timeline items fully covered by a task share the same box tuples
+        item_boxes = self.item_boxes
+        projections = []
+        for (
+            first,
+            last,
+            first_box,
+            last_box,
+            box_x,
+            box_width,
+            bar_start_x,
+            bar_width,
+        ) in zip(*columns):
+            if last <= first:
+                projections.append(TaskProjection(0, 0, 0, 0, []))
+                continue
+            if last - 1 > first:
+                boxes = [first_box, *item_boxes[first + 1 : last - 1], last_box]
+            else:
+                boxes = [first_box]
+            projections.append(
+                TaskProjection(box_x, box_width, bar_start_x, bar_width, boxes)
+            )
+        return projections
+
+    def project_dates(self, dates: list) -> list[float]:
+        """Project many milestone dates onto the timeline
+
+        Args:
+            dates (list): Dates
+
+        Returns:
+            list[float]: x position of each date, or None if the date is not on the timeline
+        """
+        dates = [Helper.to_date(d) for d in dates]
+        ordinals = [d.toordinal() for d in dates]
+        if self.use_numpy:
+            indexes = (
+                np.searchsorted(
+                    np.array(self.starts, dtype=np.int64),
+                    np.array(ordinals, dtype=np.int64),
+                    side="right",
+                )
+                - 1
+            )
+            percentages = self.__get_percentages_numpy(
+                np.array(ordinals, dtype=np.int64),
+                np.array([d.day for d in dates], dtype=np.int64),
+                np.maximum(indexes, 0),
+            )
+            indexes = indexes.tolist()
+        else:
+            indexes = [bisect_right(self.starts, ordinal) - 1 for ordinal in ordinals]
+            percentages = [
+                self.__get_percentage(ordinal, d.day, max(index, 0))
+                for ordinal, d, index in zip(ordinals, dates, indexes)
+            ]
+
+        positions = []
+        for ordinal, index, percentage in zip(ordinals, indexes, percentages):
+            if index < 0 or ordinal > self.ends[index]:
+                positions.append(None)
+            else:
+                positions.append(
+                    self.item_x[index] + (self.item_width[index] * percentage)
+                )
+        return positions
+
+
+def project_groups(timeline: Timeline, groups: list) -> bool:
+    """Project the tasks, parallel tasks and milestones of the groups onto the timeline in one pass.
+    The projections are used by Task.set_draw_position instead of scanning the timeline per task.
+
+    Args:
+        timeline (Timeline): Timeline, with draw positions set
+        groups (list[Group]): Roadmap groups
+
+    Returns:
+        bool: False if the timeline cannot be projected in bulk. Tasks are then laid out one by one
+    """
+    tasks = []
+    pending = [task for group in groups for task in group.tasks]
+    while pending:
+        task = pending.pop()
+        tasks.append(task)
+        pending.extend(task.tasks)
+
+    projector = TimelineProjector(timeline)
+    if projector.is_supported is False:
+        for task in tasks:
+            task.projection = None
+            task.milestone_positions = None
+        return False
+
+    projections = projector.project_tasks([(task.start, task.end) for task in tasks])
+    positions = projector.project_dates(
+        [milestone.date for task in tasks for milestone in task.milestones]
+    )
+    index = 0
+    for task, projection in zip(tasks, projections):
+        task.projection = projection
+        task.milestone_positions = positions[index : index + len(task.milestones)]
+        index += len(task.milestones)
+    return True
@@ -0,0 +1,371 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+from threading import Lock, get_ident
+from typing import Callable
+
+from .pngencoding import get_png_encoding
+from .version import __version__
+
+RENDER_CACHE_VERSION = 1
+
+
+def get_default_cache_dir() -> str:
+    """Get the directory of the render cache
+
+    Returns:
+        str: Cache directory. ROADMAPPER_RENDER_CACHE overrides the default location.
+    """
+    if os.environ.get("ROADMAPPER_RENDER_CACHE"):
+        return os.environ["ROADMAPPER_RENDER_CACHE"]
+    if sys.platform.startswith("win"):
+        cache_dir = os.environ.get(
+            "LOCALAPPDATA", os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        )
+    else:
+        cache_dir = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        )
+    return os.path.join(cache_dir, "roadmapper", "renders")
+
+
+def normalise_value(value):
+    """Convert a model value into a JSON serialisable value
+
+    Args:
+        value: Model value
+
+    Returns:
+        The value as str, int, float, bool, None, list or dict
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [normalise_value(item) for item in value]
+    if is_dataclass(value):
+        ### Only the user supplied (init) fields; layout positions are derived from them
+        normalised = {
+            f.name: normalise_value(getattr(value, f.name))
+            for f in fields(value)
+            if f.init and f.name != "painter"
+        }
+        for name in ("tasks", "milestones"):
+            if hasattr(value, name):
+                normalised[name] = normalise_value(getattr(value, name))
+        return normalised
+    return str(value)
+
+
+def get_file_signature(path: str) -> list:
+    """Get what identifies the version of a file
+
+    Args:
+        path (str): File path
+
+    Returns:
+        list: [path, mtime in ns, size], or [path] if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return [path]
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def normalise_roadmap(roadmap, painter_type: str) -> dict:
+    """Get everything a rendered roadmap depends on
+
+    Args:
+        roadmap (Roadmap): The roadmap, before it is drawn
+        painter_type (str): Output format. Eg. "png"
+
+    Returns:
+        dict: JSON serialisable model of the roadmap
+    """
+    model = {
+        "cache_version": RENDER_CACHE_VERSION,
+        "version": __version__,
+        "painter_type": painter_type.lower(),
+        "width": roadmap.width,
+        "height": roadmap.height,
+        "auto_height": roadmap.auto_height,
+        "colour_theme": roadmap.colour_theme,
+        "background_colour": roadmap._painter.background_colour,
+        "title": normalise_value(roadmap._title),
+        "subtitle": normalise_value(roadmap._subtitle),
+        "timeline": normalise_value(roadmap._timeline),
+        "groups": normalise_value(roadmap._groups),
+        "footer": normalise_value(roadmap._footer),
+        "logo": normalise_value(roadmap._logo),
+        "files": [],
+    }
+    if painter_type.lower() == "svg":
+        model["compact_svg"] = roadmap.compact_svg
+    if painter_type.lower() == "png":
+        model["png_encoding"] = normalise_value(get_png_encoding(roadmap.png_encoding))
+    if roadmap._marker is not None and roadmap._show_generic_dates is False:
+        model["marker"] = normalise_value(roadmap._marker)
+        model["today"] = date.today().isoformat()
+
+    ### Changing a font, logo or colour theme file changes the rendered roadmap
+    font_names = set()
+    _collect_fonts(model, font_names)
+    files = model["files"]
+    for font_name in sorted(font_names):
+        files.append(get_file_signature(roadmap._painter.get_font_path(font_name)))
+    if roadmap._logo is not None:
+        files.append(get_file_signature(roadmap._logo.image))
+    if roadmap.colour_theme.endswith(".json"):
+        files.append(get_file_signature(roadmap.colour_theme))
+    return model
+
+
+def _collect_fonts(value, font_names: set) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.endswith("font") and isinstance(item, str):
+                font_names.add(item)
+            else:
+                _collect_fonts(item, font_names)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_fonts(item, font_names)
+
+
+class RenderCache:
+    """On-disk cache of rendered roadmap files, keyed on a hash of the roadmap model
+
+    Entries are evicted least recently used first once the cache grows
+    beyond max_size bytes.
+    """
+
+    def __init__(
+        self, cache_dir: str = None, max_size: int = 256 * 1024 * 1024, link: bool = False
+    ):
+        """__init__ method
+
+        Args:
+            cache_dir (str, optional): Cache directory. Defaults to the user cache directory.
+            max_size (int, optional): Maximum total size of the cached files in bytes. Defaults to 256 MB.
+            link (bool, optional): Hard link cached files to their destination instead of copying them. Saving over a linked file replaces it, see Helper.break_hard_link. Defaults to False.
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else get_default_cache_dir()
+        self.max_size = max_size
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = Lock()
+
+    def get_key(self, roadmap, painter_type: str) -> str:
+        """Get the cache key of a roadmap
+
+        Args:
+            roadmap (Roadmap): The roadmap, before it is drawn
+            painter_type (str): Output format. Eg. "png"
+
+        Returns:
+            str: Hex digest of the normalised roadmap model
+        """
+        model = normalise_roadmap(roadmap, painter_type)
+        data = json.dumps(model, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(data.encode("utf8")).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, key: str) -> bool:
+        """Check whether a rendered file is cached, counting a hit or a miss
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if the file is cached
+        """
+        path = self.get_path(key)
+        if os.path.isfile(path):
+            try:
+                ### Mark as recently used
+                os.utime(path)
+            except OSError:
+                pass
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def fetch(self, key: str, filename: str) -> bool:
+        """Copy, or link, a cached file to its destination
+
+        Args:
+            key (str): Cache key
+            filename (str): Destination file name
+
+        Returns:
+            bool: False if the file is not cached (anymore)
+        """
+        path = self.get_path(key)
+        try:
+            if self.link:
+                if os.path.lexists(filename):
+                    os.remove(filename)
+                try:
+                    os.link(path, filename)
+                    return True
+                except OSError:
+                    pass
+            shutil.copyfile(path, filename)
+        except OSError:
+            return False
+        return True
+
+    def read(self, key: str) -> bytes:
+        """Read a cached file
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bytes: File content, or None if the file is not cached (anymore)
+        """
+        try:
+            with open(self.get_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write(self, key: str, data: bytes) -> None:
+        """Add rendered file content to the cache. Failures are ignored, eg. on read-only file systems
+
+        Args:
+            key (str): Cache key
+            data (bytes): Rendered file content
+        """
+
+        def write_file(temp_file: str) -> None:
+            with open(temp_file, "wb") as f:
+                f.write(data)
+
+        self.__add(key, write_file)
+
+    def store(self, key: str, filename: str) -> None:
+        """Add a rendered file to the cache. Failures are ignored, eg. on read-only file systems
+
+        Args:
+            key (str): Cache key
+            filename (str): Rendered file
+        """
+        self.__add(key, lambda temp_file: shutil.copyfile(filename, temp_file))
+
+    def __add(self, key: str, write_file: Callable[[str], None]) -> None:
+        """Add a file to the cache atomically
+
+        Args:
+            key (str): Cache key
+            write_file (Callable[[str], None]): Function writing the file content to a temporary file
+        """
+        path = self.get_path(key)
+        temp_file = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_file(temp_file)
+            os.replace(temp_file, path)
+        except OSError:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            return
+        self.stores += 1
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used files until the cache fits in max_size"""
+        with self._lock:
+            entries = self.__get_entries()
+            size = sum(entry_size for _, _, entry_size in entries)
+            for _, path, entry_size in sorted(entries):
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached files and reset the counters"""
+        with self._lock:
+            for _, path, _ in self.__get_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+            self.evictions = 0
+
+    def get_stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+            dict: hits, misses, stores, evictions, number of files (count), size and max_size of the cache
+        """
+        entries = self.__get_entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "count": len(entries),
+            "size": sum(entry_size for _, _, entry_size in entries),
+            "max_size": self.max_size,
+        }
+
+    def __get_entries(self) -> list[tuple]:
+        """List the cached files
+
+        Returns:
+            list[tuple]: (last used time, path, size) for each cached file
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".tmp") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+        except OSError:
+            pass
+        return entries
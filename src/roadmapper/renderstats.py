@@ -0,0 +1,118 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import time
+from typing import Iterator
+
+from .fontcache import font_cache
+from .helper import Helper
+from .textmeasurer import text_measurer
+
+
+def get_process_counters() -> dict:
+    """Get the counters of the process-wide caches
+
+    Returns:
+        dict: Font loads, text measurements and date parses so far in this process.
+              date_parses is the process-wide class counter Helper.date_parse_count
+    """
+    return {
+        "font_loads": font_cache.misses,
+        "text_measurements": text_measurer.hits + text_measurer.misses,
+        "text_measurement_misses": text_measurer.misses,
+        "date_parses": Helper.date_parse_count,
+    }
+
+
+@dataclass()
+class RenderStats:
+    """Timings and counters of building, laying out and rendering a roadmap
+
+    Timings are in milliseconds per phase. Eg. "theme", "timeline_layout", "group_layout",
+    "marker", "painting", "encoding", "file_write". Counters include font loads, text
+    measurements, date parses and draw primitives. The font, text and date counters
+    come from process-wide caches, so they include the work of other roadmaps built
+    at the same time in other threads.
+    """
+
+    timings: dict[str, float] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    primitives: dict[str, int] = field(default_factory=dict)
+    _process_counters: dict = field(
+        default_factory=get_process_counters, init=False, repr=False
+    )
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Time a block of code and add it to a phase
+
+        Args:
+            phase (str): Phase name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, (time.perf_counter() - start) * 1000)
+
+    def add_time(self, phase: str, elapsed_ms: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0) + elapsed_ms
+
+    def count(self, counter: str, value: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def update_process_counters(self) -> None:
+        """Set the process-wide counters to their change since the stats were created"""
+        for counter, value in get_process_counters().items():
+            self.counters[counter] = value - self._process_counters[counter]
+
+    def count_primitives(self, items: list) -> None:
+        """Count draw primitives by type
+
+        Args:
+            items (list): Display list items
+        """
+        primitives = {}
+        for item in items:
+            name = type(item).__name__
+            primitives[name] = primitives.get(name, 0) + 1
+        self.primitives = primitives
+        self.counters["draw_primitives"] = len(items)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.timings.values())
+
+    def as_dict(self) -> dict:
+        """Get the stats as a JSON serialisable dict
+
+        Returns:
+            dict: timings (ms), total_ms, counters and primitives
+        """
+        return {
+            "timings": dict(self.timings),
+            "total_ms": self.total_ms,
+            "counters": dict(self.counters),
+            "primitives": dict(self.primitives),
+        }
@@ -22,17 +22,30 @@
 
 from datetime import datetime
 from dataclasses import dataclass, field
+import io
+import os
 import time
+from typing import IO, Callable, Union
 
-from .painter import PainterFactory
+from PIL import Image
+
+from .painter import Painter, PainterFactory, PNGPainter
+from .pngencoding import PNGEncoding, get_png_encoding
+from .displaylist import DisplayList, DisplayListPainter, get_union
 from .title import Title
 from .subtitle import SubTitle
 from .footer import Footer
 from .timelinemode import TimelineMode
 from .timeline import Timeline
 from .group import Group
+from .projection import project_groups
 from .marker import Marker
 from .logo import Logo
+from .rendercache import RenderCache
+from .renderstats import RenderStats
+from .svgwriter import SVGStreamPainter
+from .tiling import render_tiled
+from .helper import Helper
 
 import logging
 
@@ -47,6 +60,13 @@ class Roadmap:
     colour_theme: str = field(default="DEFAULT", init=True)
     show_marker: bool = field(default=True, init=True)
     painter_type: str = field(default="png", init=True)
+    render_cache: RenderCache = field(default=None, init=True)
+    stats_callback: Callable[[RenderStats], None] = field(default=None, init=True)
+    stream_svg: bool = field(default=False, init=True)
+    compact_svg: bool = field(default=False, init=True)
+    png_encoding: Union[str, PNGEncoding] = field(default="default", init=True)
+    tile_size: int = field(default=None, init=True)
+    tile_workers: int = field(default=None, init=True)
 
     _title: Title = field(default=None, init=False)
     _subtitle: SubTitle = field(default=None, init=False)
@@ -67,9 +87,21 @@ class Roadmap:
         )
 
         self.start_time = time.time()
-        factory = PainterFactory()
-        self._painter = factory.get_painter(self.painter_type, self.width, self.height)
-        self._set_colour_theme(self.colour_theme)
+        ### Fail early on an unknown preset
+        get_png_encoding(self.png_encoding)
+        if self.tile_size is not None and self.tile_size <= 0:
+            raise ValueError(
+                f'Invalid tile size "{self.tile_size}". Tile size must be positive'
+            )
+        self.stats = RenderStats()
+        ### Layout is recorded into a display list, which is replayed on the output painter
+        self._painter = DisplayListPainter(self.width, self.height)
+        self._is_laid_out = False
+        self._output_painters = {}
+        self._cache_keys = {}
+        self._cached_formats = set()
+        with self.stats.time("theme"):
+            self._set_colour_theme(self.colour_theme)
         self._groups = []
         if self.show_marker is True:
             self._create_marker()
@@ -173,7 +205,8 @@ class Roadmap:
         )
         self._title.text = text
 
-        self._title.set_draw_position(self._painter)
+        with self.stats.time("title_layout"):
+            self._title.set_draw_position(self._painter)
 
     def set_subtitle(
         self,
@@ -200,7 +233,8 @@ class Roadmap:
         )
         self._subtitle.text = text
 
-        self._subtitle.set_draw_position(self._painter)
+        with self.stats.time("title_layout"):
+            self._subtitle.set_draw_position(self._painter)
 
     def set_footer(
         self,
@@ -280,7 +314,7 @@ class Roadmap:
         item_fill_colour = item_fill_colour or self._painter.timeline_item_fill_colour
 
         self._show_generic_dates = show_generic_dates
-        start_date = datetime.strptime(start, "%Y-%m-%d")
+        start_date = datetime.combine(Helper.to_date(start), datetime.min.time())
         self._timeline = Timeline(
             mode=mode,
             start=start_date,
@@ -297,9 +331,11 @@ class Roadmap:
             item_font_colour=item_font_colour,
             item_fill_colour=item_fill_colour,
         )
-        self._timeline.set_draw_position(self._painter)
+        with self.stats.time("timeline_layout"):
+            self._timeline.set_draw_position(self._painter)
         if self._marker is not None:
-            self._marker.set_label_draw_position(self._painter, self._timeline)
+            with self.stats.time("marker"):
+                self._marker.set_label_draw_position(self._painter, self._timeline)
 
     def add_logo(
         self,
@@ -362,53 +398,145 @@ class Roadmap:
 
     def draw(self) -> None:
         """Draw the roadmap"""
+        self.render([self.painter_type])
 
-        ### Set the surface background colour
-        self._painter.set_background_colour()
+    def render(self, formats: list[str] = None) -> dict[str, Painter]:
+        """Lay out the roadmap once and render it in one or more formats.
+        With a render cache, formats already in the cache are not rendered;
+        save() copies them from the cache instead.
+
+        With stream_svg or compact_svg, SVG is not rendered here; save() streams it to the file instead.
+
+        Args:
+            formats (list[str], optional): Painter types. Eg. ["png", "svg"]. Defaults to [painter_type].
+
+        Returns:
+            dict[str, Painter]: Painter type -> painter holding the rendered surface
+        """
+        formats = [painter_type.lower() for painter_type in formats or [self.painter_type]]
+        if self.render_cache is not None:
+            for painter_type in formats:
+                if painter_type not in self._cache_keys:
+                    key = self.render_cache.get_key(self, painter_type)
+                    self._cache_keys[painter_type] = key
+                    if self.render_cache.lookup(key):
+                        self._cached_formats.add(painter_type)
+            formats = [
+                painter_type
+                for painter_type in formats
+                if painter_type not in self._cached_formats
+            ]
+        return self.__render(formats)
+
+    def __render(self, formats: list[str]) -> dict[str, Painter]:
+        """Lay out the roadmap if it is not laid out yet, and render it in the formats
+
+        Args:
+            formats (list[str]): Painter types in lower case
+
+        Returns:
+            dict[str, Painter]: Painter type -> painter holding the rendered surface
+        """
+        is_streamed = self.__is_svg_streamed() and "svg" in formats
+        if is_streamed:
+            formats = [
+                painter_type for painter_type in formats if painter_type != "svg"
+            ]
+        if (formats or is_streamed) and self._is_laid_out is False:
+            self.__layout()
+            self._is_laid_out = True
+
+        painters = {}
+        for painter_type in formats:
+            painters[painter_type] = self.replay(painter_type)
+        self._output_painters.update(painters)
+        return painters
+
+    def __layout(self) -> None:
+        """Lay out the roadmap, recording the drawing into the display list.
+
+        The display list is kept in segments: the head (everything above the groups),
+        the timeline vertical lines, one segment per group and the tail (marker, footer,
+        logo), so that redraw() can replace the segments of the groups that changed.
+        """
+        display_list = self.display_list
+        ### Where the layout starts, to be able to lay out again from scratch
+        self._layout_start = (len(display_list), self._painter.next_y_pos)
 
-        ### Draw the roadmap title
-        if self._title is None:
-            raise ValueError("Title is not set. Please call set_title() to set title.")
-        self._title.draw(self._painter)
+        with self.stats.time("title_layout"):
+            ### Set the surface background colour
+            self._painter.set_background_colour()
 
-        ### Draw the roadmap subtitle
-        if self._subtitle is not None:
-            self._subtitle.draw(self._painter)
+            ### Draw the roadmap title
+            if self._title is None:
+                raise ValueError(
+                    "Title is not set. Please call set_title() to set title."
+                )
+            self._title.draw(self._painter)
+
+            ### Draw the roadmap subtitle
+            if self._subtitle is not None:
+                self._subtitle.draw(self._painter)
 
         ### Draw the roadmap timeline
         if self._timeline is None:
             raise ValueError(
                 "Timeline is not set. Please call set_timeline() to set timeline."
             )
-        self._timeline.draw(self._painter)
-
-        ### Set the roadmap groups draw position
-        for group in self._groups:
-            group.set_draw_position(self._painter, self._timeline)
+        with self.stats.time("timeline_layout"):
+            self._timeline.draw(self._painter)
+        self._head_count = len(display_list)
+
+        with self.stats.time("group_layout"):
+            ### Project all task and milestone dates onto the timeline in one pass
+            project_groups(self._timeline, self._groups)
+
+            ### Set the roadmap groups draw position
+            self._group_bands = []
+            for group in self._groups:
+                start_y = self._painter.next_y_pos
+                group.set_draw_position(self._painter, self._timeline)
+                self._group_bands.append((start_y, self._painter.next_y_pos))
+                group.mark_clean()
 
         ### Draw timeline vertical lines on the roadmap
-        self._timeline.draw_vertical_lines(self._painter)
+        with self.stats.time("timeline_layout"):
+            self._line_items = self.__record(
+                lambda: self._timeline.draw_vertical_lines(self._painter)
+            )
 
         ### Draw the roadmap groups
-        for group in self._groups:
-            group.draw(self._painter)
+        with self.stats.time("group_layout"):
+            self._group_items = [
+                self.__record(lambda: group.draw(self._painter))
+                for group in self._groups
+            ]
+
+        self._tail_items = self.__record(self.__layout_tail)
+        self.__join_segments()
+
+    def __layout_tail(self) -> None:
+        """Lay out everything below the groups"""
 
         ### Draw the roadmap marker
         if self._marker is not None and self._show_generic_dates is False:
-            self._marker.set_line_draw_position(self._painter)
-            self._marker.draw(self._painter)
+            with self.stats.time("marker"):
+                self._marker.set_line_draw_position(self._painter)
+                self._marker.draw(self._painter)
 
         ### Draw the roadmap footer
         if self._footer is not None:
-            self._footer.set_draw_position(self._painter)
-            self._footer.draw(self._painter)
+            with self.stats.time("footer_layout"):
+                self._footer.set_draw_position(self._painter)
+                self._footer.draw(self._painter)
 
         ### Draw logo
 
         if self._logo is not None:
-            if self._logo.position[:10] != "top-centre":
-                self._logo.set_draw_position(self._painter, self.auto_height)
-            self._logo.draw(self._painter)
+            with self.stats.time("logo_layout"):
+                if self._logo.position[:10] != "top-centre":
+                    self._logo.set_draw_position(self._painter, self.auto_height)
+                self._logo.draw(self._painter)
 
         ### Auto adjust the surface height
         if self.auto_height is True:
@@ -416,21 +544,373 @@ class Roadmap:
                 self._painter.width, int(self._painter.next_y_pos)
             )
 
-    def save(self, filename: str) -> None:
-        """Save surface to file. The file type is determined by the Painter being used.
+    def __record(self, draw: Callable[[], None]) -> list:
+        """Record a drawing into a new display list segment
 
         Args:
-            filename (str): result file name
+            draw (Callable[[], None]): Draws on the layout painter
+
+        Returns:
+            list: Recorded display list items
+        """
+        items = self.display_list.items
+        start = len(items)
+        draw()
+        segment = items[start:]
+        del items[start:]
+        return segment
+
+    def __join_segments(self) -> None:
+        """Rebuild the display list from its segments"""
+        items = self.display_list.items
+        del items[self._head_count :]
+        items.extend(self._line_items)
+        for group_items in self._group_items:
+            items.extend(group_items)
+        items.extend(self._tail_items)
+
+    def redraw(self) -> list[tuple]:
+        """Lay out again only the groups that changed since the roadmap was drawn,
+        and repaint only the damaged parts of the rendered surfaces.
+
+        Changes are tracked by Group.update, Task.update, adding tasks and milestones,
+        and mark_dirty(). Groups below a group whose height changed are moved down or up
+        instead of being laid out again. PNG surfaces are repainted in the damaged
+        rectangles only, other formats are rendered again from the display list.
+        Adding or removing groups lays out the whole roadmap again.
+
+        Returns:
+            list[tuple]: Damaged (x1, y1, x2, y2) rectangles of the surface
+        """
+        if self._is_laid_out is False:
+            self.draw()
+            return [(0, 0, self.width, self.__get_surface_height())]
+        if len(self._group_bands) != len(self._groups):
+            return self.__relayout()
+
+        painter = self._painter
+        damage = []
+        shift = 0
+        shift_y = None
+        for index, group in enumerate(self._groups):
+            start_y, end_y = self._group_bands[index]
+            start_y += shift
+            end_y += shift
+            if group.is_changed():
+                with self.stats.time("group_layout"):
+                    painter.next_y_pos = start_y
+                    group.reset_draw_position()
+                    project_groups(self._timeline, [group])
+                    group.set_draw_position(painter, self._timeline)
+                    group.mark_clean()
+                    items = self.__record(lambda: group.draw(painter))
+
+                changed_items = set(self._group_items[index]) ^ set(items)
+                if changed_items:
+                    damage.append(
+                        get_union([item.get_bounds(painter) for item in changed_items])
+                    )
+                self._group_items[index] = items
+
+                if painter.next_y_pos != end_y and shift_y is None:
+                    shift_y = end_y
+                shift += painter.next_y_pos - end_y
+                end_y = painter.next_y_pos
+            elif shift != 0:
+                self._group_items[index] = [
+                    item.translate(0, shift) for item in self._group_items[index]
+                ]
+                ### Repaint where the group was and where it is now, as a later group
+                ### may shift back by the same amount
+                damage.append(
+                    (
+                        0,
+                        min(start_y, start_y - shift),
+                        self.width,
+                        max(end_y, end_y - shift),
+                    )
+                )
+            self._group_bands[index] = (start_y, end_y)
+
+        if shift != 0:
+            ### Everything below the groups depends on where they end
+            painter.next_y_pos = self._group_bands[-1][1]
+            self._line_items = self.__record(
+                lambda: self._timeline.draw_vertical_lines(painter)
+            )
+            self._tail_items = self.__record(self.__layout_tail)
+            damage = [
+                (
+                    0,
+                    min([shift_y] + [rect[1] for rect in damage]),
+                    self.width,
+                    self.__get_surface_height(),
+                )
+            ]
+        self.__join_segments()
+
+        ### The render cache entries no longer match the roadmap
+        self._cache_keys.clear()
+        self._cached_formats.clear()
+        for painter_type, output_painter in list(self._output_painters.items()):
+            if shift == 0 and isinstance(output_painter, PNGPainter):
+                with self.stats.time("painting"):
+                    output_painter.repaint(self.display_list.items, damage)
+            else:
+                self._output_painters[painter_type] = self.replay(painter_type)
+        return damage
+
+    def __relayout(self) -> list[tuple]:
+        """Lay out the whole roadmap again and render it again in the rendered formats
+
+        Returns:
+            list[tuple]: The whole surface as the damaged rectangle
+        """
+        item_count, start_y = self._layout_start
+        del self.display_list.items[item_count:]
+        self._painter.next_y_pos = start_y
+        for group in self._groups:
+            group.reset_draw_position()
+        self.__layout()
+
+        self._cache_keys.clear()
+        self._cached_formats.clear()
+        for painter_type in list(self._output_painters):
+            self._output_painters[painter_type] = self.replay(painter_type)
+        return [(0, 0, self.width, self.__get_surface_height())]
+
+    def __get_surface_height(self) -> int:
+        """Get the height of the rendered surface"""
+        if self.auto_height is True:
+            return int(self._painter.next_y_pos) + self._painter.bottom_margin
+        return self.height
+
+    @property
+    def display_list(self) -> DisplayList:
+        """The drawing primitives recorded so far, in painting order"""
+        return self._painter.display_list
+
+    def replay(self, painter_type: str) -> Painter:
+        """Render the recorded display list with a new painter
+
+        Args:
+            painter_type (str): Painter type. Eg. "png" or "svg"
+
+        Returns:
+            Painter: The painter holding the rendered surface
+        """
+        with self.stats.time("painting"):
+            height = self.height
+            if painter_type == "png":
+                ### The layout is done, so the surface is allocated at its final height
+                ### rather than at the requested height and cropped afterwards
+                height = self.__get_surface_height()
+            painter = PainterFactory().get_painter(painter_type, self.width, height)
+            if painter_type == "png" and self.tile_size is not None:
+                ### Paint large surfaces tile by tile across worker processes
+                return render_tiled(
+                    self.display_list, painter, self.tile_size, self.tile_workers
+                )
+            return self.display_list.replay(painter)
+
+    def save(
+        self, filename: Union[str, IO[bytes]], painter_type: str = None
+    ) -> RenderStats:
+        """Save surface to file. If the roadmap was rendered in several formats,
+        the file extension selects the format, otherwise the Painter being used does.
+
+        Args:
+            filename (str | IO[bytes]): result file name, or writable binary stream
+            painter_type (str, optional): Format to save. Eg. "svg". Defaults to the format selected as above.
+
+        Returns:
+            RenderStats: Timings and counters of the roadmap so far. They are also passed to stats_callback.
         """
+        if not isinstance(filename, str):
+            ### Eg. a BytesIO or an HTTP response
+            name = getattr(filename, "name", "<stream>")
+        else:
+            name = filename
 
         try:
-            self._painter.save_surface(filename)
+            if painter_type is not None:
+                painter_type = painter_type.lower()
+            elif isinstance(filename, str):
+                painter_type = os.path.splitext(filename)[1][1:].lower()
+                is_streamed = painter_type == "svg" and self.__is_svg_streamed()
+                if (
+                    painter_type not in self._output_painters
+                    and painter_type not in self._cached_formats
+                    and not is_streamed
+                ):
+                    painter_type = self.painter_type.lower()
+            else:
+                painter_type = self.painter_type.lower()
+
+            if isinstance(filename, str):
+                self.__save_surface(painter_type, filename)
+            else:
+                data = self.to_bytes(painter_type)
+                if data is not None:
+                    with self.stats.time("file_write"):
+                        filename.write(data)
         except Exception as e:
-            print(f"Error saving roadmap to file...[{filename}]")
+            print(f"Error saving roadmap to file...[{name}]")
             print(f"Error: {e}")
 
+        self.stats.count_primitives(self.display_list.items)
+        self.stats.update_process_counters()
+        if self.stats_callback is not None:
+            self.stats_callback(self.stats)
+
         elapsed_time = (time.time() - self.start_time) * 1000
-        print(f"Took [{elapsed_time:.2f}ms] to generate '{filename}' roadmap")
+        print(f"Took [{elapsed_time:.2f}ms] to generate '{name}' roadmap")
+        return self.stats
+
+    def to_bytes(self, painter_type: str = None) -> bytes:
+        """Get the roadmap as file content, without writing a file.
+        The roadmap is rendered in the format first if it is not rendered yet.
+
+        Args:
+            painter_type (str, optional): Format. Eg. "png" or "svg". Defaults to painter_type.
+
+        Returns:
+            bytes: File content, or None if there is no surface to save
+        """
+        painter_type = (painter_type or self.painter_type).lower()
+        if painter_type not in self._output_painters:
+            self.render([painter_type])
+
+        if painter_type in self._cached_formats:
+            with self.stats.time("cache_fetch"):
+                data = self.render_cache.read(self._cache_keys[painter_type])
+            if data is not None:
+                return data
+            ### Evicted since it was looked up
+            self._cached_formats.discard(painter_type)
+            self.__render([painter_type])
+
+        if (
+            painter_type == "svg"
+            and self.__is_svg_streamed()
+            and painter_type not in self._output_painters
+        ):
+            buffer = io.StringIO()
+            self.write_svg(buffer)
+            data = buffer.getvalue().encode("utf-8")
+        else:
+            data = self.__encode(painter_type, self._output_painters[painter_type])
+
+        if data is not None and self.render_cache is not None and self._is_laid_out:
+            self.render_cache.write(self.__get_cache_key(painter_type), data)
+        return data
+
+    @property
+    def image(self) -> Image.Image:
+        """The roadmap as a Pillow image, eg. to post-process or encode it without a file.
+        The roadmap is rendered in PNG first if it is not rendered yet."""
+        if "png" not in self._output_painters:
+            self.__render(["png"])
+        return self._output_painters["png"].image
+
+    def __save_surface(self, painter_type: str, filename: str) -> None:
+        """Save the surface of a format, from the render cache if it is cached
+
+        Args:
+            painter_type (str): Painter type in lower case
+            filename (str): result file name
+        """
+        if painter_type in self._cached_formats:
+            with self.stats.time("cache_fetch"):
+                is_fetched = self.render_cache.fetch(
+                    self._cache_keys[painter_type], filename
+                )
+            if is_fetched:
+                return
+            ### Evicted since it was looked up
+            self._cached_formats.discard(painter_type)
+            self.__render([painter_type])
+
+        if (
+            painter_type == "svg"
+            and self.__is_svg_streamed()
+            and painter_type not in self._output_painters
+        ):
+            self.write_svg(filename)
+        else:
+            self.__write_surface(painter_type, filename)
+
+        if self.render_cache is not None and self._is_laid_out:
+            self.render_cache.store(self.__get_cache_key(painter_type), filename)
+
+    def __encode(self, painter_type: str, painter: Painter) -> bytes:
+        """Encode the surface of a painter, counting the encoded bytes
+
+        Args:
+            painter_type (str): Painter type in lower case
+            painter (Painter): Painter holding the rendered surface
+
+        Returns:
+            bytes: Encoded surface, or None if there is no surface to save
+        """
+        if isinstance(painter, PNGPainter):
+            painter.encoding = get_png_encoding(self.png_encoding)
+        with self.stats.time("encoding"):
+            data = painter.encode_surface()
+        if data is not None:
+            self.stats.count(f"{painter_type}_bytes", len(data))
+        return data
+
+    def __get_cache_key(self, painter_type: str) -> str:
+        key = self._cache_keys.get(painter_type)
+        if key is None:
+            key = self.render_cache.get_key(self, painter_type)
+        return key
+
+    def __write_surface(self, painter_type: str, filename: str) -> None:
+        """Encode the surface of a format and write it to a file
+
+        Args:
+            painter_type (str): Painter type in lower case
+            filename (str): result file name
+        """
+        if painter_type not in self._output_painters:
+            self._output_painters[painter_type] = self.replay(painter_type)
+        painter = self._output_painters[painter_type]
+        data = self.__encode(painter_type, painter)
+        if data is None:
+            return
+        with self.stats.time("file_write"):
+            painter.write_surface(data, filename)
+
+    def __is_svg_streamed(self) -> bool:
+        """Compact SVG is only written by the streaming writer"""
+        return self.stream_svg or self.compact_svg
+
+    def write_svg(self, target: Union[str, IO[str]]) -> None:
+        """Stream the roadmap as SVG to a file, without keeping the SVG elements in memory.
+        The roadmap is laid out first if it is not laid out yet. With compact_svg, repeated
+        styles and shapes are shared through CSS classes and <defs>.
+
+        Args:
+            target (str | IO[str]): File name, or text file or buffer to write to
+        """
+        if isinstance(target, str):
+            Helper.break_hard_link(target)
+            with open(target, "w", encoding="utf-8") as f:
+                self.write_svg(f)
+            return
+
+        if self._is_laid_out is False:
+            self.__layout()
+            self._is_laid_out = True
+        with self.stats.time("painting"):
+            painter = SVGStreamPainter(
+                self.width, self.height, target, self.compact_svg
+            )
+            self.display_list.replay(painter)
+            ### No surface size is recorded without auto height
+            painter.close()
 
     def __enter__(self):
         """This method is called when the 'with' statement is used"""
@@ -0,0 +1,352 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import re
+from typing import IO, Iterator, Union
+
+from .group import Group
+from .roadmap import Roadmap
+from .task import Task
+from .timelinemode import TimelineMode
+
+### Characters that may continue a number decoded at the end of a chunk, eg. "1." or "1e"
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+### Spec keys passed to the Roadmap constructor
+ROADMAP_KEYS = (
+    "width",
+    "height",
+    "auto_height",
+    "colour_theme",
+    "show_marker",
+    "painter_type",
+    "png_encoding",
+    "tile_size",
+    "tile_workers",
+)
+
+
+def build_roadmap(spec: dict) -> Roadmap:
+    """Build a roadmap from a spec
+
+    A spec is a dict mirroring the Roadmap API. Eg.
+    {
+        "width": 1200, "colour_theme": "BLUEMOUNTAIN",
+        "title": {"text": "My Roadmap"},
+        "timeline": {"mode": "MONTHLY", "start": "2025-01-01", "number_of_items": 12},
+        "groups": [
+            {"text": "Stream", "tasks": [
+                {"text": "Task", "start": "2025-01-01", "end": "2025-06-30",
+                 "milestones": [{"text": "v1.0", "date": "2025-03-01"}],
+                 "parallel_tasks": []}
+            ]}
+        ],
+        "footer": {"text": "Generated by Roadmapper"}
+    }
+    Sections are applied in the order they appear in the spec, like the
+    equivalent method calls would be.
+
+    Args:
+        spec (dict): Roadmap spec
+
+    Returns:
+        Roadmap: The roadmap, ready to be drawn
+    """
+    roadmap = Roadmap(**{key: spec[key] for key in ROADMAP_KEYS if key in spec})
+    for key, value in spec.items():
+        apply_section(roadmap, key, value)
+    return roadmap
+
+
+def apply_section(roadmap: Roadmap, key: str, value) -> None:
+    """Apply one top level section of a spec to a roadmap
+
+    Args:
+        roadmap (Roadmap): Roadmap to configure
+        key (str): Section name. Eg. "title" or "groups"
+        value: Section value
+    """
+    match key:
+        case "background_colour":
+            roadmap.set_background_colour(value)
+        case "title":
+            roadmap.set_title(**value)
+        case "subtitle":
+            roadmap.set_subtitle(**value)
+        case "marker":
+            roadmap.set_marker(**value)
+        case "timeline":
+            roadmap.set_timeline(**get_timeline_args(value))
+        case "logo":
+            roadmap.add_logo(**value)
+        case "groups":
+            for group_spec in value:
+                add_group(roadmap, group_spec)
+        case "footer":
+            roadmap.set_footer(**value)
+        case _ if key in ROADMAP_KEYS:
+            pass
+        case _:
+            raise ValueError(f"Unknown roadmap spec section '{key}'")
+
+
+def get_timeline_args(spec: dict) -> dict:
+    """Get the set_timeline arguments of a timeline spec
+
+    Args:
+        spec (dict): Timeline spec. "mode" is a TimelineMode name (Eg. "MONTHLY") or value (Eg. "M")
+
+    Returns:
+        dict: Keyword arguments of Roadmap.set_timeline
+    """
+    args = dict(spec)
+    if "mode" in args:
+        args["mode"] = getattr(TimelineMode, str(args["mode"]).upper(), args["mode"])
+    return args
+
+
+def add_group(roadmap: Roadmap, spec: dict) -> Group:
+    """Add a group and its tasks from a group spec
+
+    Args:
+        roadmap (Roadmap): Roadmap to add the group to
+        spec (dict): Group spec. Same keys as Roadmap.add_group, plus "tasks"
+
+    Returns:
+        Group: The group
+    """
+    group = roadmap.add_group(
+        **{key: value for key, value in spec.items() if key != "tasks"}
+    )
+    for task_spec in spec.get("tasks", []):
+        add_task(group, task_spec)
+    return group
+
+
+def add_task(parent: Union[Group, Task], spec: dict) -> Task:
+    """Add a task, its milestones and its parallel tasks from a task spec
+
+    Args:
+        parent (Group | Task): Group, or task for a parallel task
+        spec (dict): Task spec. Same keys as Group.add_task, plus "milestones" and "parallel_tasks"
+
+    Returns:
+        Task: The task
+    """
+    args = {
+        key: value
+        for key, value in spec.items()
+        if key not in ("milestones", "parallel_tasks")
+    }
+    if isinstance(parent, Group):
+        task = parent.add_task(**args)
+    else:
+        task = parent.add_parallel_task(**args)
+    for milestone_spec in spec.get("milestones", []):
+        task.add_milestone(**milestone_spec)
+    for parallel_task_spec in spec.get("parallel_tasks", []):
+        add_task(task, parallel_task_spec)
+    return task
+
+
+class JSONStream:
+    """Incremental reader of a JSON document, one value at a time
+
+    Only the unread part of the current chunk and the value being decoded
+    are held in memory.
+    """
+
+    def __init__(self, fp: IO[str], chunk_size: int = 65536):
+        """__init__ method
+
+        Args:
+            fp (IO[str]): Text file object
+            chunk_size (int, optional): Number of characters read at a time. Defaults to 65536.
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.is_eof = False
+        self.decoder = json.JSONDecoder()
+
+    def __read_more(self) -> bool:
+        """Append the next chunk to the buffer, dropping what has been consumed
+
+        Returns:
+            bool: False at the end of the file
+        """
+        if self.is_eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.is_eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it
+
+        Returns:
+            str: The character, or "" at the end of the file
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.__read_more():
+                return self.buffer[self.pos : self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char
+
+        Args:
+            char (str): Expected character
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid roadmap spec: expected '{char}', found '{found}'")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode the next JSON value
+
+        Returns:
+            The decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.__read_more():
+                    continue
+                raise
+            ### A number at the end of the buffer may continue in the next chunk
+            if (
+                NUMBER_TAIL.match(self.buffer, end).end() < len(self.buffer)
+                or not self.__read_more()
+            ):
+                self.pos = end
+                return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over the keys of an object. The caller consumes each value
+
+        Yields:
+            str: Key of the next member
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            self.expect(",")
+
+    def iter_array(self) -> Iterator[None]:
+        """Iterate over the items of an array. The caller consumes each item"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def load_roadmap(source: Union[str, IO[str]], chunk_size: int = 65536) -> Roadmap:
+    """Build a roadmap from a JSON spec file, streaming groups and tasks into the roadmap
+
+    The spec format is the one of build_roadmap. Groups and tasks are added as
+    they are read, so only one task is decoded at a time. For this to work,
+    the roadmap settings (width, height, ...) must come before the other
+    sections, and the "tasks" of a group must come after its other keys.
+
+    Args:
+        source (str | IO[str]): JSON file path, or text file object
+        chunk_size (int, optional): Number of characters read at a time. Defaults to 65536.
+
+    Returns:
+        Roadmap: The roadmap, ready to be drawn
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf8") as fp:
+            return load_roadmap(fp, chunk_size)
+
+    stream = JSONStream(source, chunk_size)
+    settings = {}
+    roadmap = None
+    for key in stream.iter_object():
+        if key in ROADMAP_KEYS:
+            if roadmap is not None:
+                raise ValueError(
+                    f"Roadmap spec setting '{key}' must come before the other sections"
+                )
+            settings[key] = stream.read_value()
+            continue
+
+        if roadmap is None:
+            roadmap = Roadmap(**settings)
+        if key == "groups":
+            for _ in stream.iter_array():
+                _stream_group(roadmap, stream)
+        else:
+            apply_section(roadmap, key, stream.read_value())
+
+    if stream.peek() != "":
+        raise ValueError("Invalid roadmap spec: unexpected data after the spec")
+    return roadmap if roadmap is not None else Roadmap(**settings)
+
+
+def _stream_group(roadmap: Roadmap, stream: JSONStream) -> None:
+    """Add a group from the stream, then its tasks one at a time
+
+    Args:
+        roadmap (Roadmap): Roadmap to add the group to
+        stream (JSONStream): Stream positioned at the group object
+    """
+    args = {}
+    group = None
+    for key in stream.iter_object():
+        if key == "tasks":
+            group = group or roadmap.add_group(**args)
+            for _ in stream.iter_array():
+                add_task(group, stream.read_value())
+        elif group is not None:
+            raise ValueError(
+                f"Group spec key '{key}' must come before the group's tasks"
+            )
+        else:
+            args[key] = stream.read_value()
+    if group is None:
+        roadmap.add_group(**args)
@@ -0,0 +1,364 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import tempfile
+from typing import IO
+
+from .painter import Painter, SVGPainter
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SVG_START = (
+    '<svg xmlns="http://www.w3.org/2000/svg" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink"\n    '
+)
+SVG_END = "</svg>"
+SVG_CSS_FMT = "<style>/*<![CDATA[*/{}/*]]>*/</style>\n"
+
+### Room reserved in the header for the final width and height
+MAX_SIZE_DIGITS = 10
+
+### Attributes moved into CSS classes in compact mode, with their CSS unit
+STYLE_ATTRIBUTES = {
+    "fill": "",
+    "stroke": "",
+    "stroke-opacity": "",
+    "stroke-width": "px",
+    "font-size": "px",
+    "font-family": "",
+    "text-anchor": "",
+    "dominant-baseline": "",
+}
+
+
+def format_number(value) -> str:
+    """Format a number with at most 2 decimals and no trailing zeros. Eg. 125.0 -> "125"
+
+    Args:
+        value: Attribute value. Values other than floats are returned as strings unchanged
+
+    Returns:
+        str: Formatted value
+    """
+    if not isinstance(value, float):
+        return str(value)
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class SVGWriter:
+    """Write SVG elements to a text file as they are drawn
+
+    The <svg> header is written first with room reserved for the size, and is
+    patched with the final size when the writer is closed, so that auto height
+    roadmaps can be streamed. The output is the same as drawsvg's, apart from
+    the padding in the <svg> tag.
+
+    In compact mode, repeated presentation attributes are replaced by CSS
+    classes and polygons (milestone diamonds, arrowheads) by <use> references
+    to shapes in <defs>. The elements are spooled to a temporary file, and the
+    header, <style> and <defs> are written before them when the writer is closed.
+    """
+
+    def __init__(self, fp: IO[str], width: int, height: int, compact: bool = False):
+        """__init__ method
+
+        Args:
+            fp (IO[str]): Text file or buffer to write to. Non-seekable files are spooled
+                          to a temporary file until the size is known.
+            width (int): Width of the surface
+            height (int): Height of the surface
+            compact (bool, optional): Share styles and shapes between elements. Defaults to False.
+        """
+        self.fp = fp
+        self.width = width
+        self.height = height
+        self.compact = compact
+        self.element_count = 0
+        self._classes = {}
+        self._shapes = {}
+        self._spool = None
+        if compact or not fp.seekable():
+            self._spool = tempfile.SpooledTemporaryFile(
+                max_size=1 << 20, mode="w+", encoding="utf-8"
+            )
+        self._out = self._spool if self._spool is not None else fp
+        self._start = self._out.tell()
+        if not compact:
+            self._out.write(self.get_header(width, height))
+            self._out.write("<defs>\n</defs>\n")
+
+    def get_header(self, width: int, height: int, is_padded: bool = True) -> str:
+        """Get the XML header and the <svg> tag
+
+        Args:
+            width (int): Width of the surface
+            height (int): Height of the surface
+            is_padded (bool, optional): Pad the <svg> tag to a fixed length, so that it can be patched. Defaults to True.
+
+        Returns:
+            str: The header
+        """
+        size = f'width="{width}" height="{height}" viewBox="0 0 {width} {height}"'
+        if is_padded:
+            reserved = len('width="" height="" viewBox="0 0  "') + 4 * MAX_SIZE_DIGITS
+            if len(size) > reserved:
+                raise ValueError(f"SVG size {width}x{height} is too large")
+            size = size.ljust(reserved)
+        return f"{XML_HEADER}{SVG_START} {size}>\n"
+
+    def append(self, element) -> None:
+        """Write a drawsvg element, eg. dw.Rectangle, followed by a new line
+
+        Args:
+            element: drawsvg element. Only its tag, attributes, text and children are written
+        """
+        if self.compact:
+            self.write_compact_element(element)
+        else:
+            self.write_element(element)
+        self._out.write("\n")
+        self.element_count += 1
+
+    def write_element(self, element) -> None:
+        out = self._out
+        out.write("<")
+        out.write(element.TAG_NAME)
+        for name, value in element.args.items():
+            if value is not None:
+                out.write(f' {name}="{value}"')
+        self.__write_content(element)
+
+    def write_compact_element(self, element) -> None:
+        """Write a drawsvg element with its presentation attributes replaced by a class
+
+        Args:
+            element: drawsvg element
+        """
+        tag = element.TAG_NAME
+        attributes = {}
+        style = []
+        for name, value in element.args.items():
+            if value is None:
+                continue
+            if name in STYLE_ATTRIBUTES:
+                style.append((name, str(value)))
+            else:
+                attributes[name] = format_number(value)
+
+        if tag == "path":
+            shape = self.__get_shape(attributes["d"])
+            if shape is not None:
+                shape_id, x, y = shape
+                tag = "use"
+                del attributes["d"]
+                attributes = {
+                    "xlink:href": f"#{shape_id}",
+                    "x": x,
+                    "y": y,
+                    **attributes,
+                }
+            else:
+                attributes["d"] = self.__format_path(attributes["d"])
+        if style:
+            ### Same declarations in any attribute order share one class
+            attributes["class"] = self.__get_class(tuple(sorted(style)))
+
+        out = self._out
+        out.write(f"<{tag}")
+        for name, value in attributes.items():
+            out.write(f' {name}="{value}"')
+        if tag == element.TAG_NAME:
+            self.__write_content(element)
+        else:
+            out.write(" />")
+
+    def __write_content(self, element) -> None:
+        out = self._out
+        text = getattr(element, "escaped_text", "")
+        if not text and not element.children:
+            out.write(" />")
+            return
+        out.write(">")
+        out.write(text)
+        for child in element.children:
+            self.write_element(child)
+        out.write(f"</{element.TAG_NAME}>")
+
+    def __get_class(self, style: tuple) -> str:
+        class_name = self._classes.get(style)
+        if class_name is None:
+            class_name = f"c{len(self._classes)}"
+            self._classes[style] = class_name
+        return class_name
+
+    def __get_points(self, d: str) -> list[tuple]:
+        """Get the points of a path made of straight lines only. Eg. "M1,2 L3,4"
+
+        Args:
+            d (str): Path data
+
+        Returns:
+            list[tuple]: (x, y) points, or None if the path has other commands
+        """
+        points = []
+        for i, command in enumerate(d.split()):
+            if command[0] != ("M" if i == 0 else "L"):
+                return None
+            x, _, y = command[1:].partition(",")
+            try:
+                points.append((float(x), float(y)))
+            except ValueError:
+                return None
+        return points
+
+    def __format_path(self, d: str) -> str:
+        points = self.__get_points(d)
+        if points is None:
+            return d
+        return " ".join(
+            f"{'M' if i == 0 else 'L'}{format_number(x)},{format_number(y)}"
+            for i, (x, y) in enumerate(points)
+        )
+
+    def __get_shape(self, d: str) -> tuple:
+        """Get the shared shape of a polygon, relative to its first point
+
+        Args:
+            d (str): Path data
+
+        Returns:
+            tuple: (shape id, x, y) to <use> the shape at, or None if the path is not a polygon
+        """
+        points = self.__get_points(d)
+        if points is None or len(points) < 3:
+            return None
+        x, y = points[0]
+        shape_d = " ".join(
+            f"{'M' if i == 0 else 'L'}{format_number(px - x)},{format_number(py - y)}"
+            for i, (px, py) in enumerate(points)
+        )
+        shape_id = self._shapes.get(shape_d)
+        if shape_id is None:
+            shape_id = f"s{len(self._shapes)}"
+            self._shapes[shape_d] = shape_id
+        return shape_id, format_number(x), format_number(y)
+
+    def get_style(self) -> str:
+        """Get the CSS rules of the classes used so far
+
+        Returns:
+            str: One rule per line. Eg. ".c0{fill:#FFFFFF}"
+        """
+        rules = []
+        for style, class_name in self._classes.items():
+            declarations = []
+            for name, value in style:
+                if name == "font-family":
+                    value = f'"{value}"'
+                elif STYLE_ATTRIBUTES[name] and value.replace(".", "", 1).isdigit():
+                    value = f"{value}{STYLE_ATTRIBUTES[name]}"
+                declarations.append(f"{name}:{value}")
+            rules.append(f".{class_name}{{{';'.join(declarations)}}}")
+        return "\n".join(rules)
+
+    def close(self, width: int = None, height: int = None) -> None:
+        """End the document and patch the header with the final size
+
+        Args:
+            width (int, optional): Final width. Defaults to the width given to __init__.
+            height (int, optional): Final height. Defaults to the height given to __init__.
+        """
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        self._out.write(SVG_END)
+        if self.compact:
+            self.fp.write(self.get_header(width, height, is_padded=False))
+            if self._classes:
+                self.fp.write(SVG_CSS_FMT.format(self.get_style()))
+            self.fp.write("<defs>\n")
+            for shape_d, shape_id in self._shapes.items():
+                self.fp.write(f'<path id="{shape_id}" d="{shape_d}" />\n')
+            self.fp.write("</defs>\n")
+        elif (width, height) != (self.width, self.height):
+            end = self._out.tell()
+            self._out.seek(self._start)
+            self._out.write(self.get_header(width, height))
+            self._out.seek(end)
+        self.width, self.height = width, height
+
+        if self._spool is not None:
+            self._spool.seek(0)
+            while True:
+                chunk = self._spool.read(1 << 16)
+                if not chunk:
+                    break
+                self.fp.write(chunk)
+            self._spool.close()
+            self._spool = None
+
+
+class SVGStreamPainter(SVGPainter):
+    """SVG painter that writes every element as soon as it is drawn
+
+    SVGPainter keeps every element in memory, copies them into a drawing and
+    then serialises the whole drawing. This painter keeps none of them, so its
+    memory use does not grow with the number of elements.
+    """
+
+    def __init__(
+        self, width: int, height: int, fp: IO[str] = None, compact: bool = False
+    ):
+        """__init__ method
+
+        Args:
+            width (int): Width of the surface
+            height (int): Height of the surface
+            fp (IO[str], optional): Text file or buffer to write to. Defaults to an in-memory buffer.
+            compact (bool, optional): Share styles and shapes between elements, see SVGWriter. Defaults to False.
+        """
+        super().__init__(width, height)
+        self.fp = fp if fp is not None else io.StringIO()
+        self.elements = SVGWriter(self.fp, width, height, compact)
+        self.is_closed = False
+
+    def set_surface_size(self, width: int, height: int) -> None:
+        """Set surface size and end the document"""
+        _, _, right, bottom = Painter.set_surface_size(self, width, height)
+        self.close(right, bottom)
+
+    def close(self, width: int = None, height: int = None) -> None:
+        """End the document. Nothing can be drawn afterwards
+
+        Args:
+            width (int, optional): Final width. Defaults to the width of the surface.
+            height (int, optional): Final height. Defaults to the height of the surface.
+        """
+        if self.is_closed:
+            return
+        self.elements.close(width, height)
+        self.is_closed = True
+
+    def encode_surface(self) -> bytes:
+        """Encode surface to SVG. Only available when writing to the in-memory buffer"""
+        if not self.is_closed or not isinstance(self.fp, io.StringIO):
+            return None
+        return self.fp.getvalue().encode("utf-8")
@@ -20,11 +20,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import date
+from typing import Union
 
 from .milestone import Milestone
 from .painter import Painter
+from .projection import TaskProjection
 from .timeline import Timeline
 from .helper import Helper
 
@@ -34,8 +36,8 @@ class Task:
     """Roadmap Task class"""
 
     text: str = field(init=True, default=None)
-    start: datetime = field(init=True, default=None)
-    end: datetime = field(init=True, default=None)
+    start: date = field(init=True, default=None)
+    end: date = field(init=True, default=None)
     font: str = field(init=True, default=None)
     font_size: int = field(init=True, default=0)
     font_colour: str = field(init=True, default=None)
@@ -55,12 +57,23 @@ class Task:
     box_height: int = field(init=False, default=0)
     text_x: int = field(init=False, default=0)
     text_y: int = field(init=False, default=0)
+    projection: TaskProjection = field(init=False, default=None, repr=False)
+    milestone_positions: list = field(init=False, default=None, repr=False)
+    ### Set when the task changes, cleared once it is laid out
+    is_dirty: bool = field(init=False, default=True, repr=False)
+
+    def __post_init__(self):
+        ### Parse the dates once, so layout never has to
+        if self.start is not None:
+            self.start = Helper.to_date(self.start)
+        if self.end is not None:
+            self.end = Helper.to_date(self.end)
 
     def add_parallel_task(
         self,
         text: str,
-        start: datetime,
-        end: datetime,
+        start: Union[str, date],
+        end: Union[str, date],
         font: str = "",
         font_size: int = 0,
         font_colour: str = "",
@@ -72,8 +85,8 @@ class Task:
 
         Args:
             text (str): Task text
-            start (datetime): Task start date
-            end (datetime): Task end date
+            start (str | date | datetime): Task start date. Strings are in YYYY-MM-DD format
+            end (str | date | datetime): Task end date. Strings are in YYYY-MM-DD format
             font (str, optional): Task text font. Defaults to "Arial".
             font_size (int, optional): Task text font size. Defaults to 12.
             font_colour (str, optional): Task text font colour. Defaults to "Black".
@@ -101,13 +114,14 @@ class Task:
             painter=self.painter,
         )
         self.tasks.append(task)
+        self.is_dirty = True
 
         return task
 
     def add_milestone(
         self,
         text: str,
-        date: datetime,
+        date: Union[str, date],
         font: str = "",
         font_size: int = 0,
         font_colour: str = "",
@@ -118,7 +132,7 @@ class Task:
 
         Args:
             text (str): Milestone text
-            date (datetime): Milestone date
+            date (str | date | datetime): Milestone date. Strings are in YYYY-MM-DD format
             font (str, optional): Milestone text font. Defaults to "Arial".
             font_size (int, optional): Milestone text font size. Defaults to 12.
             font_colour (str, optional): Milestone text font colour. Defaults to "Red". HTML colour name or hex code. Eg. #FFFFFF or LightGreen
@@ -145,6 +159,51 @@ class Task:
                 text_alignment=text_alignment,
             )
         )
+        self.is_dirty = True
+
+    def update(self, **changes) -> None:
+        """Change task settings. The task is laid out again by Roadmap.redraw
+
+        Args:
+            **changes: New values of the task settings. Eg. end="2023-06-30", text="New text"
+        """
+        settings = [f.name for f in fields(self) if f.init and f.name != "painter"]
+        for name, value in changes.items():
+            if name not in settings:
+                raise ValueError(f"Unknown task setting '{name}'")
+            setattr(self, name, value)
+        self.__post_init__()
+        self.is_dirty = True
+
+    def mark_dirty(self) -> None:
+        """Mark the task as changed, eg. after changing one of its milestones"""
+        self.is_dirty = True
+
+    def is_changed(self) -> bool:
+        """Check whether the task, or any of its parallel tasks, changed since it was laid out
+
+        Returns:
+            bool: True if the task needs to be laid out again
+        """
+        return self.is_dirty or any(task.is_changed() for task in self.tasks)
+
+    def mark_clean(self) -> None:
+        """Mark the task and its parallel tasks as laid out"""
+        self.is_dirty = False
+        for task in self.tasks:
+            task.mark_clean()
+
+    def reset_draw_position(self) -> None:
+        """Clear the draw positions of the task, its parallel tasks and its milestones"""
+        self.boxes = []
+        self.box_x = self.box_y = self.box_width = self.box_height = 0
+        self.text_x = self.text_y = 0
+        for milestone in self.milestones:
+            milestone.diamond_x = milestone.diamond_y = 0
+            milestone.diamond_width = milestone.diamond_height = 0
+            milestone.text_x = milestone.text_y = 0
+        for task in self.tasks:
+            task.reset_draw_position()
 
     def set_draw_position(
         self,
@@ -182,10 +241,10 @@ class Task:
 
         for_parallel_tasks_y = self.box_y
 
-        task_start_period = datetime.strptime(self.start, "%Y-%m-%d")
-        task_end_period = datetime.strptime(self.end, "%Y-%m-%d")
-
-        self.set_task_position(painter, timeline, task_start_period, task_end_period)
+        if self.projection is not None:
+            self.set_projected_task_position(painter)
+        else:
+            self.set_task_position(painter, timeline, self.start, self.end)
 
         ### Set parallel tasks position
         for task in self.tasks:
@@ -210,64 +269,108 @@ class Task:
         Args:
             painter (Painter): Pillow wrapper class instance
             timeline (Timeline): Timeline object
-            task_start_period (datetime): Task start date
-            task_end_period (datetime): Task end date
+            task_start_period (date): Task start date
+            task_end_period (date): Task end date
         """
-        # --- FIX for #106 (Start) milestone wrong position ---
-        previous_start = None
-        previous_end = None
-        # --- FIX for #106 (End) ---
-        for timeline_item in timeline.timeline_items:
-            # --- FIX for #106 (Start) milestone wrong position ---
-            (
-                timeline_start_period,
-                timeline_end_period,
-            ) = timeline_item.get_timeline_period(
-                timeline.mode, previous_start, previous_end
+        ### Measure all milestone texts in one pass
+        milestone_text_dimensions = painter.measure_many(
+            (milestone.text, milestone.font, milestone.font_size)
+            for milestone in self.milestones
+        )
+
+        if self.milestone_positions is not None:
+            ### Positions projected in bulk by projection.project_groups
+            for milestone_index, milestone in enumerate(self.milestones):
+                milestone_x = self.milestone_positions[milestone_index]
+                if milestone_x is None:
+                    continue
+                self.__set_milestone_position(
+                    milestone, milestone_x, milestone_text_dimensions[milestone_index]
+                )
+            return
+
+        for milestone_index, milestone in enumerate(self.milestones):
+            milestone_date = milestone.date
+
+            ### Find the timeline item containing the milestone date
+            timeline_item_index = timeline.locate(milestone_date)
+            if timeline_item_index is None:
+                continue
+            timeline_item = timeline.timeline_items[timeline_item_index]
+            timeline_start_period, timeline_end_period = timeline.get_item_period(
+                timeline_item_index
             )
-            # --- FIX for #106 (End) ---
             Helper.printc(
-                f"Timeline start: {timeline_start_period}, Timeline end: {timeline_end_period}",
+                lambda: f"Timeline start: {timeline_start_period}, Timeline end: {timeline_end_period}",
+                show_level="task",
+            )
+            Helper.printc(
+                lambda: f"{milestone_date=}",
                 show_level="task",
             )
-            previous_start = timeline_start_period
-            previous_end = timeline_end_period
 
+            (
+                _,
+                milestone_pos_percentage,
+            ) = timeline_item.get_timeline_pos_percentage(timeline.mode, milestone_date)
             bar_x_pos = timeline_item.box_x
 
-            for milestone in self.milestones:
-                milestone_date = datetime.strptime(milestone.date, "%Y-%m-%d")
-                (
-                    _,
-                    milestone_pos_percentage,
-                ) = timeline_item.get_timeline_pos_percentage(
-                    timeline.mode, milestone_date
-                )
+            self.__set_milestone_position(
+                milestone,
+                bar_x_pos + (timeline_item.box_width * milestone_pos_percentage),
+                milestone_text_dimensions[milestone_index],
+            )
 
-                if timeline_start_period <= milestone_date <= timeline_end_period:
-                    Helper.printc(
-                        f"{milestone_date=}",
-                        show_level="task",
-                    )
-                    milestone.diamond_x = (
-                        bar_x_pos
-                        + (timeline_item.box_width * milestone_pos_percentage)
-                        - 8
-                        - 3
-                    )
-                    milestone.diamond_y = self.box_y - 3
-                    milestone.diamond_width = 26
-                    milestone.diamond_height = 26
-
-                    width, _ = painter.get_text_dimension(
-                        milestone.text, milestone.font, milestone.font_size
-                    )
-                    milestone.text_x = (
-                        bar_x_pos
-                        + (timeline_item.box_width * milestone_pos_percentage)
-                        - (width / 3)
-                    )
-                    milestone.text_y = self.box_y - 18
+    def __set_milestone_position(
+        self, milestone: Milestone, milestone_x: float, text_dimension: tuple
+    ) -> None:
+        """Set the draw position of a milestone
+
+        Args:
+            milestone (Milestone): Milestone
+            milestone_x (float): x position of the milestone date on the timeline
+            text_dimension (tuple): (width, height) of the milestone text
+        """
+        milestone.diamond_x = milestone_x - 8 - 3
+        milestone.diamond_y = self.box_y - 3
+        milestone.diamond_width = 26
+        milestone.diamond_height = 26
+
+        width, _ = text_dimension
+        milestone.text_x = milestone_x - (width / 3)
+        milestone.text_y = self.box_y - 18
+
+    def set_projected_task_position(self, painter: Painter) -> None:
+        """Set the draw position of this task from its bulk projection. Same result as set_task_position
+
+        Args:
+            painter (Painter): Pillow wrapper class instance
+        """
+        projection = self.projection
+        if len(projection.boxes) == 0:
+            self.box_x = 0
+            return
+
+        self.box_x = projection.box_x
+        self.box_width = projection.box_width
+        self.box_height = 20
+        box_y = int(self.box_y)
+        self.boxes.extend(
+            [box_x, box_y, box_width, self.box_height]
+            for box_x, box_width in projection.boxes
+        )
+        painter.next_y_pos = self.box_y + self.box_height + 5
+
+        self.text_x, self.text_y = painter.get_display_text_position(
+            projection.bar_start_x,
+            self.box_y,
+            projection.bar_width,
+            self.box_height,
+            self.text,
+            self.text_alignment,
+            self.font,
+            self.font_size,
+        )
 
     def is_task_begins_here_ends_here(
         self,
@@ -410,40 +513,67 @@ class Task:
         self,
         painter: Painter,
         timeline: Timeline,
-        task_start_period: datetime,
-        task_end_period: datetime,
+        task_start_period: date,
+        task_end_period: date,
     ) -> None:
         """Set the draw position of this task
 
         Args:
             painter (Painter): Pillow wrapper class instance
             timeline (Timeline): Timeline object
-            task_start_period (datetime): Task start date
-            task_end_period (datetime): Task end date
+            task_start_period (date): Task start date
+            task_end_period (date): Task end date
         """
         self.box_x = 0
         row_match = 0
         bar_start_x_pos = 0
         timeline_start_period = None
         timeline_end_period = None
-        previous_start = None
-        previous_end = None
 
-        for timeline_item in timeline.timeline_items:
-            ### Get the start and end period of the timeline item
+        ### Only visit the timeline items overlapping the task
+        for timeline_item_index in timeline.span(task_start_period, task_end_period):
+            timeline_item = timeline.timeline_items[timeline_item_index]
             (
                 timeline_start_period,
                 timeline_end_period,
-            ) = timeline_item.get_timeline_period(
-                timeline.mode, previous_start, previous_end
+            ) = timeline.get_item_period(timeline_item_index)
+
+            (
+                _,
+                start_pos_percentage,
+            ) = timeline_item.get_timeline_pos_percentage(
+                timeline.mode,
+                task_start_period,
+            )
+            (
+                _,
+                end_pos_percentage,
+            ) = timeline_item.get_timeline_pos_percentage(
+                timeline.mode, task_end_period
             )
+            row_match += 1
 
-            previous_start = timeline_start_period
-            previous_end = timeline_end_period
+            ## Check condition 1
+            if (
+                self.is_task_begins_here_ends_here(
+                    timeline_start_period,
+                    timeline_end_period,
+                    task_start_period,
+                    task_end_period,
+                )
+                is True
+            ):
+                self.box_x = timeline_item.box_x + (
+                    timeline_item.box_width * start_pos_percentage
+                )
+                self.box_width = (timeline_item.box_width * end_pos_percentage) - (
+                    timeline_item.box_width * start_pos_percentage
+                )
+                bar_start_x_pos = self.box_x
 
-            ### Check if the task is within the timeline period
+            ## Check condition 2
             if (
-                self.is_task_in_range(
+                self.is_task_begins_past_ends_here(
                     timeline_start_period,
                     timeline_end_period,
                     task_start_period,
@@ -451,100 +581,57 @@ class Task:
                 )
                 is True
             ):
-                (
-                    _,
-                    start_pos_percentage,
-                ) = timeline_item.get_timeline_pos_percentage(
-                    timeline.mode,
+                self.box_x = timeline_item.box_x
+                if bar_start_x_pos == 0:
+                    bar_start_x_pos = self.box_x
+                self.box_width = timeline_item.box_width * end_pos_percentage
+
+            ## Check condition 3
+            if (
+                self.is_task_begins_here_ends_future(
+                    timeline_start_period,
+                    timeline_end_period,
                     task_start_period,
+                    task_end_period,
                 )
-                (
-                    _,
-                    end_pos_percentage,
-                ) = timeline_item.get_timeline_pos_percentage(
-                    timeline.mode, task_end_period
+                is True
+            ):
+                self.box_x = timeline_item.box_x + (
+                    timeline_item.box_width * start_pos_percentage
                 )
-                row_match += 1
-
-                ## Check condition 1
-                if (
-                    self.is_task_begins_here_ends_here(
-                        timeline_start_period,
-                        timeline_end_period,
-                        task_start_period,
-                        task_end_period,
-                    )
-                    is True
-                ):
-                    self.box_x = timeline_item.box_x + (
-                        timeline_item.box_width * start_pos_percentage
-                    )
-                    self.box_width = (timeline_item.box_width * end_pos_percentage) - (
-                        timeline_item.box_width * start_pos_percentage
-                    )
-                    bar_start_x_pos = self.box_x
+                self.box_width = timeline_item.box_width - (
+                    timeline_item.box_width * start_pos_percentage
+                )
+                bar_start_x_pos = self.box_x
+
+            ## Check condition 4
+            if (
+                self.is_task_begins_past_ends_future(
+                    timeline_start_period,
+                    timeline_end_period,
+                    task_start_period,
+                    task_end_period,
+                )
+                is True
+            ):
+                self.box_x = timeline_item.box_x
+                self.box_width = timeline_item.box_width
 
-                ## Check condition 2
-                if (
-                    self.is_task_begins_past_ends_here(
-                        timeline_start_period,
-                        timeline_end_period,
-                        task_start_period,
-                        task_end_period,
-                    )
-                    is True
-                ):
-                    self.box_x = timeline_item.box_x
-                    if bar_start_x_pos == 0:
-                        bar_start_x_pos = self.box_x
-                    self.box_width = timeline_item.box_width * end_pos_percentage
-
-                ## Check condition 3
-                if (
-                    self.is_task_begins_here_ends_future(
-                        timeline_start_period,
-                        timeline_end_period,
-                        task_start_period,
-                        task_end_period,
-                    )
-                    is True
-                ):
-                    self.box_x = timeline_item.box_x + (
-                        timeline_item.box_width * start_pos_percentage
-                    )
-                    self.box_width = timeline_item.box_width - (
-                        timeline_item.box_width * start_pos_percentage
-                    )
+                if bar_start_x_pos == 0:
                     bar_start_x_pos = self.box_x
 
-                ## Check condition 4
-                if (
-                    self.is_task_begins_past_ends_future(
-                        timeline_start_period,
-                        timeline_end_period,
-                        task_start_period,
-                        task_end_period,
-                    )
-                    is True
-                ):
-                    self.box_x = timeline_item.box_x
-                    self.box_width = timeline_item.box_width
-
-                    if bar_start_x_pos == 0:
-                        bar_start_x_pos = self.box_x
-
-                self.box_height = 20
-
-                box_coordinates = [
-                    int(self.box_x),
-                    int(self.box_y),
-                    int(self.box_width),
-                    int(self.box_height),
-                ]
-                self.boxes.append(box_coordinates)
-
-                bar_width = self.box_x + self.box_width - bar_start_x_pos
-                painter.next_y_pos = self.box_y + self.box_height + 5
+            self.box_height = 20
+
+            box_coordinates = [
+                int(self.box_x),
+                int(self.box_y),
+                int(self.box_width),
+                int(self.box_height),
+            ]
+            self.boxes.append(box_coordinates)
+
+            bar_width = self.box_x + self.box_width - bar_start_x_pos
+            painter.next_y_pos = self.box_y + self.box_height + 5
 
         if row_match > 0:
             text_x_pos, text_y_pos = painter.get_display_text_position(
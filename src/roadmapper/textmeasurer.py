@@ -0,0 +1,142 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from threading import Lock
+from typing import Callable, Iterable
+
+from PIL import ImageFont
+
+FontLoader = Callable[[str, int], ImageFont.FreeTypeFont]
+
+
+class TextMeasurer:
+    """Memoised text measurement shared by the painters
+
+    Measurements are keyed by (text, font, font size). Fonts are only loaded,
+    through the font loader supplied by the caller, when a measurement is not
+    memoised yet.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        """__init__ method
+
+        Args:
+            max_size (int, optional): Maximum number of memoised measurements. Defaults to 100000.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._bboxes = {}
+        self._lock = Lock()
+
+    def get_bbox(
+        self, text: str, font: str, font_size: int, font_loader: FontLoader
+    ) -> tuple:
+        """Get the bounding box of a text
+
+        Args:
+            text (str): Text to measure
+            font (str): Font name
+            font_size (int): Font size
+            font_loader (FontLoader): Function returning the loaded font for (font, font_size)
+
+        Returns:
+            (left (int), top (int), right (int), bottom (int)): Text bounding box
+        """
+        key = (text, font, font_size)
+        bbox = self._bboxes.get(key)
+        if bbox is not None:
+            self.hits += 1
+            return bbox
+
+        bbox = font_loader(font, font_size).getbbox(text)
+        with self._lock:
+            self.misses += 1
+            if len(self._bboxes) >= self.max_size:
+                ### Drop the oldest measurement; dicts keep insertion order
+                self._bboxes.pop(next(iter(self._bboxes)), None)
+            self._bboxes[key] = bbox
+        return bbox
+
+    def measure(
+        self, text: str, font: str, font_size: int, font_loader: FontLoader
+    ) -> tuple:
+        """Measure a text
+
+        Args:
+            text (str): Text to measure
+            font (str): Font name
+            font_size (int): Font size
+            font_loader (FontLoader): Function returning the loaded font for (font, font_size)
+
+        Returns:
+            (text_width (int), text_height (int)): Text dimension (width, height)
+        """
+        _, _, right, bottom = self.get_bbox(text, font, font_size, font_loader)
+        return right, bottom
+
+    def measure_many(
+        self, items: Iterable[tuple], font_loader: FontLoader
+    ) -> list[tuple]:
+        """Measure many texts in one pass
+
+        Args:
+            items (Iterable[tuple]): (text, font, font_size) tuples
+            font_loader (FontLoader): Function returning the loaded font for (font, font_size)
+
+        Returns:
+            list[tuple]: (text_width, text_height) for each item, in the same order
+        """
+        dimensions = []
+        bboxes = self._bboxes
+        for text, font, font_size in items:
+            bbox = bboxes.get((text, font, font_size))
+            if bbox is None:
+                bbox = self.get_bbox(text, font, font_size, font_loader)
+            else:
+                self.hits += 1
+            dimensions.append((bbox[2], bbox[3]))
+        return dimensions
+
+    def clear(self) -> None:
+        """Remove all memoised measurements and reset the counters"""
+        with self._lock:
+            self._bboxes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict:
+        """Get memo statistics
+
+        Returns:
+            dict: hits, misses, size and max_size of the memo table
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._bboxes),
+            "max_size": self.max_size,
+        }
+
+
+### Shared by all Painter instances in this process
+text_measurer = TextMeasurer()
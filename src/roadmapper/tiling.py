@@ -0,0 +1,184 @@
+# MIT License
+
+# Copyright (c) 2022 CS Goh
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+
+from PIL import Image
+
+from .displaylist import DisplayList, SurfaceSize, intersects
+from .painter import Painter, PNGPainter
+
+### Square tiles of 1024 pixels take 4 MB each as RGBA
+DEFAULT_TILE_SIZE = 1024
+
+### Pixels painted above and left of each tile, and thrown away. Larger than the
+### diamonds, arrowheads and text that can cross a tile edge.
+TILE_MARGIN = 64
+
+
+def get_tiles(width: int, height: int, tile_size: int) -> list[tuple]:
+    """Split a surface into tiles, row by row
+
+    Args:
+        width (int): Surface width
+        height (int): Surface height
+        tile_size (int): Tile width and height. Tiles on the right and bottom edges may be smaller
+
+    Returns:
+        list[tuple]: (x1, y1, x2, y2) tiles
+    """
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in range(0, height, tile_size)
+        for x in range(0, width, tile_size)
+    ]
+
+
+class TileIndex:
+    """Grid index of display list items by the tiles their bounds overlap"""
+
+    def __init__(self, items: list, painter: Painter, tile_size: int):
+        """__init__ method
+
+        Args:
+            items (list): Display list items, in painting order
+            painter (Painter): Painter used to measure the bounds of text
+            tile_size (int): Width and height of the grid cells
+        """
+        self.items = items
+        self.tile_size = tile_size
+        self._bounds = [item.get_bounds(painter) for item in items]
+        self._cells = {}
+        ### Items painting the whole surface, eg. the background
+        self._unbounded = []
+        for index, bounds in enumerate(self._bounds):
+            if not all(math.isfinite(value) for value in bounds):
+                self._unbounded.append(index)
+            elif bounds[0] < bounds[2] and bounds[1] < bounds[3]:
+                for cell in self.__get_cells(bounds):
+                    self._cells.setdefault(cell, []).append(index)
+
+    def __get_cells(self, rect: tuple) -> list[tuple]:
+        """Get the grid cells a rectangle overlaps
+
+        Args:
+            rect (tuple): (x1, y1, x2, y2) rectangle
+
+        Returns:
+            list[tuple]: (column, row) cells. Cells left of or above the surface are left out
+        """
+        size = self.tile_size
+        columns = range(max(0, math.floor(rect[0] / size)), math.ceil(rect[2] / size))
+        rows = range(max(0, math.floor(rect[1] / size)), math.ceil(rect[3] / size))
+        return [(column, row) for row in rows for column in columns]
+
+    def query(self, rect: tuple) -> list:
+        """Get the items overlapping a rectangle
+
+        Args:
+            rect (tuple): (x1, y1, x2, y2) rectangle
+
+        Returns:
+            list: Display list items, in painting order
+        """
+        indexes = set(self._unbounded)
+        for cell in self.__get_cells(rect):
+            indexes.update(self._cells.get(cell, ()))
+        return [
+            self.items[index]
+            for index in sorted(indexes)
+            if intersects(self._bounds[index], rect)
+        ]
+
+
+def render_tile(items: list, tile: tuple) -> bytes:
+    """Paint display list items on a tile. Runs in the worker processes.
+
+    Args:
+        items (list): Display list items overlapping the tile, in painting order
+        tile (tuple): (x1, y1, x2, y2) tile on the surface
+
+    Returns:
+        bytes: RGBA pixels of the tile
+    """
+    x1, y1, x2, y2 = tile
+    ### Pillow truncates coordinates towards zero, so a coordinate that becomes
+    ### negative once translated would be rounded the other way than on the whole
+    ### surface. Painting a margin keeps the coordinates of the tile's pixels positive.
+    left = max(0, x1 - TILE_MARGIN)
+    top = max(0, y1 - TILE_MARGIN)
+    painter = PNGPainter(x2 - left, y2 - top)
+    for item in items:
+        item.translate(-left, -top).draw(painter)
+    return painter.image.crop((x1 - left, y1 - top, x2 - left, y2 - top)).tobytes()
+
+
+def render_tiled(
+    display_list: DisplayList,
+    painter: PNGPainter,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    max_workers: int = None,
+) -> PNGPainter:
+    """Replay a display list on a PNG painter tile by tile, across worker processes.
+    The pixels are the same as replaying the display list on the painter directly.
+
+    Each tile is painted from the items overlapping it, then pasted on the painter's
+    surface. Resizing the surface (SurfaceSize) is done after all tiles are pasted,
+    so only the part of the surface kept by the resize is painted.
+
+    Args:
+        display_list (DisplayList): Display list to replay
+        painter (PNGPainter): Output painter
+        tile_size (int, optional): Tile width and height. Defaults to 1024.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+                                     0 paints the tiles in the current process.
+
+    Returns:
+        PNGPainter: The painter
+    """
+    items = [item for item in display_list if not isinstance(item, SurfaceSize)]
+    surface_sizes = [item for item in display_list if isinstance(item, SurfaceSize)]
+
+    width, height = painter.image.size
+    for surface_size in surface_sizes:
+        width = min(width, surface_size.width)
+        height = min(height, surface_size.height + painter.bottom_margin)
+
+    index = TileIndex(items, painter, tile_size)
+    tiles = get_tiles(width, height, tile_size)
+    tile_items = [index.query(tile) for tile in tiles]
+
+    def paste(results) -> None:
+        for tile, pixels in zip(tiles, results):
+            size = (tile[2] - tile[0], tile[3] - tile[1])
+            painter.image.paste(Image.frombytes("RGBA", size, pixels), tile[:2])
+
+    if max_workers == 0 or len(tiles) <= 1:
+        paste(map(render_tile, tile_items, tiles))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            paste(executor.map(render_tile, tile_items, tiles))
+
+    for surface_size in surface_sizes:
+        surface_size.draw(painter)
+    return painter
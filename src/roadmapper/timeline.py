@@ -20,13 +20,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from dataclasses import dataclass, field
 import calendar
 
 from .painter import Painter
-from .timelineitem import TimelineItem
+from .timelineitem import (
+    VERTICAL_LINE_COLOUR,
+    VERTICAL_LINE_TRANSPARENCY,
+    TimelineItem,
+    get_timeline_period,
+    get_week_of_year,
+)
 from .timelineitemyear import TimelineYear
 from .timelinemode import TimelineMode
 from .timelinelocale import TimelineLocale
@@ -58,6 +65,9 @@ class Timeline:
     width: int = field(init=False, default=0)
     timeline_years: list[TimelineYear] = field(init=False, default_factory=list)
     timeline_items: list[TimelineItem] = field(init=False, default_factory=list)
+    item_starts: list[date] = field(init=False, default_factory=list)
+    item_ends: list[date] = field(init=False, default_factory=list)
+    is_item_index_sorted: bool = field(init=False, default=True)
 
     year_text_format: str = field(init=False)
     year_generic_text_format: str = field(init=False)
@@ -244,6 +254,9 @@ class Timeline:
 
         timelineitem_y = painter.next_y_pos
         timelineitem_height = painter.timeline_height
+        # --- FIX for #106 (Start) ---
+        previous_period = None
+        # --- FIX for #106 (End) ---
 
         for index in range(self.number_of_items):
             timelineitem_x = (
@@ -263,11 +276,22 @@ class Timeline:
             previous_end = timelineitem_end
             # --- FIX for #106 (End) ---
 
+            ### A week value repeated at the turn of the year moves to the following week (#106)
+            timelineitem_period = get_timeline_period(
+                self.mode,
+                timelineitem_value,
+                previous_period.start if previous_period else None,
+                previous_period.end if previous_period else None,
+            )
+            previous_period = timelineitem_period
+
             timelineitem = TimelineItem(
                 text=timelineitem_text,
                 value=timelineitem_value,
                 start=timelineitem_start,
                 end=timelineitem_end,
+                mode=self.mode,
+                period=timelineitem_period,
                 font=self.item_font,
                 font_size=self.item_font_size,
                 font_colour=self.item_font_colour,
@@ -284,11 +308,16 @@ class Timeline:
             self.timeline_items.append(timelineitem)
         painter.next_y_pos = timelineitem_y + timelineitem_height
 
+        self.__build_item_index()
+
+        if not Helper.is_enabled("timeline"):
+            return
+
         Helper.printc("Timeline Groups", show_level="timeline")
 
         for years in self.timeline_years:
             Helper.printc(
-                f"text='{years.text}', value={years.value}, {years.start}-{years.end}",
+                lambda: f"text='{years.text}', value={years.value}, {years.start}-{years.end}",
                 show_level="timeline",
             )
 
@@ -296,12 +325,90 @@ class Timeline:
 
         for item in self.timeline_items:
             Helper.printc(
-                f"text='{item.text}', value={item.value}, {item.start}-{item.end}",
+                lambda: f"text='{item.text}', value={item.value}, {item.start}-{item.end}",
                 show_level="timeline",
             )
 
+    def __build_item_index(self) -> None:
+        """Collect the precomputed period of every timeline item, so dates can be
+        mapped to timeline items with a binary search
+        """
+        self.item_starts = [item.period.start for item in self.timeline_items]
+        self.item_ends = [item.period.end for item in self.timeline_items]
+
+        ### Binary search needs both boundaries in ascending order
+        self.is_item_index_sorted = all(
+            self.item_starts[i] <= self.item_starts[i + 1]
+            and self.item_ends[i] <= self.item_ends[i + 1]
+            for i in range(len(self.item_starts) - 1)
+        )
+
+    def get_item_period(self, index: int) -> tuple[date, date]:
+        """Get the precomputed period of a timeline item
+
+        Args:
+            index (int): Index of the timeline item
+
+        Returns:
+            tuple[date, date]: Start and end period of the timeline item
+        """
+        return self.item_starts[index], self.item_ends[index]
+
+    def locate(self, this_date: date) -> int:
+        """Find the timeline item whose period contains a date
+
+        Args:
+            this_date (date): Date to locate
+
+        Returns:
+            int: Index of the last timeline item containing the date, or None if the date is outside the timeline
+        """
+        if self.is_item_index_sorted is False:
+            found = None
+            for index, (start, end) in enumerate(zip(self.item_starts, self.item_ends)):
+                if start <= this_date <= end:
+                    found = index
+            return found
+
+        ### Last item starting on or before the date
+        index = bisect_right(self.item_starts, this_date) - 1
+        if index >= 0 and this_date <= self.item_ends[index]:
+            return index
+        return None
+
+    def span(self, start: date, end: date) -> list[int]:
+        """Find the timeline items whose periods overlap a date range
+
+        Args:
+            start (date): Start of the date range
+            end (date): End of the date range
+
+        Returns:
+            list[int]: Indexes of the overlapping timeline items, in timeline order
+        """
+        if self.is_item_index_sorted is False:
+            return [
+                index
+                for index, (item_start, item_end) in enumerate(
+                    zip(self.item_starts, self.item_ends)
+                )
+                if item_start <= end and item_end >= start
+            ]
+
+        ### Items ending on or after the start, and starting on or before the end
+        first = bisect_left(self.item_ends, start)
+        last = bisect_right(self.item_starts, end)
+        return list(range(first, last))
+
     def __get_monday_from_calendar_week(self, year, calendar_week):
-        return datetime.strptime(f"{year}-{calendar_week}-1", "%Y-%W-%w").date()
+        ### Same as datetime.strptime(f"{year}-{calendar_week}-1", "%Y-%W-%w").date()
+        first_day_of_year = date(year, 1, 1)
+        first_weekday = first_day_of_year.weekday()
+        if calendar_week == 0:
+            days = -first_weekday
+        else:
+            days = (7 - first_weekday) % 7 + 7 * (calendar_week - 1)
+        return first_day_of_year + timedelta(days=days)
 
     def __get_timeline_item_text(self, index: int) -> str:
         """Get the text of the timeline item
@@ -319,7 +426,7 @@ class Timeline:
                     this_week = self.__find_first_day_of_week(
                         self.start
                     ) + relativedelta(weeks=+index)
-                    this_week_number = int(this_week.strftime("%W"))
+                    this_week_number = get_week_of_year(this_week)
 
                     timeline_text = self.week_generic_text_format.format(
                         this_week_number
@@ -329,12 +436,14 @@ class Timeline:
                         self.start
                     ) + relativedelta(weeks=+index)
 
-                    this_week_number = int(this_week.strftime("%W"))
+                    this_week_number = get_week_of_year(this_week)
                     first_day_of_week = self.__get_monday_from_calendar_week(
                         this_week.year, this_week_number
                     )
                     this_day = first_day_of_week.strftime("%d")
-                    this_month = first_day_of_week.strftime("%b")
+                    this_month = self.locale_settings.get_month_abbr(
+                        first_day_of_week.month
+                    )
                     timeline_text = self.week_text_format.format(this_day, this_month)
 
             else:
@@ -347,7 +456,9 @@ class Timeline:
         elif self.mode == TimelineMode.MONTHLY:
             if self.show_generic_dates is False:
                 this_month = self.start + relativedelta(months=+index)
-                timeline_text = self.month_text_format.format(this_month.strftime("%b"))
+                timeline_text = self.month_text_format.format(
+                    self.locale_settings.get_month_abbr(this_month.month)
+                )
             else:
                 this_month = index + 1
                 timeline_text = self.month_generic_text_format.format(this_month)
@@ -408,7 +519,7 @@ class Timeline:
             )
 
             year_value = 0
-            week_value = int(this_week.strftime("%W"))  # + 1
+            week_value = get_week_of_year(this_week)  # + 1
 
             # Helper.printc(
             #     f"before {index=}, {this_week=}, {year_value=} {week_value=}",
@@ -459,28 +570,15 @@ class Timeline:
         if self.mode == TimelineMode.WEEKLY:
             timeline_period = self.__get_timeline_item_value(index)
             ### timeline_period is in the format YYYYWW
-            this_year = timeline_period[0:4]  ### First 4 characters
-            this_week = timeline_period[4:]  ### Last 2 characters
-
-            timeline_start_period = datetime.strptime(
-                f"{this_year} {this_week} 1", "%G %V %u"
+            period = get_timeline_period(
+                self.mode,
+                timeline_period,
+                previous_start and previous_start.date(),
+                previous_end and previous_end.date(),
             )
-
-            timeline_end_period = datetime.strptime(
-                f"{this_year} {this_week} 7", "%G %V %u"
-            )
-
-            if (
-                timeline_start_period == previous_start
-                and timeline_end_period == previous_end
-            ):
-                this_week = int(this_week) + 1
-                timeline_start_period = datetime.strptime(
-                    f"{this_year} {this_week} 1", "%G %V %u"
-                )
-                timeline_end_period = datetime.strptime(
-                    f"{this_year} {this_week} 7", "%G %V %u"
-                )
+            ### Timeline items keep datetimes, the marker compares them with the current time
+            timeline_start_period = datetime.combine(period.start, datetime.min.time())
+            timeline_end_period = datetime.combine(period.end, datetime.min.time())
 
         elif self.mode == TimelineMode.MONTHLY:
             this_month = (self.start + relativedelta(months=+index)).month
@@ -547,7 +645,18 @@ class Timeline:
         Args:
             painter (Painter): Pillow wrapper class instance
         """
-        for i in range(self.number_of_items):
-            if i > 0:
-                timelineitem = self.timeline_items[i]
-                timelineitem.draw_vertical_line(painter)
+        ### One batch of lines per begin position; all items begin on the same row
+        lines = {}
+        for timelineitem in self.timeline_items[1 : self.number_of_items]:
+            x_pos, y_pos = timelineitem.get_vertical_line_start()
+            lines.setdefault(y_pos, []).append(x_pos)
+        for y_pos, xs in lines.items():
+            painter.draw_vertical_lines(
+                xs,
+                y_pos,
+                painter.next_y_pos + 10,
+                VERTICAL_LINE_COLOUR,
+                VERTICAL_LINE_TRANSPARENCY,
+                1,
+                "solid",
+            )
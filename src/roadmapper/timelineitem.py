@@ -22,11 +22,122 @@
 
 import calendar
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from .painter import Painter
 from .timelinemode import TimelineMode
 
+### Colour and transparency of the vertical lines drawn across the roadmap
+VERTICAL_LINE_COLOUR = "#e6e6e6"
+VERTICAL_LINE_TRANSPARENCY = 50
+
+
+@dataclass(frozen=True)
+class TimelinePeriod:
+    """Start and end date of a timeline item
+
+    Args:
+        start (date): First day of the period
+        end (date): Last day of the period
+        days (int): Number of days from the first to the last day of the period
+    """
+
+    start: date
+    end: date
+    days: int
+
+
+def get_week_start(year: int, week: int) -> date:
+    """Get the Monday of an ISO calendar week. Same as strptime(f"{year} {week} 1", "%G %V %u").date()
+
+    Args:
+        year (int): ISO year
+        week (int): ISO week number. Week 0 is the week before week 1
+
+    Returns:
+        date: Monday of the week
+    """
+    return date.fromisocalendar(year, 1, 1) + timedelta(weeks=week - 1)
+
+
+def get_week_of_year(this_date: date) -> int:
+    """Get the week number of a date, with Monday as the first day of the week. Same as int(this_date.strftime("%W"))
+
+    Args:
+        this_date (date): Date
+
+    Returns:
+        int: Week number, 0 for the days before the first Monday of the year
+    """
+    day_of_year = this_date.toordinal() - date(this_date.year, 1, 1).toordinal()
+    return (day_of_year + 7 - this_date.weekday()) // 7
+
+
+def get_timeline_period(
+    mode: TimelineMode, value: str, previous_start=None, previous_end=None
+) -> TimelinePeriod:
+    """Get the period of a timeline item value
+
+    Args:
+        mode (TimelineMode): Timeline mode
+        value (str): Timeline item value. Eg. "202312" for week 12 or December 2023
+        previous_start (date, optional): Start of the previous timeline item's period
+        previous_end (date, optional): End of the previous timeline item's period
+
+    Returns:
+        TimelinePeriod: Period of the timeline item
+    """
+    if mode == TimelineMode.WEEKLY:
+        this_year = int(value[:4])
+        this_week = int(value[4:])
+
+        # --- FIX for #106 (Start) ---
+        timeline_start_period = get_week_start(this_year, this_week)
+        timeline_end_period = timeline_start_period + timedelta(days=6)
+
+        if (
+            timeline_start_period == previous_start
+            and timeline_end_period == previous_end
+        ):
+            timeline_start_period = get_week_start(this_year, this_week + 1)
+            timeline_end_period = timeline_start_period + timedelta(days=6)
+        # --- FIX for #106 (End) ---
+
+    if mode == TimelineMode.MONTHLY:
+        this_year = int(value[:4])
+        this_month = int(value[4:])
+        _, month_end_day = calendar.monthrange(this_year, this_month)
+        timeline_start_period = date(this_year, this_month, 1)
+        timeline_end_period = date(this_year, this_month, month_end_day)
+
+    if mode == TimelineMode.QUARTERLY:
+        this_year = int(value[:4])
+        this_quarter = int(value[4:])
+        timeline_start_period = date(this_year, 3 * (this_quarter - 1) + 1, 1)
+        timeline_end_period = date(
+            this_year + 3 * this_quarter // 12, 3 * this_quarter % 12 + 1, 1
+        ) + timedelta(days=-1)
+
+    if mode == TimelineMode.HALF_YEARLY:
+        this_year = int(value[:4])
+        this_half = int(value[4:])
+        if this_half == 1:
+            timeline_start_period = date(this_year, 1, 1)
+            timeline_end_period = date(this_year, 6, 30)
+        elif this_half == 2:
+            timeline_start_period = date(this_year, 7, 1)
+            timeline_end_period = date(this_year, 12, 31)
+
+    if mode == TimelineMode.YEARLY:
+        timeline_start_period = date(int(value), 1, 1)
+        timeline_end_period = date(int(value), 12, 31)
+
+    return TimelinePeriod(
+        timeline_start_period,
+        timeline_end_period,
+        (timeline_end_period - timeline_start_period).days,
+    )
+
 
 @dataclass(kw_only=True)
 class TimelineItem:
@@ -36,11 +147,15 @@ class TimelineItem:
     value: str = field(init=True, default=None)
     start: datetime = field(init=True, default=None)
     end: datetime = field(init=True, default=None)
+    mode: TimelineMode = field(init=True, default=None)
+    period: TimelinePeriod = field(init=True, default=None)
     font: str = field(init=True, default=None)
     font_size: int = field(init=True, default=None)
     font_colour: str = field(init=True, default=None)
     fill_colour: str = field(init=True, default=None)
 
+    calendar_period: TimelinePeriod = field(init=False, default=None)
+    calendar_week: tuple = field(init=False, default=None)
     box_x: int = field(init=False, default=0)
     box_y: int = field(init=False, default=0)
     box_width: int = field(init=False, default=0)
@@ -48,6 +163,25 @@ class TimelineItem:
     text_x: int = field(init=False, default=0)
     text_y: int = field(init=False, default=0)
 
+    def __post_init__(self):
+        """Precompute the period boundaries so position queries are pure arithmetic
+
+        period is the period the item covers on the timeline, set by Timeline (see #106).
+        calendar_period is the calendar period of the item's value, used for positioning within the item.
+        """
+        if self.mode is not None and self.value is not None:
+            self.__set_calendar_period(self.mode)
+            if self.period is None:
+                self.period = self.calendar_period
+
+    def __set_calendar_period(self, mode: TimelineMode) -> None:
+        self.mode = mode
+        self.calendar_period = get_timeline_period(mode, self.value)
+        self.calendar_week = (
+            self.calendar_period.start.year,
+            get_week_of_year(self.calendar_period.start),
+        )
+
     def __calculate_text_draw_position(self, painter: Painter) -> tuple:
         """Calculate the text draw position based on the box position and size
 
@@ -107,202 +241,70 @@ class TimelineItem:
             mode (TimelineMode): Timeline mode
 
         Returns:
-            tuple(datetime, datetime): start datetime and end datetime of the timeline period
+            tuple(date, date): start date and end date of the timeline period
         """
+        if previous_start is None and previous_end is None:
+            if self.calendar_period is None or self.mode != mode:
+                self.__set_calendar_period(mode)
+            return self.calendar_period.start, self.calendar_period.end
 
-        if mode == TimelineMode.WEEKLY:
-            this_year = self.value[:4]
-            this_week = self.value[4:]
-
-            # --- FIX for #106 (Start) ---
-            timeline_start_period = datetime.strptime(
-                f"{this_year} {this_week} 1", "%G %V %u"
-            )
-            timeline_end_period = datetime.strptime(
-                f"{this_year} {this_week} 7", "%G %V %u"
-            )
-
-            if (
-                timeline_start_period == previous_start
-                and timeline_end_period == previous_end
-            ):
-                this_week = int(this_week) + 1
-                timeline_start_period = datetime.strptime(
-                    f"{this_year} {this_week} 1", "%G %V %u"
-                )
-                timeline_end_period = datetime.strptime(
-                    f"{this_year} {this_week} 7", "%G %V %u"
-                )
-            # --- FIX for #106 (End) ---
-
-        if mode == TimelineMode.MONTHLY:
-
-            this_year = int(self.value[:4])
-            this_month = int(self.value[4:])
-            _, month_end_day = calendar.monthrange(this_year, this_month)
-            timeline_start_period = datetime(this_year, this_month, 1)
-            timeline_end_period = datetime(this_year, this_month, month_end_day)
-
-        if mode == TimelineMode.QUARTERLY:
-            this_year = int(self.value[:4])
-            this_quarter = int(self.value[4:])
-            if this_quarter == 1:
-                this_month = 1
-            elif this_quarter == 2:
-                this_month = 4
-            elif this_quarter == 3:
-                this_month = 7
-            elif this_quarter == 4:
-                this_month = 10
-
-            timeline_start_period = datetime(
-                this_year, 3 * ((this_month - 1) // 3) + 1, 1
-            )
-            timeline_end_period = datetime(
-                this_year + 3 * this_quarter // 12, 3 * this_quarter % 12 + 1, 1
-            ) + timedelta(days=-1)
-
-        if mode == TimelineMode.HALF_YEARLY:
-            this_year = int(self.value[:4])
-            this_half = int(self.value[4:])
-            if this_half == 1:
-                timeline_start_period = datetime(this_year, 1, 1)
-                timeline_end_period = datetime(this_year, 6, 30)
-            elif this_half == 2:
-                timeline_start_period = datetime(this_year, 7, 1)
-                timeline_end_period = datetime(this_year, 12, 31)
-
-        if mode == TimelineMode.YEARLY:
-            timeline_start_period = datetime(int(self.value), 1, 1)
-            timeline_end_period = datetime(int(self.value), 12, 31)
-
-        return timeline_start_period, timeline_end_period
+        period = get_timeline_period(mode, self.value, previous_start, previous_end)
+        return period.start, period.end
 
     def get_timeline_pos_percentage(
-        self, mode: TimelineMode, task_or_milestone_date: datetime
+        self, mode: TimelineMode, task_or_milestone_date: date
     ) -> float:
         """Get the timeline position percentage based on the task or milestone date
 
         Args:
             mode (TimelineMode): Timeline mode
-            task_or_milestone_date (datetime): Task or milestone date
+            task_or_milestone_date (date): Task or milestone date
 
         Returns:
             float: Timeline position percentage
         """
+        if self.calendar_period is None or self.mode != mode:
+            self.__set_calendar_period(mode)
+        period = self.calendar_period
+
         correct_timeline = False
         pos_percentage = 0
-        timeline_start_period, timeline_end_period = self.get_timeline_period(
-            mode, None, None
-        )
 
         if mode == TimelineMode.WEEKLY:
             pos_percentage = task_or_milestone_date.weekday() / 7
-            milestone_period = (
-                f"{task_or_milestone_date.year}{task_or_milestone_date.strftime('%W')}"
-            )
-            this_period = (
-                f"{timeline_start_period.year}{timeline_start_period.strftime('%W')}"
+            milestone_week = (
+                task_or_milestone_date.year,
+                get_week_of_year(task_or_milestone_date),
             )
-            if milestone_period == this_period:
+            if milestone_week == self.calendar_week:
                 correct_timeline = True
 
         if mode == TimelineMode.MONTHLY:
-            _, last_day = calendar.monthrange(
-                timeline_start_period.year, timeline_start_period.month
-            )
-            pos_percentage = round(task_or_milestone_date.day / last_day, 1)
+            pos_percentage = round(task_or_milestone_date.day / period.end.day, 1)
             if (
-                task_or_milestone_date.year == timeline_start_period.year
-                and task_or_milestone_date.month == timeline_start_period.month
+                task_or_milestone_date.year == period.start.year
+                and task_or_milestone_date.month == period.start.month
             ):
                 correct_timeline = True
 
-        if mode == TimelineMode.QUARTERLY:
-            this_period = self.value
-            this_year = int(this_period[:4])
-            int(this_period[4:])
-
-            if this_period[-1] == "1":
-                date_of_first_day_of_quarter = datetime(this_year, 1, 1)
-                date_of_last_day_of_quarter = datetime(
-                    this_year, 3, calendar.monthrange(this_year, 3)[1]
-                )
-
-            elif this_period[-1] == "2":
-                date_of_first_day_of_quarter = datetime(this_year, 4, 1)
-                date_of_last_day_of_quarter = datetime(
-                    this_year, 6, calendar.monthrange(this_year, 6)[1]
-                )
-
-            elif this_period[-1] == "3":
-                date_of_first_day_of_quarter = datetime(this_year, 7, 1)
-                date_of_last_day_of_quarter = datetime(
-                    this_year, 9, calendar.monthrange(this_year, 9)[1]
-                )
-
-            elif this_period[-1] == "4":
-                date_of_first_day_of_quarter = datetime(this_year, 10, 1)
-                date_of_last_day_of_quarter = datetime(
-                    this_year, 12, calendar.monthrange(this_year, 12)[1]
-                )
-
-            days_in_quarter = (
-                date_of_last_day_of_quarter - date_of_first_day_of_quarter
-            ).days
-            days_progress_in_quarter = (
-                days_in_quarter
-                - (date_of_last_day_of_quarter - task_or_milestone_date).days
+        if mode in (
+            TimelineMode.QUARTERLY,
+            TimelineMode.HALF_YEARLY,
+            TimelineMode.YEARLY,
+        ):
+            ### Days elapsed since the first day of the period, over the days in the period
+            days_progress_in_period = (
+                period.days - (period.end - task_or_milestone_date).days
             )
-            pos_percentage = days_progress_in_quarter / days_in_quarter
-
-            milestone_period = f"{task_or_milestone_date.year}{self.__get_quarter_from_date(task_or_milestone_date)}"
-            if milestone_period == this_period:
-                correct_timeline = True
-
-        if mode == TimelineMode.HALF_YEARLY:
-            this_period = self.value
-            this_year = int(this_period[:4])
-
-            if this_period[-1] == "1":
-                date_of_first_day_of_halfyear = datetime(this_year, 1, 1)
-                date_of_last_day_of_halfyear = datetime(
-                    this_year, 6, calendar.monthrange(this_year, 6)[1]
-                )
+            pos_percentage = days_progress_in_period / period.days
 
+            if mode == TimelineMode.QUARTERLY:
+                milestone_period = f"{task_or_milestone_date.year}{self.__get_quarter_from_date(task_or_milestone_date)}"
+            elif mode == TimelineMode.HALF_YEARLY:
+                milestone_period = f"{task_or_milestone_date.year}{self.__get_halfyear_from_date(task_or_milestone_date)}"
             else:
-                date_of_first_day_of_halfyear = datetime(this_year, 7, 1)
-                date_of_last_day_of_halfyear = datetime(
-                    this_year, 12, calendar.monthrange(this_year, 12)[1]
-                )
-            ### calc number of days between first day of quarter and last day of quarter
-            days_in_halfyear = (
-                date_of_last_day_of_halfyear - date_of_first_day_of_halfyear
-            ).days
-            days_progress_in_halfyear = (
-                days_in_halfyear
-                - (date_of_last_day_of_halfyear - task_or_milestone_date).days
-            )
-            pos_percentage = days_progress_in_halfyear / days_in_halfyear
-            milestone_period = f"{task_or_milestone_date.year}{self.__get_halfyear_from_date(task_or_milestone_date)}"
-            if milestone_period == this_period:
-                correct_timeline = True
-
-        if mode == TimelineMode.YEARLY:
-            this_period = self.value
-            this_year = int(this_period[:4])
-            date_of_first_day_of_year = datetime(this_year, 1, 1)
-            date_of_last_day_of_year = datetime(
-                this_year, 12, calendar.monthrange(this_year, 12)[1]
-            )
-            ### calc number of days between first day of quarter and last day of quarter
-            days_in_year = (date_of_last_day_of_year - date_of_first_day_of_year).days
-            days_progress_in_year = (
-                days_in_year - (date_of_last_day_of_year - task_or_milestone_date).days
-            )
-            pos_percentage = days_progress_in_year / days_in_year
-            milestone_period = f"{task_or_milestone_date.year}"
-            if milestone_period == this_period:
+                milestone_period = f"{task_or_milestone_date.year}"
+            if milestone_period == self.value:
                 correct_timeline = True
 
         return (correct_timeline, pos_percentage)
@@ -349,20 +351,28 @@ class TimelineItem:
             self.font_colour,
         )
 
+    def get_vertical_line_start(self) -> tuple:
+        """Get where the item's vertical line on the roadmap begins
+
+        Returns:
+            (x (float), y (float)): Line begin position, on the left of the item
+        """
+        return self.box_x - 1, self.box_y + self.box_height
+
     def draw_vertical_line(self, painter: Painter) -> None:
         """Draws the timeline
 
         Args:
             painter (Painter): Pillow wrapper class instance
         """
-        x_pos = self.box_x - 1
+        x_pos, y_pos = self.get_vertical_line_start()
         painter.draw_line(
             x_pos,
-            self.box_y + self.box_height,
+            y_pos,
             x_pos,
             painter.next_y_pos + 10,
-            "#e6e6e6",
-            50,
+            VERTICAL_LINE_COLOUR,
+            VERTICAL_LINE_TRANSPARENCY,
             1,
             "solid",
         )
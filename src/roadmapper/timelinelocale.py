@@ -21,9 +21,11 @@
 # SOFTWARE.
 
 from dataclasses import dataclass
+from datetime import date
 import json
 import os
 import locale
+from threading import Lock
 
 default_timeline_locale_settings = {
     "locale": "en_US",
@@ -75,12 +77,188 @@ TimelineLocaleSettings = [
 ]
 
 
+@dataclass(frozen=True)
+class LocaleNames:
+    """Month and weekday names of a locale
+
+    Args:
+        month_abbr (tuple[str]): Abbreviated month names, January first. Same as strftime("%b")
+        month_name (tuple[str]): Full month names, January first. Same as strftime("%B")
+        day_abbr (tuple[str]): Abbreviated weekday names, Monday first. Same as strftime("%a")
+        day_name (tuple[str]): Full weekday names, Monday first. Same as strftime("%A")
+    """
+
+    month_abbr: tuple
+    month_name: tuple
+    day_abbr: tuple
+    day_name: tuple
+
+    def __post_init__(self):
+        for field_name, count in (
+            ("month_abbr", 12),
+            ("month_name", 12),
+            ("day_abbr", 7),
+            ("day_name", 7),
+        ):
+            names = tuple(getattr(self, field_name))
+            if len(names) != count:
+                raise ValueError(
+                    f'Invalid locale names "{field_name}".'
+                    f" Expected {count} names, got {len(names)}"
+                )
+            object.__setattr__(self, field_name, names)
+
+
+ENGLISH_NAMES = LocaleNames(
+    month_abbr=tuple("Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split()),
+    month_name=tuple(
+        "January February March April May June July August September October"
+        " November December".split()
+    ),
+    day_abbr=tuple("Mon Tue Wed Thu Fri Sat Sun".split()),
+    day_name=tuple("Monday Tuesday Wednesday Thursday Friday Saturday Sunday".split()),
+)
+
+### Names of the locales with built-in or shipped timeline settings, as formatted by
+### the GNU C library. Keyed by language and territory, without the encoding
+bundled_locale_names = {
+    "C": ENGLISH_NAMES,
+    "POSIX": ENGLISH_NAMES,
+    "en_US": ENGLISH_NAMES,
+    "de_DE": LocaleNames(
+        month_abbr=tuple("Jan Feb Mär Apr Mai Jun Jul Aug Sep Okt Nov Dez".split()),
+        month_name=tuple(
+            "Januar Februar März April Mai Juni Juli August September Oktober"
+            " November Dezember".split()
+        ),
+        day_abbr=tuple("Mo Di Mi Do Fr Sa So".split()),
+        day_name=tuple(
+            "Montag Dienstag Mittwoch Donnerstag Freitag Samstag Sonntag".split()
+        ),
+    ),
+    "ja_JP": LocaleNames(
+        month_abbr=tuple(f"{month:2}月" for month in range(1, 13)),
+        month_name=tuple(f"{month}月" for month in range(1, 13)),
+        day_abbr=tuple("月火水木金土日"),
+        day_name=tuple(f"{day}曜日" for day in "月火水木金土日"),
+    ),
+    "ko_KR": LocaleNames(
+        month_abbr=tuple(f"{month:2}월" for month in range(1, 13)),
+        month_name=tuple(f"{month}월" for month in range(1, 13)),
+        day_abbr=tuple("월화수목금토일"),
+        day_name=tuple(f"{day}요일" for day in "월화수목금토일"),
+    ),
+    "zh_TW": LocaleNames(
+        month_abbr=tuple(f"{month:2}月" for month in range(1, 13)),
+        month_name=tuple(
+            f"{number}月" for number in "一 二 三 四 五 六 七 八 九 十 十一 十二".split()
+        ),
+        day_abbr=tuple("一二三四五六日"),
+        day_name=tuple(f"週{day}" for day in "一二三四五六日"),
+    ),
+}
+
+### Locale name -> LocaleNames, loaded once per process
+locale_names = {}
+_locale_names_lock = Lock()
+
+
+def get_bundled_locale_names(locale_name: str) -> LocaleNames:
+    """Get the bundled month and weekday names of a locale, without switching the process locale
+
+    Args:
+        locale_name (str): Locale. Eg. "ja_JP.UTF-8". "" is the locale of the environment
+
+    Returns:
+        LocaleNames: Month and weekday names, or None if none are bundled for the locale
+    """
+    if locale_name == "":
+        ### Same precedence as setlocale(LC_TIME, "")
+        locale_name = next(
+            (
+                os.environ[variable]
+                for variable in ("LC_ALL", "LC_TIME", "LANG")
+                if os.environ.get(variable)
+            ),
+            "C",
+        )
+    return bundled_locale_names.get(locale_name.split(".")[0].split("@")[0])
+
+
+def read_locale_names(locale_name: str) -> LocaleNames:
+    """Read the month and weekday names of a locale from the C library
+
+    This switches the locale of the whole process and switches it back, so other threads
+    doing locale-dependent work meanwhile are affected. Use get_locale_names() instead.
+
+    Args:
+        locale_name (str): Locale. Eg. "ja_JP.UTF-8". "" is the locale of the environment.
+                           Raises locale.Error if the locale is not installed
+
+    Returns:
+        LocaleNames: Month and weekday names
+    """
+    previous_locale = locale.setlocale(locale.LC_ALL)
+    try:
+        locale.setlocale(locale.LC_ALL, locale_name)
+        ### 2001-01-01 is a Monday
+        months = [date(2001, month, 1) for month in range(1, 13)]
+        days = [date(2001, 1, day) for day in range(1, 8)]
+        return LocaleNames(
+            month_abbr=tuple(d.strftime("%b") for d in months),
+            month_name=tuple(d.strftime("%B") for d in months),
+            day_abbr=tuple(d.strftime("%a") for d in days),
+            day_name=tuple(d.strftime("%A") for d in days),
+        )
+    finally:
+        locale.setlocale(locale.LC_ALL, previous_locale)
+
+
+def get_locale_names(locale_name: str) -> LocaleNames:
+    """Get the month and weekday names of a locale
+
+    The names of the locales in bundled_locale_names are used as they are. Other locales
+    are read from the C library once, by switching the process locale under a lock and
+    switching it back. Rendering only looks names up in the loaded tables, so roadmaps in
+    different locales can be rendered in parallel threads.
+
+    Args:
+        locale_name (str): Locale. Eg. "ja_JP.UTF-8". "" is the locale of the environment.
+                           Raises locale.Error if the locale is neither bundled nor installed
+
+    Returns:
+        LocaleNames: Month and weekday names
+    """
+    names = locale_names.get(locale_name)
+    if names is not None:
+        return names
+
+    names = get_bundled_locale_names(locale_name)
+    if names is not None:
+        locale_names[locale_name] = names
+        return names
+
+    with _locale_names_lock:
+        names = locale_names.get(locale_name)
+        if names is None:
+            names = read_locale_names(locale_name)
+            locale_names[locale_name] = names
+    return names
+
+
 @dataclass
 class TimelineLocale:
     """Timeline locale for the Roadmapper."""
 
     def __init__(self, locale_name: str) -> None:
-        """Initialise the locale settings."""
+        """Initialise the locale settings.
+
+        A locale settings file may include the month and weekday names of the locale,
+        as a "names" object with the fields of LocaleNames. Otherwise they come from
+        get_locale_names(): bundled for the shipped locales, else read from the C library.
+        """
+        self._settings = None
+        names = None
 
         # check if colour_theme_name is a json file
         if locale_name.endswith(".json"):
@@ -92,9 +270,23 @@ class TimelineLocale:
             if "locale" not in timeline_locale_json:
                 raise ValueError(f"Locale {locale_name} not recognised.")
             locale_name = timeline_locale_json["locale"]
-            TimelineLocaleSettings.append(timeline_locale_json)
+            ### Kept on the instance, so that roadmaps do not share their settings files
+            self._settings = timeline_locale_json.get("settings")
+            if "names" in timeline_locale_json:
+                names = LocaleNames(**timeline_locale_json["names"])
         self._timeline_locale_name = locale_name
-        locale.setlocale(locale.LC_ALL, locale_name)
+        self.names = names if names is not None else get_locale_names(locale_name)
+
+    def get_month_abbr(self, month: int) -> str:
+        """Get the abbreviated name of a month. Same as strftime("%b") in the locale
+
+        Args:
+            month (int): Month, 1 to 12
+
+        Returns:
+            str: Abbreviated month name
+        """
+        return self.names.month_abbr[month - 1]
 
     def get_timeline_locale_settings(self, timeline_mode: str) -> tuple:
         """ "Get the timeline locale settings for the specified timeline mode.
@@ -106,12 +298,13 @@ class TimelineLocale:
         Returns:
             tuple: Tuple of the display settings for the specified timeline mode component.
         """
-        locale_settings = None
+        locale_settings = self._settings
 
-        for value in TimelineLocaleSettings:
-            if value["locale"] == self._timeline_locale_name:
-                locale_settings = value["settings"]
-                break
+        if locale_settings is None:
+            for value in TimelineLocaleSettings:
+                if value["locale"] == self._timeline_locale_name:
+                    locale_settings = value["settings"]
+                    break
 
         ### get the colour scheme for the specified roadmap component
         ### values() returns a list of dictionaries, convert it to tuple. e.g. {1, 2} -> (1, 2)
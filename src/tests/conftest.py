@@ -1,5 +1,31 @@
+import os
+import shutil
+import tempfile
+
 import pytest
 
+from src.roadmapper.roadmap import Roadmap
+from src.roadmapper.timelinemode import TimelineMode
+
+LOGO = os.path.join(
+    os.path.dirname(__file__), "..", "..", "images", "logo", "matariki-tech-logo.png"
+)
+
+
+def pytest_configure(config):
+    """
+    This hook keeps the font index of the tests out of the user cache directory.
+    It runs before collection, as some test modules draw roadmaps when imported,
+    and worker processes inherit the environment variable.
+    """
+    index_dir = tempfile.mkdtemp(prefix="roadmapper-font-index-")
+    config.font_index_dir = index_dir
+    os.environ["ROADMAPPER_FONT_INDEX"] = os.path.join(index_dir, "font-index.json")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.font_index_dir, ignore_errors=True)
+
 
 @pytest.fixture(autouse=True)
 def change_test_dir(request, monkeypatch):
@@ -32,3 +58,53 @@ def operating_system_windows():
     This fixture can be used as test argument to provide string of used OS `Windows`.
     """
     return "Windows"
+
+
+@pytest.fixture
+def roadmap_factory():
+    """
+    This fixture provides a function that builds a small roadmap, monthly by default.
+    Sizes and extra Roadmap arguments are passed through as keyword arguments;
+    groups, tasks, parallel, footer and logo add more content to paint.
+    """
+
+    def make_roadmap(
+        width: int = 800,
+        height: int = 600,
+        title: str = "Roadmap",
+        mode: TimelineMode = TimelineMode.MONTHLY,
+        start: str = "2023-01-01",
+        number_of_items: int = 6,
+        groups: int = 1,
+        tasks: int = 1,
+        parallel: bool = False,
+        footer: bool = False,
+        logo: bool = False,
+        **kwargs,
+    ) -> Roadmap:
+        roadmap = Roadmap(width, height, **kwargs)
+        roadmap.set_title(title)
+        roadmap.set_timeline(mode, start=start, number_of_items=number_of_items)
+        for group_index in range(groups):
+            group = roadmap.add_group(f"Group {group_index}")
+            for task_index in range(tasks):
+                task = group.add_task(
+                    f"Task {group_index}.{task_index}",
+                    f"2023-0{task_index + 1}-15",
+                    f"2023-0{task_index + 4}-20",
+                    style="arrowhead" if task_index == 2 else "rectangle",
+                )
+                task.add_milestone("Milestone", "2023-03-01")
+                if parallel:
+                    task.add_parallel_task(
+                        "Parallel",
+                        f"2023-0{task_index + 5}-01",
+                        f"2023-0{task_index + 5}-25",
+                    )
+        if footer:
+            roadmap.set_footer("Footer")
+        if logo:
+            roadmap.add_logo(LOGO, position="bottom-right", width=50, height=50)
+        return roadmap
+
+    return make_roadmap
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from src.roadmapper.batch import BatchJob, render_batch
+
+
+def get_job(tmp_path, name, title="Batch"):
+    spec = {
+        "title": {"text": title},
+        "timeline": {"mode": "MONTHLY", "start": "2023-01-01", "number_of_items": 6},
+        "groups": [
+            {
+                "text": "Group",
+                "tasks": [{"text": "Task", "start": "2023-01-15", "end": "2023-04-20"}],
+            }
+        ],
+    }
+    filenames = [str(tmp_path / f"{name}.png"), str(tmp_path / f"{name}.svg")]
+    return BatchJob(spec=spec, filenames=filenames)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_render_batch(tmp_path, max_workers):
+    jobs = [get_job(tmp_path, f"roadmap{i}") for i in range(3)]
+    jobs.insert(1, BatchJob(spec={"timeline": {}}, filenames=[str(tmp_path / "bad.png")]))
+
+    results = render_batch(jobs, max_workers=max_workers, max_tasks_per_child=2)
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert results[1].ok is False
+    assert not os.path.exists(tmp_path / "bad.png")
+    for result in results[:1] + results[2:]:
+        assert result.ok, result.error
+        assert result.render_ms > 0
+        for filename in result.filenames:
+            assert os.path.getsize(filename) > 0
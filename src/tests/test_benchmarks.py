@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from src.benchmarks.generators import BenchmarkCase, generate_spec
+from src.benchmarks.run import compare, run_suite
+from src.roadmapper.spec import build_roadmap
+
+
+@pytest.mark.unit
+class TestBenchmarks:
+    def test_generated_roadmap_has_case_shape(self):
+        case = BenchmarkCase(
+            "shape", groups=2, tasks_per_group=3, parallel_tasks=2, milestones=2
+        )
+        spec = generate_spec(case)
+
+        assert len(spec["groups"]) == 2
+        for group in spec["groups"]:
+            assert len(group["tasks"]) == 3
+            for task in group["tasks"]:
+                assert len(task["parallel_tasks"]) == 2
+                assert len(task["milestones"]) == 2
+                for parallel_task in task["parallel_tasks"]:
+                    assert parallel_task["start"] > task["end"]
+        build_roadmap(spec)
+        assert generate_spec(case) == generate_spec(case)
+
+    def test_results_are_stable_json(self):
+        case = BenchmarkCase("tiny", groups=1, tasks_per_group=1)
+        results = run_suite([case], repeat=1)
+        assert json.loads(json.dumps(results, sort_keys=True)) == results
+
+        (result,) = results["cases"]
+        assert result["name"] == "tiny"
+        assert result["primitives"] > 0
+        assert result["output_bytes"]["png"] > 0
+        assert result["output_bytes"]["svg"] > 0
+        assert result["peak_memory_bytes"] > 0
+        assert result["layout_ms"]["min"] <= result["layout_ms"]["median"]
+
+        rows = compare(results, results)
+        assert all(ratio == 1 for _, _, before, _, ratio in rows if before)
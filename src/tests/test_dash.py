@@ -0,0 +1,97 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from src.roadmapper import painter as painter_module
+from src.roadmapper.displaylist import DisplayListPainter
+from src.roadmapper.painter import PNGPainter, SVGPainter
+
+
+def draw_each_segment(
+    segments: list, width: int, height: int, line_width: int, fill: tuple
+):
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for segment in segments:
+        draw.line(segment, width=line_width, fill=fill)
+    return image
+
+
+@pytest.mark.unit
+class TestDash:
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    @pytest.mark.parametrize(
+        "x, y1, y2, line_width, line_style",
+        [
+            (50, 10, 290, 1, "dashed"),
+            (50.5, 13.25, 301.7, 2, "dashed"),
+            (0.75, -20, 250, 3, "dashed"),
+            (99, 100, 90, 2, "dashed"),
+            ### The last dash is shorter than a pixel
+            (50, 20, 128.06, 3, (6, 3)),
+            (50, 20, 128.06, 1, (6, 3)),
+        ],
+    )
+    def test_vertical_dashes_match_per_segment_drawing(
+        self, monkeypatch, use_numpy, x, y1, y2, line_width, line_style
+    ):
+        if not use_numpy:
+            monkeypatch.setattr(painter_module, "np", None)
+        painter = PNGPainter(100, 300)
+        painter.draw_line(x, y1, x, y2, "red", 0.9, line_width, line_style)
+
+        dash = line_style if isinstance(line_style, tuple) else None
+        segments = painter.get_dash_segments(x, y1, x, y2, dash)
+        expected = draw_each_segment(segments, 100, 300, line_width, (255, 0, 0, 229))
+        assert painter.image.tobytes() == expected.tobytes()
+
+    def test_dash_pattern(self):
+        painter = PNGPainter(10, 10)
+        assert painter.get_dash_segments(0, 0, 0, 20, (6, 3)) == [
+            (0, 0, 0, 6),
+            (0, 9, 0, 15),
+            (0, 18, 0, 20),
+        ]
+        ### Odd patterns repeat like an SVG dasharray: 5 on, 5 off
+        assert painter.get_dash_segments(0, 0, 12, 0, (5,)) == [
+            (0, 0, 5, 0),
+            (10, 0, 12, 0),
+        ]
+
+    def test_diagonal_dashes(self):
+        painter = PNGPainter(100, 100)
+        painter.draw_line(0, 0, 90, 90, "red", 1, 1, (4, 4))
+        segments = painter.get_dash_segments(0, 0, 90, 90, (4, 4))
+        assert painter.image.tobytes() == draw_each_segment(
+            segments, 100, 100, 1, (255, 0, 0, 255)
+        ).tobytes()
+
+    def test_line_style_is_recorded_and_replayed(self):
+        recorder = DisplayListPainter(100, 100)
+        recorder.set_line_style((6, 3))
+        recorder.draw_line(10, 0, 10, 90, "red", 1, 1, "dashed")
+        assert recorder.display_list.items[-1].style == (6, 3)
+
+        svg = recorder.display_list.replay(SVGPainter(100, 100))
+        assert len(svg.elements) == 10
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    @pytest.mark.parametrize("line_style", ["solid", "dashed", (6, 3)])
+    @pytest.mark.parametrize("line_width", [1, 3])
+    def test_vertical_lines_match_line_by_line_drawing(
+        self, monkeypatch, use_numpy, line_style, line_width
+    ):
+        if not use_numpy:
+            monkeypatch.setattr(painter_module, "np", None)
+        xs = [10, 30.5, 31.75, 99]
+        batched = PNGPainter(100, 300)
+        batched.draw_vertical_lines(xs, 20.5, 280, "red", 0.9, line_width, line_style)
+        direct = PNGPainter(100, 300)
+        for x in xs:
+            direct.draw_line(x, 20.5, x, 280, "red", 0.9, line_width, line_style)
+        assert batched.image.tobytes() == direct.image.tobytes()
+
+    def test_vertical_lines_are_one_svg_path(self):
+        painter = SVGPainter(100, 100)
+        painter.draw_vertical_lines([10, 20, 30], 0, 90, "red", 1, 1)
+        assert len(painter.elements) == 1
+        assert painter.elements[0].args["d"] == "M10,0 V90 M20,0 V90 M30,0 V90"
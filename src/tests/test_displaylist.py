@@ -0,0 +1,87 @@
+import pytest
+
+from src.roadmapper.displaylist import (
+    Background,
+    DisplayListPainter,
+    Rect,
+    SurfaceSize,
+    TextRun,
+    VerticalLines,
+)
+from src.roadmapper.painter import PNGPainter, SVGPainter
+
+
+def get_png_bytes(painter, tmp_path, name):
+    filename = str(tmp_path / name)
+    painter.save_surface(filename)
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.unit
+class TestDisplayList:
+    def test_box_with_text_is_recorded_as_primitives(self):
+        painter = DisplayListPainter(200, 100)
+        painter.draw_box_with_text(
+            10, 10, 150, 40, "Blue", "Hello", "centre", "Arial", 12, "White"
+        )
+        items = list(painter.display_list)
+        assert isinstance(items[0], Rect)
+        assert isinstance(items[1], TextRun)
+        assert items[1].in_box is True
+        assert items[1].text == "Hello"
+
+    def test_draw_records_in_painting_order(self, roadmap_factory):
+        roadmap = roadmap_factory()
+        roadmap.draw()
+        items = roadmap.display_list.items
+        assert isinstance(items[0], Background)
+        assert isinstance(items[-1], SurfaceSize)
+        ### The timeline grid is recorded as one batch of lines
+        grids = [item for item in items if isinstance(item, VerticalLines)]
+        assert len(grids) == 1
+        assert len(grids[0].xs) > 1
+
+    def test_replay_matches_direct_drawing(self, tmp_path):
+        recorder = DisplayListPainter(200, 100)
+        direct = PNGPainter(200, 100)
+        for painter in (recorder, direct):
+            painter.background_colour = "White"
+            painter.set_background_colour()
+            painter.draw_box_with_text(
+                10, 10, 150, 40, "Blue", "Hello World", "left", "Arial", 12, "White"
+            )
+            painter.draw_line(20, 0, 20, 100, "Black", 0.5, 1, "dashed")
+            painter.set_surface_size(200, 60)
+
+        replayed = recorder.display_list.replay(PNGPainter(200, 100))
+        assert get_png_bytes(replayed, tmp_path, "a.png") == get_png_bytes(
+            direct, tmp_path, "b.png"
+        )
+
+    def test_replay_to_several_painters(self, roadmap_factory, tmp_path):
+        roadmap = roadmap_factory(title="Display List")
+        roadmap.draw()
+        svg_painter = roadmap.replay("svg")
+        assert isinstance(svg_painter, SVGPainter)
+        filename = str(tmp_path / "roadmap.svg")
+        svg_painter.save_surface(filename)
+        with open(filename, "r", encoding="utf8") as f:
+            assert "Display List" in f.read()
+
+    def test_render_lays_out_once(self, roadmap_factory, tmp_path):
+        roadmap = roadmap_factory()
+        painters = roadmap.render(["png", "svg"])
+        assert isinstance(painters["png"], PNGPainter)
+        assert isinstance(painters["svg"], SVGPainter)
+
+        item_count = len(roadmap.display_list)
+        roadmap.render(["svg"])
+        assert len(roadmap.display_list) == item_count
+
+        roadmap.save(str(tmp_path / "roadmap.png"))
+        roadmap.save(str(tmp_path / "roadmap.svg"))
+        with open(tmp_path / "roadmap.png", "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+        with open(tmp_path / "roadmap.svg", "r", encoding="utf8") as f:
+            assert f.read().lstrip().startswith("<?xml")
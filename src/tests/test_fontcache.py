@@ -0,0 +1,49 @@
+import pytest
+
+from src.roadmapper.fontcache import FontCache
+from src.roadmapper.painter import PNGPainter, SVGPainter
+
+
+@pytest.fixture(scope="function")
+def font_path():
+    return PNGPainter(100, 100).get_font_path("Arial")
+
+
+@pytest.mark.unit
+class TestFontCache:
+    def test_font_is_loaded_once(self, font_path):
+        cache = FontCache()
+        first = cache.get_font(font_path, 12)
+        second = cache.get_font(font_path, 12)
+        assert first is second
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_key_includes_size(self, font_path):
+        cache = FontCache()
+        assert cache.get_font(font_path, 12) is not cache.get_font(font_path, 14)
+        assert len(cache) == 2
+
+    def test_least_recently_used_font_is_evicted(self, font_path):
+        cache = FontCache(max_size=2)
+        font_10 = cache.get_font(font_path, 10)
+        cache.get_font(font_path, 11)
+        cache.get_font(font_path, 10)
+        cache.get_font(font_path, 12)
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_font(font_path, 10) is font_10
+        assert cache.get_stats()["misses"] == 3
+
+    def test_set_max_size_evicts(self, font_path):
+        cache = FontCache()
+        for size in range(10, 15):
+            cache.get_font(font_path, size)
+        cache.set_max_size(2)
+        assert len(cache) == 2
+        assert cache.get_stats()["evictions"] == 3
+
+    def test_cache_is_shared_between_painters(self):
+        png_painter = PNGPainter(100, 100)
+        svg_painter = SVGPainter(100, 100)
+        assert png_painter.font_cache is svg_painter.font_cache
+        assert png_painter.get_font("Arial", 12) is svg_painter.get_font("Arial", 12)
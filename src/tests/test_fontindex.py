@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+
+import pytest
+from PIL import ImageFont
+
+from src.roadmapper import fontindex
+from src.roadmapper.fontindex import FontIndex
+from src.roadmapper.painter import PNGPainter
+
+
+@pytest.fixture(scope="function")
+def font_dir(tmp_path):
+    """A font directory holding a single installed font, copied as 'MyFont.ttf'"""
+    font_path = PNGPainter(100, 100).get_font_path("Arial")
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    shutil.copyfile(font_path, directory / "MyFont.ttf")
+    return directory
+
+
+def get_recorded_mtime(index_file, font_dir) -> int:
+    with open(index_file, "r", encoding="utf8") as f:
+        return json.load(f)["mtimes"][str(font_dir)]
+
+
+@pytest.mark.unit
+class TestFontIndex:
+    def test_find_by_file_name(self, font_dir):
+        index = FontIndex(font_dirs=[str(font_dir)], index_file="")
+        assert index.find("MyFont") == str(font_dir / "MyFont.ttf")
+        assert index.find("myfont") == str(font_dir / "MyFont.ttf")
+        assert index.find("NotInstalled") is None
+
+    def test_find_by_family_and_style(self, font_dir):
+        font_path = str(font_dir / "MyFont.ttf")
+        family, style = ImageFont.truetype(font_path, 10).getname()
+        index = FontIndex(font_dirs=[str(font_dir)], index_file="")
+        assert index.find(family) == font_path
+        assert index.find(f"{family}:style={style}") == font_path
+
+    def test_persisted_index_is_reused(self, font_dir, tmp_path):
+        index_file = str(tmp_path / "index.json")
+        FontIndex(font_dirs=[str(font_dir)], index_file=index_file).load()
+        assert os.path.isfile(index_file)
+
+        ### Remove the font but keep the directory mtime, so the index is not rebuilt
+        recorded_mtime = get_recorded_mtime(index_file, font_dir)
+        os.remove(font_dir / "MyFont.ttf")
+        os.utime(font_dir, ns=(recorded_mtime, recorded_mtime))
+
+        index = FontIndex(font_dirs=[str(font_dir)], index_file=index_file)
+        assert index.find("MyFont") == str(font_dir / "MyFont.ttf")
+
+    def test_stale_index_is_rebuilt(self, font_dir, tmp_path):
+        index_file = str(tmp_path / "index.json")
+        FontIndex(font_dirs=[str(font_dir)], index_file=index_file).load()
+
+        recorded_mtime = get_recorded_mtime(index_file, font_dir)
+        shutil.copyfile(font_dir / "MyFont.ttf", font_dir / "OtherFont.ttf")
+        os.utime(font_dir, ns=(recorded_mtime + 1, recorded_mtime + 1))
+
+        index = FontIndex(font_dirs=[str(font_dir)], index_file=index_file)
+        assert index.find("OtherFont") == str(font_dir / "OtherFont.ttf")
+
+    def test_index_file_is_resolved_when_loaded(self, font_dir, tmp_path, monkeypatch):
+        index = FontIndex(font_dirs=[str(font_dir)])
+        index_file = tmp_path / "env" / "index.json"
+        monkeypatch.setenv("ROADMAPPER_FONT_INDEX", str(index_file))
+        index.load()
+        assert index_file.is_file()
+
+    def test_names_are_read_on_first_family_lookup(
+        self, font_dir, tmp_path, monkeypatch
+    ):
+        font_path = str(font_dir / "MyFont.ttf")
+        family, _ = ImageFont.truetype(font_path, 10).getname()
+        opened = []
+        truetype = ImageFont.truetype
+
+        def record_truetype(path, size):
+            opened.append(path)
+            return truetype(path, size)
+
+        monkeypatch.setattr(fontindex.ImageFont, "truetype", record_truetype)
+        index_file = str(tmp_path / "index.json")
+        index = FontIndex(font_dirs=[str(font_dir)], index_file=index_file)
+        assert index.find("MyFont") == font_path
+        assert opened == []
+        assert index.find(family) == font_path
+        assert opened == [font_path]
+
+        ### The family names are persisted with the index
+        index = FontIndex(font_dirs=[str(font_dir)], index_file=index_file)
+        assert index.find(family) == font_path
+        assert opened == [font_path]
@@ -0,0 +1,57 @@
+import logging
+from datetime import date, datetime
+
+import pytest
+
+from src.roadmapper.helper import Helper
+
+
+def set_root_level(level):
+    root_logger = logging.getLogger()
+    previous_level = root_logger.level
+    root_logger.setLevel(level)
+    yield
+    root_logger.setLevel(previous_level)
+
+
+@pytest.fixture(scope="function")
+def debug_logging():
+    yield from set_root_level(logging.DEBUG)
+
+
+@pytest.fixture(scope="function")
+def warning_logging():
+    yield from set_root_level(logging.WARNING)
+
+
+@pytest.mark.unit
+class TestHelper:
+    def test_disabled_message_is_not_formatted(self, warning_logging):
+        calls = []
+        Helper.printc(lambda: calls.append("formatted") or "message", show_level="task")
+        assert calls == []
+
+    def test_disabled_category_is_not_formatted(self, debug_logging):
+        calls = []
+        Helper.printc(lambda: calls.append("formatted") or "message", show_level="logo")
+        Helper.printc(lambda: calls.append("formatted") or "message")
+        assert calls == []
+
+    def test_enabled_message_is_printed(self, debug_logging, capsys):
+        Helper.printc(lambda: "lazy message", show_level="task")
+        Helper.printc("plain message", show_level="task")
+        output = capsys.readouterr().out
+        assert "TestHelper.test_enabled_message_is_printed(): " in output
+        assert "lazy message" in output
+        assert "plain message" in output
+
+    def test_is_enabled(self, debug_logging):
+        assert Helper.is_enabled("timeline") is True
+        assert Helper.is_enabled("logo") is False
+        assert Helper.is_enabled("general") is False
+
+    def test_to_date(self):
+        assert Helper.to_date("2023-02-05") == date(2023, 2, 5)
+        assert Helper.to_date("2023-2-5") == date(2023, 2, 5)
+        assert Helper.to_date(datetime(2023, 2, 5, 10, 30)) == date(2023, 2, 5)
+        assert Helper.to_date(date(2023, 2, 5)) == date(2023, 2, 5)
@@ -0,0 +1,76 @@
+import io
+
+import pytest
+from PIL import Image
+
+from src.roadmapper.rendercache import RenderCache
+
+
+
+@pytest.mark.unit
+class TestOutput:
+    def test_to_bytes_matches_saved_file(self, roadmap_factory, tmp_path):
+        roadmap = roadmap_factory()
+        roadmap.draw()
+        roadmap.save(str(tmp_path / "roadmap.png"))
+        data = roadmap.to_bytes("png")
+        assert data.startswith(b"\x89PNG")
+        assert data == (tmp_path / "roadmap.png").read_bytes()
+
+    def test_save_to_binary_stream(self, roadmap_factory):
+        roadmap = roadmap_factory()
+        png, svg = io.BytesIO(), io.BytesIO()
+        roadmap.save(png)
+        roadmap.save(svg, "svg")
+        assert png.getvalue() == roadmap.to_bytes()
+        assert svg.getvalue() == roadmap.to_bytes("svg")
+        assert svg.getvalue().startswith(b"<?xml")
+
+    def test_image_is_the_png_surface(self, roadmap_factory):
+        roadmap = roadmap_factory()
+        image = roadmap.image
+        assert isinstance(image, Image.Image)
+        with Image.open(io.BytesIO(roadmap.to_bytes("png"))) as decoded:
+            assert decoded.size == image.size
+            assert decoded.tobytes() == image.tobytes()
+
+    def test_to_bytes_uses_render_cache(self, roadmap_factory, tmp_path):
+        cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+        data = roadmap_factory(render_cache=cache).to_bytes("png")
+        assert cache.get_stats()["count"] == 1
+
+        roadmap = roadmap_factory(render_cache=cache)
+        assert roadmap.to_bytes("png") == data
+        assert cache.get_stats()["hits"] == 1
+        assert len(roadmap.display_list) == 0
+
+    def test_streamed_svg_to_bytes(self, roadmap_factory):
+        roadmap = roadmap_factory(compact_svg=True)
+        svg = roadmap.to_bytes("svg")
+        assert b"<style>" in svg
+        assert svg.endswith(b"</svg>")
+
+    def test_auto_height_surface_is_allocated_at_final_size(
+        self, roadmap_factory, monkeypatch
+    ):
+        crops = []
+        crop = Image.Image.crop
+
+        def record_crop(image, box):
+            crops.append(box)
+            return crop(image, box)
+
+        monkeypatch.setattr(Image.Image, "crop", record_crop)
+        roadmap = roadmap_factory()
+        roadmap.height = 100_000
+        image = roadmap.image
+        assert image.size[1] < 600
+        assert crops == []
+
+    def test_auto_height_surface_taller_than_requested(self, roadmap_factory):
+        roadmap = roadmap_factory()
+        roadmap.height = 50
+        image = roadmap.image
+        assert image.size[1] > 50
+        ### The bottom of the roadmap is painted, not left transparent
+        assert image.getpixel((1, image.size[1] - 1))[3] == 255
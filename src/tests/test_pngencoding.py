@@ -0,0 +1,47 @@
+import io
+
+import pytest
+from PIL import Image
+
+from src.roadmapper.pngencoding import PNGEncoding, get_png_encoding
+from src.roadmapper.rendercache import RenderCache
+from src.roadmapper.roadmap import Roadmap
+
+
+
+@pytest.mark.unit
+class TestPNGEncoding:
+    def test_default_preset_matches_pillow_defaults(self, roadmap_factory):
+        image = roadmap_factory().image
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        assert get_png_encoding("default").encode(image) == buffer.getvalue()
+
+    def test_presets_trade_size_for_speed(self, roadmap_factory):
+        roadmap = roadmap_factory()
+        default = roadmap.to_bytes("png")
+        roadmap.png_encoding = "small"
+        small = roadmap.to_bytes("png")
+        assert len(small) < len(default)
+        with Image.open(io.BytesIO(small)) as image:
+            assert image.mode == "P"
+            assert image.size == roadmap.image.size
+
+        roadmap.png_encoding = PNGEncoding(compress_level=0)
+        assert len(roadmap.to_bytes("png")) > len(default)
+        assert roadmap.stats.counters["png_bytes"] > 0
+
+    def test_unknown_preset(self):
+        with pytest.raises(ValueError):
+            get_png_encoding("tiny")
+        with pytest.raises(ValueError):
+            Roadmap(png_encoding="tiny")
+
+    def test_cache_key_depends_on_encoding(self, roadmap_factory):
+        cache = RenderCache(cache_dir="")
+        assert cache.get_key(roadmap_factory(), "png") != cache.get_key(
+            roadmap_factory(png_encoding="fast"), "png"
+        )
+        assert cache.get_key(roadmap_factory(), "svg") == cache.get_key(
+            roadmap_factory(png_encoding="fast"), "svg"
+        )
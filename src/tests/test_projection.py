@@ -0,0 +1,74 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.roadmapper import projection
+from src.roadmapper.projection import TimelineProjector
+from src.roadmapper.task import Task
+from src.roadmapper.timelinemode import TimelineMode
+
+
+def get_random_spans(count):
+    random.seed(106)
+    spans = []
+    for _ in range(count):
+        start = date(2022, 10, 1) + timedelta(days=random.randint(0, 1000))
+        end = start + timedelta(days=random.randint(0, 200))
+        spans.append((start.isoformat(), end.isoformat()))
+    return spans
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize(
+    "mode, number_of_items",
+    [
+        (TimelineMode.WEEKLY, 80),
+        (TimelineMode.MONTHLY, 24),
+        (TimelineMode.QUARTERLY, 8),
+        (TimelineMode.HALF_YEARLY, 4),
+        (TimelineMode.YEARLY, 3),
+    ],
+)
+def test_projection_matches_task_layout(
+    roadmap_factory, mode, number_of_items, use_numpy
+):
+    if use_numpy and projection.np is None:
+        pytest.skip("NumPy is not installed")
+    roadmap = roadmap_factory(
+        1200, 1000, mode=mode, number_of_items=number_of_items, groups=0
+    )
+    timeline = roadmap._timeline
+    projector = TimelineProjector(timeline, use_numpy=use_numpy)
+    assert projector.is_supported is True
+
+    spans = get_random_spans(200)
+    projections = projector.project_tasks(spans)
+    positions = projector.project_dates([start for start, _ in spans])
+    for (start, end), task_projection, position in zip(spans, projections, positions):
+        task = Task(
+            text="Task",
+            start=start,
+            end=end,
+            font="Arial",
+            font_size=12,
+            text_alignment="centre",
+        )
+        task.set_draw_position(roadmap._painter, 0, 100, timeline)
+        assert [[x, 100, width, 20] for x, width in task_projection.boxes] == task.boxes
+        if task.boxes:
+            assert (task_projection.box_x, task_projection.box_width) == (
+                task.box_x,
+                task.box_width,
+            )
+
+        index = timeline.locate(date.fromisoformat(start))
+        if index is None:
+            assert position is None
+        else:
+            item = timeline.timeline_items[index]
+            _, percentage = item.get_timeline_pos_percentage(
+                mode, date.fromisoformat(start)
+            )
+            assert position == item.box_x + (item.box_width * percentage)
@@ -0,0 +1,88 @@
+import pytest
+from PIL import Image, ImageChops
+
+REDRAW_ROADMAP = dict(
+    width=1000, height=800, number_of_items=12, groups=3, tasks=3, footer=True
+)
+
+
+def change_end_date(roadmap):
+    roadmap._groups[1].tasks[0].update(end="2023-09-15")
+
+
+def change_group_colour(roadmap):
+    roadmap._groups[2].update(fill_colour="Red")
+
+
+def add_milestone(roadmap):
+    roadmap._groups[0].tasks[0].add_milestone("New", "2023-02-01")
+
+
+def add_task(roadmap):
+    roadmap._groups[1].add_task("New", "2023-05-01", "2023-07-01")
+
+
+def add_group(roadmap):
+    roadmap.add_group("New").add_task("New", "2023-05-01", "2023-07-01")
+
+
+def grow_and_shrink(roadmap):
+    ### The net shift is zero, but the group in between still moves
+    task = roadmap._groups[0].add_task("New", "2023-05-01", "2023-07-01")
+    task.add_milestone("New", "2023-06-01")
+    roadmap._groups[2].tasks.pop()
+    roadmap._groups[2].mark_dirty()
+
+
+def get_image(roadmap, filename):
+    roadmap.save(filename)
+    return Image.open(filename).convert("RGBA")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "change",
+    [
+        change_end_date,
+        change_group_colour,
+        add_milestone,
+        add_task,
+        add_group,
+        grow_and_shrink,
+    ],
+)
+def test_redraw_matches_full_draw(roadmap_factory, tmp_path, change):
+    roadmap = roadmap_factory(**REDRAW_ROADMAP)
+    roadmap.draw()
+    change(roadmap)
+    damage = roadmap.redraw()
+    assert len(damage) > 0
+    redrawn = get_image(roadmap, str(tmp_path / "redrawn.png"))
+
+    expected_roadmap = roadmap_factory(**REDRAW_ROADMAP)
+    change(expected_roadmap)
+    expected_roadmap.draw()
+    expected = get_image(expected_roadmap, str(tmp_path / "expected.png"))
+
+    assert redrawn.size == expected.size
+    assert ImageChops.difference(redrawn, expected).getbbox(alpha_only=False) is None
+    assert roadmap.display_list.items == expected_roadmap.display_list.items
+
+
+@pytest.mark.unit
+def test_damage_is_limited_to_the_changed_task(roadmap_factory):
+    roadmap = roadmap_factory(**REDRAW_ROADMAP)
+    roadmap.draw()
+    task = roadmap._groups[1].tasks[0]
+    task.update(end="2023-05-15")
+    (damage,) = roadmap.redraw()
+    assert damage[1] <= task.box_y and task.box_y + task.box_height <= damage[3]
+    assert damage[3] - damage[1] < 40
+    assert roadmap.redraw() == []
+
+
+@pytest.mark.unit
+def test_unknown_setting_is_rejected(roadmap_factory):
+    roadmap = roadmap_factory(**REDRAW_ROADMAP)
+    with pytest.raises(ValueError):
+        roadmap._groups[0].tasks[0].update(colour="Red")
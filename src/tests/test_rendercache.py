@@ -0,0 +1,117 @@
+import os
+import stat
+from threading import Thread
+
+import pytest
+
+from src.roadmapper.rendercache import RenderCache
+
+
+@pytest.mark.unit
+class TestRenderCache:
+    def test_hit_copies_the_rendered_file(self, roadmap_factory, tmp_path):
+        cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+        roadmap = roadmap_factory(render_cache=cache)
+        roadmap.draw()
+        roadmap.save(str(tmp_path / "first.png"))
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["count"] == 1
+
+        roadmap = roadmap_factory(render_cache=cache)
+        assert roadmap.render(["png"]) == {}
+        assert len(roadmap.display_list) == 0
+        roadmap.save(str(tmp_path / "second.png"))
+        assert cache.get_stats()["hits"] == 1
+        assert (tmp_path / "first.png").read_bytes() == (
+            tmp_path / "second.png"
+        ).read_bytes()
+
+    def test_key_depends_on_model_and_format(self, roadmap_factory):
+        cache = RenderCache(cache_dir="")
+        key = cache.get_key(roadmap_factory(render_cache=cache), "png")
+        assert key == cache.get_key(roadmap_factory(render_cache=cache), "png")
+        assert key != cache.get_key(roadmap_factory(render_cache=cache), "svg")
+        other = roadmap_factory(title="Other", render_cache=cache)
+        assert key != cache.get_key(other, "png")
+
+    def test_cache_is_bounded_by_size(self, roadmap_factory, tmp_path):
+        cache = RenderCache(cache_dir=str(tmp_path / "cache"), max_size=1)
+        for text in ["A", "B"]:
+            roadmap = roadmap_factory(title=text, render_cache=cache)
+            roadmap.draw()
+            roadmap.save(str(tmp_path / f"{text}.png"))
+        stats = cache.get_stats()
+        assert stats["stores"] == 2
+        assert stats["evictions"] == 2
+        assert stats["count"] == 0
+
+    def test_evicted_entry_is_rendered(self, roadmap_factory, tmp_path):
+        cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+        roadmap = roadmap_factory(render_cache=cache)
+        roadmap.draw()
+        roadmap.save(str(tmp_path / "first.png"))
+
+        roadmap = roadmap_factory(render_cache=cache)
+        roadmap.draw()
+        cache.clear()
+        roadmap.save(str(tmp_path / "second.png"))
+        assert (tmp_path / "first.png").read_bytes() == (
+            tmp_path / "second.png"
+        ).read_bytes()
+
+    @pytest.mark.parametrize("painter_type", ["png", "svg"])
+    def test_linked_file_is_not_written_through(
+        self, roadmap_factory, tmp_path, painter_type
+    ):
+        cache = RenderCache(cache_dir=str(tmp_path / "cache"), link=True)
+        filename = str(tmp_path / f"roadmap.{painter_type}")
+
+        def save(roadmap):
+            roadmap.render([painter_type])
+            roadmap.save(filename, painter_type)
+
+        key = cache.get_key(roadmap_factory(render_cache=cache), painter_type)
+        save(roadmap_factory(render_cache=cache))
+        cached = cache.read(key)
+
+        ### Linked to the cache entry
+        save(roadmap_factory(render_cache=cache))
+        assert cache.get_stats()["hits"] == 1
+
+        save(roadmap_factory(title="Other"))
+        assert cache.read(key) == cached
+        with open(filename, "rb") as f:
+            assert f.read() != cached
+
+    @pytest.mark.parametrize("painter_type", ["png", "svg"])
+    def test_unlinked_file_is_written_in_place(
+        self, roadmap_factory, tmp_path, painter_type
+    ):
+        target = tmp_path / f"target.{painter_type}"
+        target.write_bytes(b"")
+        os.chmod(target, 0o640)
+        filename = tmp_path / f"roadmap.{painter_type}"
+        os.symlink(target, filename)
+
+        roadmap = roadmap_factory()
+        roadmap.render([painter_type])
+        roadmap.save(str(filename), painter_type)
+        assert os.path.islink(filename)
+        assert target.stat().st_size > 0
+        assert stat.S_IMODE(target.stat().st_mode) == 0o640
+
+    def test_concurrent_writes_of_one_key(self, tmp_path):
+        cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+        contents = [bytes([index]) * 1_000_000 for index in range(4)]
+
+        def write(data):
+            for _ in range(10):
+                cache.write("key", data)
+
+        threads = [Thread(target=write, args=(data,)) for data in contents]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.read("key") in contents
+        assert cache.get_stats()["stores"] == 40
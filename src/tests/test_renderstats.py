@@ -0,0 +1,36 @@
+import pytest
+
+from src.roadmapper.renderstats import RenderStats
+
+
+
+@pytest.mark.unit
+class TestRenderStats:
+    def test_time_accumulates_per_phase(self):
+        stats = RenderStats()
+        stats.add_time("painting", 2)
+        with stats.time("painting"):
+            pass
+        assert stats.timings["painting"] >= 2
+        assert stats.total_ms == stats.timings["painting"]
+
+    def test_save_returns_stats_and_calls_hook(self, roadmap_factory, tmp_path):
+        reported = []
+        roadmap = roadmap_factory(stats_callback=reported.append)
+        roadmap.draw()
+        stats = roadmap.save(str(tmp_path / "roadmap.png"))
+
+        assert reported == [stats]
+        for phase in [
+            "theme",
+            "timeline_layout",
+            "group_layout",
+            "painting",
+            "encoding",
+            "file_write",
+        ]:
+            assert phase in stats.timings
+        assert stats.counters["draw_primitives"] == len(roadmap.display_list)
+        assert stats.primitives["Diamond"] == 1
+        assert stats.counters["date_parses"] >= 3
+        assert set(stats.as_dict()) == {"timings", "total_ms", "counters", "primitives"}
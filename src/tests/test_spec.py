@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+
+from src.roadmapper.spec import JSONStream, build_roadmap, load_roadmap
+from src.roadmapper.timelinemode import TimelineMode
+
+
+def get_spec():
+    return {
+        "width": 800,
+        "colour_theme": "BLUEMOUNTAIN",
+        "title": {"text": "Spec"},
+        "timeline": {"mode": "QUARTERLY", "start": "2023-01-01", "number_of_items": 4},
+        "groups": [
+            {
+                "text": "Group",
+                "tasks": [
+                    {
+                        "text": "Task",
+                        "start": "2023-01-15",
+                        "end": "2023-06-20",
+                        "milestones": [{"text": "M1", "date": "2023-03-01"}],
+                        "parallel_tasks": [
+                            {"text": "Parallel", "start": "2023-07-01", "end": "2023-09-01"}
+                        ],
+                    }
+                ],
+            }
+        ],
+        "footer": {"text": "Footer"},
+    }
+
+
+@pytest.mark.unit
+class TestSpec:
+    def test_build_roadmap(self):
+        roadmap = build_roadmap(get_spec())
+        assert roadmap.width == 800
+        assert roadmap.colour_theme == "BLUEMOUNTAIN"
+        assert roadmap._timeline.mode == TimelineMode.QUARTERLY
+        task = roadmap._groups[0].tasks[0]
+        assert task.text == "Task"
+        assert task.milestones[0].text == "M1"
+        assert task.tasks[0].text == "Parallel"
+        roadmap.draw()
+
+    def test_unknown_section(self):
+        with pytest.raises(ValueError):
+            build_roadmap({"title": {"text": "Spec"}, "legend": {}})
+
+    @pytest.mark.parametrize("chunk_size", [1, 4, 6, 7, 12, 65536])
+    def test_load_roadmap_matches_build_roadmap(self, chunk_size):
+        spec = get_spec()
+        text = json.dumps(spec, indent=2)
+
+        loaded = load_roadmap(io.StringIO(text), chunk_size=chunk_size)
+        built = build_roadmap(spec)
+        loaded.draw()
+        built.draw()
+        assert loaded.display_list.items == built.display_list.items
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 6, 7, 12, 65536])
+    def test_numbers_split_across_chunks(self, chunk_size):
+        text = '{"width": 1.5, "a": -12, "b": 2.5e-3, "c": 1E+2, "d": [0.125, 7]}'
+        stream = JSONStream(io.StringIO(text), chunk_size)
+        values = {}
+        for key in stream.iter_object():
+            values[key] = stream.read_value()
+        assert values == json.loads(text)
+
+    def test_load_roadmap_from_file(self, tmp_path):
+        filename = tmp_path / "roadmap.json"
+        filename.write_text(json.dumps(get_spec()), encoding="utf8")
+        roadmap = load_roadmap(str(filename))
+        assert roadmap._groups[0].tasks[0].milestones[0].text == "M1"
+
+    def test_load_groups_without_tasks(self):
+        text = '{"title": {"text": "Spec"}, "groups": [{"text": "A"}, {"text": "B", "tasks": []}]}'
+        roadmap = load_roadmap(io.StringIO(text), chunk_size=3)
+        assert [group.text for group in roadmap._groups] == ["A", "B"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"title": {"text": "Spec"}, "width": 800}',
+            '{"groups": [{"text": "G", "tasks": [], "font_size": 12}]}',
+            '{"title": {"text": "Spec"}} []',
+            '{"title": {"text": "Spec"}',
+        ],
+    )
+    def test_load_roadmap_rejects_invalid_specs(self, text):
+        with pytest.raises(ValueError):
+            load_roadmap(io.StringIO(text), chunk_size=4)
@@ -0,0 +1,160 @@
+import io
+import re
+from xml.etree import ElementTree
+
+import drawsvg as dw
+import pytest
+
+from src.roadmapper.svgwriter import SVGStreamPainter, SVGWriter
+
+
+SVG_ROADMAP = dict(
+    height=400,
+    title="Streaming & <escaping>\nSecond line",
+    groups=3,
+    parallel=True,
+    footer=True,
+    auto_height=True,
+    painter_type="svg",
+)
+
+
+def remove_header_padding(svg: str) -> str:
+    return re.sub(r'" +>\n<defs>', '">\n<defs>', svg, count=1)
+
+
+class NonSeekable(io.StringIO):
+    def seekable(self) -> bool:
+        return False
+
+
+@pytest.mark.unit
+class TestSVGWriter:
+    def test_stream_matches_svg_painter(self, roadmap_factory):
+        roadmap = roadmap_factory(**SVG_ROADMAP)
+        expected = roadmap.render(["svg"])["svg"].encode_surface().decode("utf-8")
+
+        painter = roadmap.display_list.replay(
+            SVGStreamPainter(roadmap.width, roadmap.height)
+        )
+        streamed = painter.encode_surface().decode("utf-8")
+        assert remove_header_padding(streamed) == expected
+        assert 'height="400"' not in streamed.split("<defs>")[0]
+
+    def test_header_is_patched_on_non_seekable_file(self):
+        fp = NonSeekable()
+        writer = SVGWriter(fp, 100, 100)
+        assert fp.getvalue() == ""
+        writer.close(100, 12345)
+        svg = fp.getvalue()
+        assert 'height="12345" viewBox="0 0 100 12345"' in svg
+        assert svg.endswith("</svg>")
+
+    def test_roadmap_streams_svg_on_save(self, roadmap_factory, tmp_path):
+        expected = roadmap_factory(**SVG_ROADMAP)
+        expected.draw()
+        expected.save(str(tmp_path / "expected.svg"))
+
+        roadmap = roadmap_factory(stream_svg=True, **SVG_ROADMAP)
+        roadmap.draw()
+        assert roadmap.render(["svg"]) == {}
+        roadmap.save(str(tmp_path / "streamed.svg"))
+
+        with open(tmp_path / "expected.svg", encoding="utf-8") as f:
+            svg = f.read()
+        with open(tmp_path / "streamed.svg", encoding="utf-8") as f:
+            assert remove_header_padding(f.read()) == svg
+
+
+def expand_compact_svg(svg: str) -> list[tuple]:
+    """Resolve the classes and <use> references of a compact SVG, to compare it with a plain SVG"""
+    root = ElementTree.fromstring(svg)
+    ns = "{http://www.w3.org/2000/svg}"
+    styles = {}
+    for rule in root.find(f"{ns}style").text.strip("/*[CDATA]").split("\n"):
+        name, _, declarations = rule.strip("/*]>").partition("{")
+        styles[name[1:]] = dict(
+            declaration.split(":", 1) for declaration in declarations.strip("}").split(";")
+        )
+    shapes = {path.get("id"): path.get("d") for path in root.find(f"{ns}defs")}
+
+    elements = []
+    for element in root:
+        tag = element.tag[len(ns) :]
+        if tag in ("style", "defs"):
+            continue
+        attributes = dict(element.attrib)
+        for name, value in styles[attributes.pop("class")].items():
+            attributes[name] = value.strip('"').removesuffix("px")
+        if tag == "use":
+            x, y = float(attributes.pop("x")), float(attributes.pop("y"))
+            d = shapes[attributes.pop("{http://www.w3.org/1999/xlink}href")[1:]]
+            attributes["d"] = [(px + x, py + y) for px, py in get_points(d)]
+            tag = "path"
+        elements.append(normalise_element(tag, attributes, element.text))
+    return elements
+
+
+def get_points(d: str) -> list[tuple]:
+    return [tuple(float(v) for v in command[1:].split(",")) for command in d.split()]
+
+
+def normalise_element(tag: str, attributes: dict, text: str) -> tuple:
+    normalised = {}
+    for name, value in attributes.items():
+        ### Only paths made of straight lines are compared point by point
+        if name == "d" and re.fullmatch(r"([ML]\S+ ?)+", str(value)):
+            value = get_points(value)
+        if isinstance(value, list):
+            value = [(round(x, 2), round(y, 2)) for x, y in value]
+        else:
+            try:
+                value = round(float(value), 2)
+            except ValueError:
+                pass
+        normalised[name] = value
+    return tag, normalised, text
+
+
+@pytest.mark.unit
+class TestCompactSVG:
+    def test_compact_svg_draws_the_same_elements(self, roadmap_factory):
+        roadmap = roadmap_factory(**SVG_ROADMAP)
+        roadmap.set_title("Compact")
+        plain = io.StringIO()
+        roadmap.write_svg(plain)
+        compact = io.StringIO()
+        roadmap.compact_svg = True
+        roadmap.write_svg(compact)
+
+        root = ElementTree.fromstring(plain.getvalue())
+        expected = [
+            normalise_element(element.tag.split("}")[1], element.attrib, element.text)
+            for element in root
+            if not element.tag.endswith("defs")
+        ]
+        assert expand_compact_svg(compact.getvalue()) == expected
+        assert len(compact.getvalue()) < len(plain.getvalue()) * 0.7
+
+    def test_styles_in_any_order_share_a_class(self):
+        fp = io.StringIO()
+        writer = SVGWriter(fp, 100, 100, compact=True)
+        writer.append(dw.Line(0, 0, 10, 10, stroke="red", stroke_width=1))
+        writer.append(dw.Line(0, 0, 20, 20, stroke_width=1, stroke="red"))
+        writer.close(100, 100)
+        assert fp.getvalue().count('class="c0"') == 2
+        assert 'class="c1"' not in fp.getvalue()
+
+    def test_polygons_share_shapes(self):
+        fp = io.StringIO()
+        writer = SVGWriter(fp, 100, 100, compact=True)
+        writer.append(dw.Lines(10, 10, 15, 15, 10, 20, 5, 15, fill="red"))
+        writer.append(dw.Lines(30.5, 10, 35.5, 15, 30.5, 20, 25.5, 15, fill="red"))
+        writer.append(dw.Rectangle(0, 0, 10.0, 10, fill="red"))
+        writer.close(100, 200)
+
+        svg = fp.getvalue()
+        assert svg.count("<path") == 1
+        assert '<use xlink:href="#s0" x="30.5" y="10" class="c0" />' in svg
+        assert '<rect x="0" y="0" width="10" height="10" class="c0" />' in svg
+        assert 'height="200"' in svg
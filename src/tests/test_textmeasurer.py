@@ -0,0 +1,56 @@
+import pytest
+
+from src.roadmapper.painter import PNGPainter
+from src.roadmapper.textmeasurer import TextMeasurer
+
+
+@pytest.fixture(scope="function")
+def painter():
+    return PNGPainter(100, 100)
+
+
+@pytest.mark.unit
+class TestTextMeasurer:
+    def test_measure_matches_font_bbox(self, painter):
+        measurer = TextMeasurer()
+        _, _, right, bottom = painter.get_font("Arial", 12).getbbox("Hello World")
+        assert measurer.measure("Hello World", "Arial", 12, painter.get_font) == (
+            right,
+            bottom,
+        )
+
+    def test_measurement_is_memoised(self, painter):
+        loads = []
+
+        def font_loader(font, font_size):
+            loads.append((font, font_size))
+            return painter.get_font(font, font_size)
+
+        measurer = TextMeasurer()
+        measurer.measure("Hello", "Arial", 12, font_loader)
+        measurer.measure("Hello", "Arial", 12, font_loader)
+        measurer.measure("Hello", "Arial", 14, font_loader)
+        assert len(loads) == 2
+        assert measurer.get_stats()["hits"] == 1
+        assert measurer.get_stats()["misses"] == 2
+
+    def test_measure_many_keeps_order(self, painter):
+        measurer = TextMeasurer()
+        items = [("a", "Arial", 12), ("Hello World", "Arial", 12), ("a", "Arial", 12)]
+        dimensions = measurer.measure_many(items, painter.get_font)
+        assert dimensions == [
+            measurer.measure(text, font, font_size, painter.get_font)
+            for text, font, font_size in items
+        ]
+        assert dimensions[0] == dimensions[2]
+
+    def test_max_size_bounds_memo(self, painter):
+        measurer = TextMeasurer(max_size=2)
+        for text in ["a", "b", "c"]:
+            measurer.measure(text, "Arial", 12, painter.get_font)
+        assert measurer.get_stats()["size"] == 2
+
+    def test_painter_uses_shared_measurer(self, painter):
+        assert painter.get_text_dimension("Hello", "Arial", 12) == painter.measure_many(
+            [("Hello", "Arial", 12)]
+        )[0]
@@ -0,0 +1,60 @@
+import pytest
+from PIL import ImageChops
+
+from src.roadmapper.displaylist import Background, DisplayListPainter, Rect
+from src.roadmapper.roadmap import Roadmap
+from src.roadmapper.tiling import TileIndex, get_tiles
+
+TILING_ROADMAP = dict(
+    width=700, height=2000, number_of_items=8, groups=4, tasks=3, footer=True, logo=True
+)
+
+
+@pytest.fixture
+def render_png(roadmap_factory):
+    def render(**kwargs):
+        roadmap = roadmap_factory(**TILING_ROADMAP, **kwargs)
+        roadmap.draw()
+        return roadmap.image
+
+    return render
+
+
+@pytest.mark.unit
+class TestTiling:
+    def test_tiles_cover_the_surface(self):
+        assert get_tiles(250, 100, 100) == [
+            (0, 0, 100, 100),
+            (100, 0, 200, 100),
+            (200, 0, 250, 100),
+        ]
+
+    def test_index_returns_overlapping_items_in_painting_order(self):
+        painter = DisplayListPainter(300, 300)
+        painter.background_colour = "White"
+        painter.set_background_colour()
+        painter.draw_box(150, 150, 100, 20, "Blue")
+        painter.draw_box(10, 10, 20, 20, "Red")
+        items = painter.display_list.items
+
+        index = TileIndex(items, painter, 100)
+        assert index.query((0, 0, 100, 100)) == [items[0], items[2]]
+        assert index.query((200, 100, 300, 200)) == [items[0], items[1]]
+        assert isinstance(index.query((0, 200, 100, 300))[0], Background)
+        assert isinstance(index.query((100, 100, 200, 200))[1], Rect)
+
+    @pytest.mark.parametrize("tile_size", [64, 100, 1024])
+    def test_tiled_render_matches_single_surface(self, tile_size, render_png):
+        expected = render_png()
+        tiled = render_png(tile_size=tile_size, tile_workers=0)
+        assert tiled.size == expected.size
+        assert ImageChops.difference(tiled, expected).getbbox(alpha_only=False) is None
+
+    def test_tiles_are_painted_in_worker_processes(self, render_png):
+        expected = render_png()
+        tiled = render_png(tile_size=256, tile_workers=2)
+        assert ImageChops.difference(tiled, expected).getbbox(alpha_only=False) is None
+
+    def test_invalid_tile_size(self):
+        with pytest.raises(ValueError):
+            Roadmap(tile_size=0)
@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.roadmapper.roadmap import Roadmap
+from src.roadmapper.timelineitem import (
+    TimelineItem,
+    TimelinePeriod,
+    get_week_of_year,
+    get_week_start,
+)
+from src.roadmapper.timelinemode import TimelineMode
+
+
+def get_timeline(mode, start, number_of_items):
+    roadmap = Roadmap(1200, 1000)
+    roadmap.set_title("Timeline")
+    roadmap.set_timeline(mode, start=start, number_of_items=number_of_items)
+    return roadmap._timeline
+
+
+def linear_locate(timeline, this_date):
+    found = None
+    for index in range(len(timeline.timeline_items)):
+        start, end = timeline.get_item_period(index)
+        if start <= this_date <= end:
+            found = index
+    return found
+
+
+@pytest.mark.unit
+class TestTimelineIndex:
+    def test_locate(self):
+        timeline = get_timeline(TimelineMode.MONTHLY, "2023-01-01", 12)
+        assert timeline.locate(date(2023, 1, 1)) == 0
+        assert timeline.locate(date(2023, 3, 31)) == 2
+        assert timeline.locate(date(2023, 12, 31)) == 11
+        assert timeline.locate(date(2022, 12, 31)) is None
+        assert timeline.locate(date(2024, 1, 1)) is None
+
+    def test_span(self):
+        timeline = get_timeline(TimelineMode.QUARTERLY, "2023-01-01", 8)
+        assert timeline.span(date(2023, 2, 1), date(2023, 8, 1)) == [0, 1, 2]
+        assert timeline.span(date(2022, 1, 1), date(2030, 1, 1)) == list(
+            range(8)
+        )
+        assert timeline.span(date(2020, 1, 1), date(2022, 1, 1)) == []
+
+    def test_weekly_locate_matches_linear_scan(self):
+        timeline = get_timeline(TimelineMode.WEEKLY, "2024-12-01", 60)
+        assert timeline.is_item_index_sorted is True
+        for day in range(0, 450, 3):
+            this_date = date(2024, 11, 20) + timedelta(days=day)
+            assert timeline.locate(this_date) == linear_locate(timeline, this_date)
+
+
+@pytest.mark.unit
+class TestTimelinePeriod:
+    def test_week_start_matches_strptime(self):
+        for year in range(2020, 2030):
+            for week in range(0, 54):
+                assert get_week_start(year, week) == datetime.strptime(
+                    f"{year} {week} 1", "%G %V %u"
+                ).date()
+
+    def test_week_of_year_matches_strftime(self):
+        this_date = datetime(2023, 1, 1)
+        while this_date.year < 2026:
+            assert get_week_of_year(this_date) == int(this_date.strftime("%W"))
+            this_date += timedelta(days=1)
+
+    def test_period_is_precomputed(self):
+        item = TimelineItem(text="Q2", value="20232", mode=TimelineMode.QUARTERLY)
+        assert item.period == TimelinePeriod(date(2023, 4, 1), date(2023, 6, 30), 90)
+        assert item.get_timeline_pos_percentage(
+            TimelineMode.QUARTERLY, date(2023, 5, 16)
+        ) == (True, 45 / 90)
+        with pytest.raises(AttributeError):
+            item.period.days = 0
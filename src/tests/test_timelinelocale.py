@@ -0,0 +1,127 @@
+import json
+import locale
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.roadmapper.roadmap import Roadmap
+from src.roadmapper import timelinelocale
+from src.roadmapper.timelinelocale import (
+    LocaleNames,
+    TimelineLocale,
+    bundled_locale_names,
+    get_locale_names,
+    read_locale_names,
+)
+from src.roadmapper.timelinemode import TimelineMode
+
+MONTHS = [f"M{month}" for month in range(1, 13)]
+DAYS = [f"D{day}" for day in range(1, 8)]
+
+
+def write_locale_file(tmp_path, month_abbr: list[str]) -> str:
+    """A locale settings file for a locale that is not installed, with its own names"""
+    path = tmp_path / "xx_XX_timeline_settings.json"
+    path.write_text(
+        json.dumps(
+            {
+                "locale": "xx_XX.UTF-8",
+                "settings": {
+                    "year": {"text": "Y{0}", "generic_text": "Y{0}"},
+                    "half_year": {"text": "H{0}"},
+                    "quarter": {"text": "Q{0}"},
+                    "month": {"text": "<{0}>", "generic_text": "M{0}"},
+                    "week": {"text": "{0} {1}", "generic_text": "W{0}"},
+                },
+                "names": {
+                    "month_abbr": month_abbr,
+                    "month_name": MONTHS,
+                    "day_abbr": DAYS,
+                    "day_name": DAYS,
+                },
+            }
+        ),
+        encoding="utf8",
+    )
+    return str(path)
+
+
+def get_month_texts(timeline_locale: str) -> list[str]:
+    roadmap = Roadmap(800, 400)
+    roadmap.set_title("Locale")
+    roadmap.set_timeline(
+        TimelineMode.MONTHLY,
+        start="2023-01-01",
+        number_of_items=12,
+        timeline_locale=timeline_locale,
+    )
+    roadmap.draw()
+    return [item.text for item in roadmap._timeline.timeline_items]
+
+
+@pytest.mark.unit
+class TestTimelineLocale:
+    def test_names_match_strftime_and_keep_process_locale(self):
+        before = locale.setlocale(locale.LC_ALL)
+        names = get_locale_names("C")
+        assert names.month_abbr[0] == "Jan"
+        assert names.month_name[11] == "December"
+        assert names.day_abbr[0] == "Mon"
+        assert names.day_name[6] == "Sunday"
+        assert locale.setlocale(locale.LC_ALL) == before
+
+    def test_names_are_loaded_once(self):
+        assert get_locale_names("C") is get_locale_names("C")
+
+    def test_unknown_locale(self):
+        with pytest.raises(locale.Error):
+            get_locale_names("xx_XX.NOT-INSTALLED")
+
+    @pytest.mark.parametrize("locale_name", sorted(bundled_locale_names))
+    def test_bundled_names_match_the_c_library(self, locale_name):
+        for name in (f"{locale_name}.UTF-8", locale_name):
+            try:
+                expected = read_locale_names(name)
+                break
+            except locale.Error:
+                continue
+        else:
+            pytest.skip(f"Locale {locale_name} is not installed")
+        assert bundled_locale_names[locale_name] == expected
+
+    def test_bundled_names_keep_process_locale(self, monkeypatch):
+        def fail_setlocale(*args):
+            raise AssertionError("setlocale called")
+
+        monkeypatch.setattr(timelinelocale, "locale_names", {})
+        monkeypatch.setenv("LC_ALL", "de_DE.UTF-8")
+        monkeypatch.setattr(timelinelocale.locale, "setlocale", fail_setlocale)
+        assert get_locale_names("ja_JP.UTF-8").month_abbr[0] == " 1月"
+        assert get_locale_names("").month_abbr[2] == "Mär"
+
+    def test_names_from_settings_file(self, tmp_path):
+        timeline_locale = TimelineLocale(write_locale_file(tmp_path, MONTHS))
+        assert timeline_locale.get_month_abbr(3) == "M3"
+
+    def test_invalid_names(self):
+        with pytest.raises(ValueError):
+            LocaleNames(MONTHS[:11], MONTHS, DAYS, DAYS)
+
+    def test_locales_render_concurrently(self, tmp_path):
+        lower = tmp_path / "lower"
+        lower.mkdir()
+        lower_file = write_locale_file(lower, [m.lower() for m in MONTHS])
+        upper_file = write_locale_file(tmp_path, MONTHS)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(get_month_texts, [lower_file, upper_file, ""] * 4)
+            )
+        environment_names = get_locale_names("")
+        for index, texts in enumerate(results):
+            if index % 3 == 0:
+                assert texts[:2] == ["<m1>", "<m2>"]
+            elif index % 3 == 1:
+                assert texts[:2] == ["<M1>", "<M2>"]
+            else:
+                assert texts[:2] == list(environment_names.month_abbr[:2])